@@ -1,35 +1,53 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.security import decode_access_token
+from app.core.user_cache import PRINCIPAL_FIELDS, user_cache
 from app.models import User
 
 # OAuth2 scheme - extrait le token du header "Authorization: Bearer <token>"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def get_current_user(
+async def load_principal(db: AsyncSession, user_id: int):
+    """
+    Lit en DB les colonnes du user gardées en cache (None si le user n'existe
+    pas ou si son compte est en cours de suppression)
+    """
+    columns = [getattr(User, field) for field in PRINCIPAL_FIELDS]
+    row = (await db.execute(
+        select(*columns).where(User.id == user_id, User.deleted_at.is_(None))
+    )).first()
+    return dict(row._mapping) if row is not None else None
+
+
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     Dependency pour récupérer l'utilisateur courant depuis le JWT token
 
     Usage dans un endpoint:
         @app.get("/protected")
-        def protected_route(current_user: User = Depends(get_current_user)):
+        async def protected_route(current_user: User = Depends(get_current_user)):
             return {"user_id": current_user.id}
 
     Process:
         1. Extrait le token du header Authorization
         2. Décode le token JWT
         3. Récupère user_id depuis le token
-        4. Query la DB pour trouver le user
+        4. Cherche le user dans le cache (sinon query la DB et le met en cache)
         5. Retourne le user ou erreur 401
 
+    Le user retourné est détaché de la session (snapshot du cache) :
+    id, email, created_at et fsrs_weights sont disponibles, pas les relations.
+    Utilisable aussi par les routes sync (FastAPI résout la dependency async).
+
     Raises:
-        HTTPException 401: Si token invalide ou user n'existe pas
+        HTTPException 401: Si token invalide, user n'existe pas ou compte en cours de suppression
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -42,9 +60,12 @@ def get_current_user(
     if user_id is None:
         raise credentials_exception
 
-    # Récupérer le user depuis la DB
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if user is None:
-        raise credentials_exception
+    # Récupérer le user depuis le cache, ou la DB en cas de miss
+    principal = await user_cache.aget(int(user_id))
+    if principal is None:
+        principal = await load_principal(db, int(user_id))
+        if principal is None:
+            raise credentials_exception
+        await user_cache.aset(int(user_id), principal)
 
-    return user
+    return User(**principal)
@@ -1,17 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.password_hasher import password_hasher
+from app.core.security import create_access_token
+from app.core.user_cache import user_cache, user_changed_notification
 from app.api.dependencies import get_current_user
-from app.models import User
-from app.schemas import UserCreate, UserLogin, UserResponse, Token
+from app.models import User, Category, DailyReviewStats, ReviewLog, Tombstone
+from app.models.job import JOB_DELETE_USER
+from app.schemas import UserCreate, UserLogin, PasswordChange, UserResponse, Token, JobResponse
+from app.services.jobs import submit_job
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Créer un nouveau compte utilisateur
 
@@ -29,17 +37,18 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
     Raises:
         400: Si email déjà utilisé
+        503: Si le pool bcrypt est saturé
     """
     # Vérifier si email existe déjà
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = (await db.execute(select(User).where(User.email == user_data.email))).scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    # Hash le password
-    hashed_password = get_password_hash(user_data.password)
+    # Hash le password (bcrypt = CPU : dans le pool de process dédié)
+    hashed_password = await password_hasher.hash(user_data.password)
 
     # Créer le user
     db_user = User(
@@ -47,22 +56,23 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
 
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     Se connecter et obtenir un JWT token
 
     Process:
         1. Vérifier que l'email existe (username = email pour OAuth2)
         2. Vérifier que le password est correct
-        3. Créer un JWT token avec user_id
-        4. Retourner le token
+        3. Si le coût bcrypt a changé (BCRYPT_ROUNDS), enregistrer le nouveau hash
+        4. Créer un JWT token avec user_id
+        5. Retourner le token
 
     Args:
         form_data: OAuth2 form avec username (=email) et password
@@ -72,18 +82,30 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
 
     Raises:
         401: Si email ou password incorrect
+        503: Si le pool bcrypt est saturé
     """
-    # OAuth2 utilise "username", on le mappe à "email"
-    user = db.query(User).filter(User.email == form_data.username).first()
+    # OAuth2 utilise "username", on le mappe à "email" (compte en cours de suppression exclu)
+    user = (await db.execute(
+        select(User).where(User.email == form_data.username, User.deleted_at.is_(None))
+    )).scalars().first()
 
     # Vérifier user existe et password correct
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    match, new_hash = (
+        await password_hasher.verify_and_update(form_data.password, user.hashed_password)
+        if user else (False, None)
+    )
+    if not match:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Rehash transparent (ancien coût bcrypt)
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        await db.commit()
+
     # Créer JWT token
     access_token = create_access_token(data={"sub": str(user.id)})
 
@@ -91,7 +113,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """
     Récupérer les infos de l'utilisateur connecté
 
@@ -103,20 +125,83 @@ def get_current_user_info(current_user: User = Depends(get_current_user)):
     """
     return current_user
 
+
+@router.post("/change-password", status_code=status.HTTP_204_NO_CONTENT)
+async def change_password(
+    password_data: PasswordChange,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Changer le password du user connecté
+
+    Args:
+        password_data: {"current_password": "...", "new_password": "..."}
+
+    Raises:
+        400: Si le password actuel est incorrect
+        503: Si le pool bcrypt est saturé
+    """
+    user = await db.get(User, current_user.id)
+    match, _ = await password_hasher.verify_and_update(password_data.current_password, user.hashed_password)
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Incorrect password"
+        )
+
+    user.hashed_password = await password_hasher.hash(password_data.new_password)
+    await db.commit()
+    await user_cache.ainvalidate(user.id)
+
+    return None
+
 @router.get("/users")
-def get_all_users(db: Session = Depends(get_db)):
-    users = db.query(User).all()
+async def get_all_users(db: AsyncSession = Depends(get_db)):
+    users = (await db.execute(select(User))).scalars().all()
     return users
 
-@router.delete("/user/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: int, db: Session = Depends(get_db)):
-    to_delete = db.query(User).filter(User.id == user_id).first()
+@router.delete(
+    "/user/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobResponse, "description": "Deletion running in background"}},
+)
+async def delete_user(user_id: int, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)):
+    to_delete = await db.get(User, user_id)
 
     if not to_delete:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    
-    db.delete(to_delete)
-    db.commit()
\ No newline at end of file
+
+    # Gros compte : suppression par batches en tâche de fond (202 + job)
+    card_count = (await db.execute(
+        select(func.coalesce(func.sum(Category.card_count), 0)).where(Category.user_id == user_id)
+    )).scalar()
+    if card_count > settings.DELETE_SYNC_MAX_CARDS:
+        # Compte inutilisable dès la réponse (login et tokens refusés) :
+        # deleted_at, NOTIFY et job commités ensemble (submit_job ne commit pas)
+        if to_delete.deleted_at is None:
+            to_delete.deleted_at = datetime.utcnow()
+            await db.execute(user_changed_notification(user_id))  # Cache des autres process API
+        job = await submit_job(db, background_tasks, user_id, JOB_DELETE_USER, {"user_id": user_id})
+        await db.commit()
+        await user_cache.ainvalidate(user_id)
+        # Le user ne peut plus s'authentifier : suivi du job par son token
+        return ORJSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=JobResponse.model_validate(job).model_dump(mode="json"),
+            headers={"Location": f"/api/jobs/status/{job.token}"},
+        )
+
+    # ON DELETE CASCADE en DB : catégories et flashcards supprimées sans les charger
+    # (review_logs, tombstones et daily_review_stats n'ont pas de ForeignKey)
+    await db.execute(delete(ReviewLog).where(ReviewLog.user_id == user_id))
+    await db.execute(delete(Tombstone).where(Tombstone.user_id == user_id))
+    await db.execute(delete(DailyReviewStats).where(DailyReviewStats.user_id == user_id))
+    await db.delete(to_delete)
+    await db.execute(user_changed_notification(user_id))  # Cache des autres process API
+    await db.commit()
+    # Sinon ses tokens restent valides jusqu'à expiration du cache
+    await user_cache.ainvalidate(user_id)
\ No newline at end of file
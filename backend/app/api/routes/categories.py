@@ -1,47 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.revision import bump_revision, not_modified_response
 from app.api.dependencies import get_current_user
-from app.models import User, Category, FlashCard
-from app.schemas import CategoryCreate, CategoryUpdate, CategoryResponse
+from app.models import User, Category, Tombstone
+from app.models.job import JOB_DELETE_CATEGORY
+from app.models.tombstone import TOMBSTONE_CATEGORY
+from app.schemas import CategoryCreate, CategoryUpdate, CategoryResponse, JobResponse
+from app.services.jobs import submit_job
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
 
 @router.get("", response_model=List[CategoryResponse])
-def get_categories(
+async def get_categories(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupérer toutes les catégories du user connecté
 
+    Requête conditionnelle : If-None-Match = ETag précédent → 304 si rien n'a changé
+
     Returns:
         List[CategoryResponse]: Liste des catégories avec le nombre de flashcards
     """
-    # Query avec count des flashcards par catégorie
+    not_modified = await not_modified_response(request, response, db, current_user.id)
+    if not_modified is not None:
+        return not_modified
+
+    # Compteurs dénormalisés : pas de JOIN + GROUP BY sur flashcards
     categories = (
-        db.query(
-            Category,
-            func.count(FlashCard.id).label("flashcard_count")
-        )
-        .outerjoin(FlashCard, Category.id == FlashCard.category_id)
-        .filter(Category.user_id == current_user.id)
-        .group_by(Category.id)
-        .all()
-    )
+        await db.execute(select(Category).where(Category.user_id == current_user.id))
+    ).scalars().all()
 
     # Formatter la réponse
     result = []
-    for category, count in categories:
+    for category in categories:
         category_dict = {
             "id": category.id,
             "name": category.name,
             "user_id": category.user_id,
             "created_at": category.created_at,
-            "flashcard_count": count
+            "flashcard_count": category.card_count,
+            "new_count": category.new_count
         }
         result.append(category_dict)
 
@@ -49,10 +57,10 @@ def get_categories(
 
 
 @router.post("", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
-def create_category(
+async def create_category(
     category_data: CategoryCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Créer une nouvelle catégorie
@@ -69,8 +77,9 @@ def create_category(
         user_id=current_user.id
     )
     db.add(db_category)
-    db.commit()
-    db.refresh(db_category)
+    await db.execute(bump_revision(current_user.id))
+    await db.commit()
+    await db.refresh(db_category)
 
     # Retourner avec flashcard_count = 0
     return {
@@ -78,16 +87,17 @@ def create_category(
         "name": db_category.name,
         "user_id": db_category.user_id,
         "created_at": db_category.created_at,
-        "flashcard_count": 0
+        "flashcard_count": 0,
+        "new_count": 0
     }
 
 
 @router.put("/{category_id}", response_model=CategoryResponse)
-def update_category(
+async def update_category(
     category_id: int,
     category_data: CategoryUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Modifier une catégorie
@@ -104,7 +114,7 @@ def update_category(
         403: Si catégorie n'appartient pas au user
     """
     # Trouver la catégorie
-    category = db.query(Category).filter(Category.id == category_id).first()
+    category = await db.get(Category, category_id)
 
     if not category:
         raise HTTPException(
@@ -121,39 +131,49 @@ def update_category(
 
     # Update
     category.name = category_data.name
-    db.commit()
-    db.refresh(category)
-
-    # Count flashcards
-    flashcard_count = db.query(FlashCard).filter(FlashCard.category_id == category_id).count()
+    await db.execute(bump_revision(current_user.id))
+    await db.commit()
+    await db.refresh(category)
 
     return {
         "id": category.id,
         "name": category.name,
         "user_id": category.user_id,
         "created_at": category.created_at,
-        "flashcard_count": flashcard_count
+        "flashcard_count": category.card_count,
+        "new_count": category.new_count
     }
 
 
-@router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_category(
+@router.delete(
+    "/{category_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobResponse, "description": "Deletion running in background"}},
+)
+async def delete_category(
     category_id: int,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Supprimer une catégorie (cascade delete les flashcards)
 
+    Au-delà de DELETE_SYNC_MAX_CARDS cartes, la suppression part en tâche de
+    fond (batches) : 202 + job à suivre avec GET /api/jobs/{id}.
+
     Args:
         category_id: ID de la catégorie
 
+    Returns:
+        204 (supprimée) ou 202 + JobResponse (suppression en cours)
+
     Raises:
         404: Si catégorie n'existe pas
         403: Si catégorie n'appartient pas au user
     """
     # Trouver la catégorie
-    category = db.query(Category).filter(Category.id == category_id).first()
+    category = await db.get(Category, category_id)
 
     if not category:
         raise HTTPException(
@@ -168,8 +188,21 @@ def delete_category(
             detail="Not authorized to delete this category"
         )
 
-    # Delete (cascade supprime les flashcards)
-    db.delete(category)
-    db.commit()
+    # Grosse catégorie : pas de DELETE de 100k lignes dans la requête
+    if category.card_count > settings.DELETE_SYNC_MAX_CARDS:
+        job = await submit_job(db, background_tasks, current_user.id, JOB_DELETE_CATEGORY, {"category_id": category.id})
+        await db.commit()
+        return ORJSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=JobResponse.model_validate(job).model_dump(mode="json"),
+            headers={"Location": f"/api/jobs/{job.id}"},
+        )
+
+    # Delete (ON DELETE CASCADE en DB supprime les flashcards)
+    # Un seul tombstone : le client supprime aussi les cartes de la catégorie
+    await db.delete(category)
+    db.add(Tombstone(user_id=current_user.id, entity_type=TOMBSTONE_CATEGORY, entity_id=category.id))
+    await db.execute(bump_revision(current_user.id))
+    await db.commit()
 
     return None
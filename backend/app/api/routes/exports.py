@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Literal, Optional
+from app.core.config import settings
+from app.core.database import SessionLocal, get_sync_db
+from app.api.dependencies import get_current_user
+from app.models import User, Category
+from app.services.deck_export import EXPORT_MEDIA_TYPES, stream_export
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@router.get("")
+def export_deck(
+    format: Literal["csv", "jsonl", "apkg"] = Query("csv", description="Export format"),
+    category_id: Optional[int] = Query(None, description="Export only this category"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_sync_db)
+):
+    """
+    Exporter les flashcards du user (sauvegarde ou migration vers Anki)
+
+    Formats:
+        csv: question, answer, category, puis id, dates et planification
+             (réimportable tel quel via POST /api/import)
+        jsonl: Un objet JSON par carte (mêmes champs que csv)
+        apkg: Paquet Anki, une catégorie = un deck
+
+    Les lignes sont lues avec un curseur serveur et envoyées au fur et à
+    mesure (StreamingResponse) : la mémoire utilisée ne dépend pas de la
+    taille du deck.
+
+    Query params:
+        format: "csv" (défaut), "jsonl" ou "apkg"
+        category_id: (optionnel) ID de la catégorie à exporter
+
+    Raises:
+        404: Si catégorie n'existe pas
+        403: Si catégorie n'appartient pas au user
+    """
+    if category_id is not None:
+        # Vérifier que la catégorie existe et appartient au user
+        category = db.query(Category).filter(Category.id == category_id).first()
+
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Category not found"
+            )
+
+        if category.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to export this category"
+            )
+
+    media_type, extension = EXPORT_MEDIA_TYPES[format]
+
+    return StreamingResponse(
+        stream_export(SessionLocal, current_user.id, format, category_id, settings.EXPORT_BATCH_SIZE),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="flashcards.{extension}"'},
+    )
@@ -1,105 +1,384 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.core.database import get_db
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import (
+    Float, Integer, Text, any_, bindparam, cast, column, delete, func, insert, literal, select, update, values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.responses import rows_to_dicts, trusted_json_response
+from app.core.revision import bump_revision, not_modified_response
+from app.core.search import (
+    build_prefix_query, build_tsquery, fuzzy_filter, fuzzy_rank, substring_filter,
+)
 from app.api.dependencies import get_current_user
-from app.models import User, Category, FlashCard
-from app.schemas import FlashCardCreate, FlashCardUpdate, FlashCardResponse
+from app.models import User, Category, FlashCard, Tombstone
+from app.models.tombstone import TOMBSTONE_FLASHCARD
+from app.scheduling import STATE_NEW
+from app.services.category_counters import CategoryCounterDeltas
+from app.schemas import (
+    FlashCardCreate, FlashCardUpdate, FlashCardResponse, FlashCardPage, FlashCardSearchPage,
+    FlashCardBatchRequest, FlashCardBatchResponse,
+)
 
 router = APIRouter(prefix="/flashcards", tags=["FlashCards"])
 
 
-@router.get("", response_model=List[FlashCardResponse])
-def get_flashcards(
+# Colonnes projetées pour les listings : une seule requête avec JOIN sur Category
+# (évite le lazy-load de flashcard.category pour chaque ligne = N+1)
+FLASHCARD_COLUMNS = (
+    FlashCard.id,
+    FlashCard.question,
+    FlashCard.answer,
+    FlashCard.category_id,
+    Category.name.label("category_name"),
+    FlashCard.user_id,
+    FlashCard.created_at,
+    FlashCard.updated_at,
+)
+
+
+@router.get("", response_model=FlashCardPage)
+async def get_flashcards(
+    request: Request,
+    response: Response,
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    limit: int = Query(100, ge=1, le=1000, description="Page size"),
+    cursor: Optional[int] = Query(None, description="next_cursor of the previous page"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Récupérer les flashcards du user (toutes ou par catégorie)
+    Récupérer les flashcards du user (toutes ou par catégorie), page par page
+
+    Pagination keyset sur l'ID : chaque page reprend après la dernière carte
+    de la page précédente (WHERE id > cursor), donc le coût d'une page ne
+    dépend pas de la taille du deck (contrairement à OFFSET).
+
+    Requête conditionnelle : ETag = révision du user (+ query params) ;
+    If-None-Match identique → 304 sans relire les cartes.
 
     Query params:
         category_id: (optionnel) ID de la catégorie pour filtrer
+        limit: Nombre de cartes par page (max 1000)
+        cursor: (optionnel) next_cursor renvoyé par la page précédente
 
     Returns:
-        List[FlashCardResponse]: Liste des flashcards avec le nom de catégorie
+        FlashCardPage: Flashcards avec le nom de catégorie + curseur suivant
     """
-    query = db.query(FlashCard).filter(FlashCard.user_id == current_user.id)
+    not_modified = await not_modified_response(request, response, db, current_user.id)
+    if not_modified is not None:
+        return not_modified
+
+    query = (
+        select(*FLASHCARD_COLUMNS)
+        .join(Category, Category.id == FlashCard.category_id)
+        .where(FlashCard.user_id == current_user.id)
+    )
 
     # Filter par catégorie si fourni
     if category_id is not None:
-        query = query.filter(FlashCard.category_id == category_id)
-
-    flashcards = query.all()
-
-    # Ajouter le nom de la catégorie
-    result = []
-    for flashcard in flashcards:
-        flashcard_dict = {
-            "id": flashcard.id,
-            "question": flashcard.question,
-            "answer": flashcard.answer,
-            "category_id": flashcard.category_id,
-            "category_name": flashcard.category.name if flashcard.category else None,
-            "user_id": flashcard.user_id,
-            "created_at": flashcard.created_at,
-            "updated_at": flashcard.updated_at
-        }
-        result.append(flashcard_dict)
+        query = query.where(FlashCard.category_id == category_id)
+
+    if cursor is not None:
+        query = query.where(FlashCard.id > cursor)
 
-    return result
+    # limit + 1 pour savoir s'il reste une page sans faire de COUNT(*)
+    result = await db.execute(query.order_by(FlashCard.id).limit(limit + 1))
+    rows = result.all()
 
+    has_more = len(rows) > limit
+    rows = rows[:limit]
 
-@router.get("/search", response_model=List[FlashCardResponse])
-def search_flashcards(
-    q: str = Query(..., description="Search keyword"),
+    # Colonnes de FlashCardResponse lues en DB : encodage orjson direct, sans revalidation
+    return trusted_json_response({
+        "items": rows_to_dicts(result.keys(), rows),
+        "next_cursor": rows[-1].id if has_more else None
+    }, response.headers)
+
+
+@router.get("/search", response_model=FlashCardSearchPage)
+async def search_flashcards(
+    q: str = Query(..., min_length=1, description="Search keyword"),
+    mode: Literal["fulltext", "fuzzy", "substring"] = Query("fulltext", description="Search mode"),
+    lang: Optional[Literal["english", "french"]] = Query(None, description="Stemming language (default: all)"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    offset: int = Query(0, ge=0, le=10000, description="next_offset of the previous page"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Rechercher des flashcards par mot-clé (dans question ou answer)
 
+    Modes:
+        fulltext: Recherche full-text PostgreSQL (index GIN sur search_vector),
+                  avec stemming anglais/français et préfixes ("fast api" trouve
+                  "FastAPI"), résultats triés par pertinence (ts_rank)
+        fuzzy: Recherche tolérante aux fautes de frappe ("fastpai" trouve
+               "FastAPI") par similarité de trigrammes (pg_trgm, index GIN),
+               triée par similarité
+        substring: Ancien comportement "contient" (ILIKE '%q%'), servi par
+                   les mêmes index trigrammes
+
     Query params:
         q: Mot-clé à rechercher
+        mode: "fulltext" (défaut), "fuzzy" ou "substring"
+        lang: (optionnel) "english" ou "french" pour restreindre le stemming
+        limit: Nombre de résultats par page (max 100)
+        offset: next_offset renvoyé par la page précédente
 
     Returns:
-        List[FlashCardResponse]: Flashcards qui matchent
+        FlashCardSearchPage: Flashcards qui matchent + offset de la page suivante
     """
-    search_pattern = f"%{q}%"
-
-    flashcards = (
-        db.query(FlashCard)
-        .filter(FlashCard.user_id == current_user.id)
-        .filter(
-            (FlashCard.question.ilike(search_pattern)) |
-            (FlashCard.answer.ilike(search_pattern))
-        )
-        .all()
+    query = (
+        select(*FLASHCARD_COLUMNS)
+        .join(Category, Category.id == FlashCard.category_id)
+        .where(FlashCard.user_id == current_user.id)
     )
 
-    # Formatter
-    result = []
-    for flashcard in flashcards:
-        flashcard_dict = {
-            "id": flashcard.id,
-            "question": flashcard.question,
-            "answer": flashcard.answer,
-            "category_id": flashcard.category_id,
-            "category_name": flashcard.category.name if flashcard.category else None,
-            "user_id": flashcard.user_id,
-            "created_at": flashcard.created_at,
-            "updated_at": flashcard.updated_at
+    if mode == "fulltext":
+        prefix_query = build_prefix_query(q)
+        if prefix_query is None:
+            return {"items": [], "next_offset": None}
+
+        tsquery = build_tsquery(prefix_query, lang)
+        rank = func.ts_rank(FlashCard.search_vector, tsquery)
+        query = (
+            query.add_columns(rank.label("rank"))
+            .where(FlashCard.search_vector.op("@@")(tsquery))
+            .order_by(rank.desc(), FlashCard.id)
+        )
+    elif mode == "fuzzy":
+        # Seuil de similarité pour l'opérateur <% (local à la transaction)
+        await db.execute(
+            select(func.set_config(
+                "pg_trgm.word_similarity_threshold",
+                str(settings.SEARCH_FUZZY_THRESHOLD),
+                True,
+            ))
+        )
+
+        rank = fuzzy_rank(FlashCard.question, FlashCard.answer, q)
+        query = (
+            query.add_columns(rank.label("rank"))
+            .where(fuzzy_filter(FlashCard.question, FlashCard.answer, q))
+            .order_by(rank.desc(), FlashCard.id)
+        )
+    else:
+        query = (
+            query.add_columns(literal(0.0, Float).label("rank"))  # Pas de score : même forme de réponse
+            .where(substring_filter(FlashCard.question, FlashCard.answer, q))
+            .order_by(FlashCard.id)
+        )
+
+    # limit + 1 pour savoir s'il reste une page sans faire de COUNT(*)
+    result = await db.execute(query.offset(offset).limit(limit + 1))
+    rows = result.all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return trusted_json_response({
+        "items": rows_to_dicts(result.keys(), rows),
+        "next_offset": offset + limit if has_more else None
+    })
+
+
+@router.post("/batch", response_model=FlashCardBatchResponse)
+async def batch_flashcards(
+    batch: FlashCardBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Créer / modifier / supprimer plusieurs flashcards en une seule requête
+
+    Process:
+        1. Ownership vérifiée en 2 requêtes (toutes les catégories, toutes les cartes)
+        2. Opérations invalides → erreur dans leur résultat, les autres sont appliquées
+        3. Un INSERT ... RETURNING multi-lignes, un UPDATE ... FROM (VALUES ...)
+           et un DELETE ... WHERE id = ANY(...), dans une seule transaction
+
+    Args:
+        batch: {"operations": [
+            {"op": "create", "question": "...", "answer": "...", "category_id": 1},
+            {"op": "update", "id": 12, "answer": "..."},
+            {"op": "delete", "id": 13}
+        ]}
+
+    Returns:
+        FlashCardBatchResponse: Un résultat par opération (même ordre),
+        avec status_code 201 / 200 / 204 ou 403 / 404 / 409 / 422
+    """
+    operations = batch.operations
+    results: List[Optional[dict]] = [None] * len(operations)
+
+    def fail(index: int, op: str, status_code: int, detail: str) -> None:
+        results[index] = {"index": index, "op": op, "status_code": status_code, "detail": detail}
+
+    # Ownership : une requête par table, quel que soit le nombre d'opérations
+    category_ids = {op.category_id for op in operations if op.op != "delete" and op.category_id is not None}
+    category_owners = dict(
+        (await db.execute(
+            select(Category.id, Category.user_id)
+            .where(Category.id == any_(bindparam("category_ids", list(category_ids), type_=ARRAY(Integer))))
+        )).all()
+    ) if category_ids else {}
+
+    # (+ catégorie et état actuels, pour les compteurs des catégories)
+    flashcard_ids = {op.id for op in operations if op.op != "create" and op.id is not None}
+    flashcards_before = {
+        row.id: row
+        for row in await db.execute(
+            select(FlashCard.id, FlashCard.user_id, FlashCard.category_id, FlashCard.state)
+            .where(FlashCard.id == any_(bindparam("flashcard_ids", list(flashcard_ids), type_=ARRAY(Integer))))
+        )
+    } if flashcard_ids else {}
+
+    # Validation de chaque opération
+    creates, updates, deletes = [], [], []
+    seen_ids = set()
+    for index, op in enumerate(operations):
+        if op.op == "create":
+            if not op.question or not op.answer or op.category_id is None:
+                fail(index, op.op, status.HTTP_422_UNPROCESSABLE_ENTITY, "question, answer and category_id are required")
+                continue
+        else:
+            if op.id is None:
+                fail(index, op.op, status.HTTP_422_UNPROCESSABLE_ENTITY, "id is required")
+                continue
+            if op.id in seen_ids:
+                fail(index, op.op, status.HTTP_409_CONFLICT, "Duplicate flashcard id in batch")
+                continue
+            seen_ids.add(op.id)
+
+            before = flashcards_before.get(op.id)
+            if before is None:
+                fail(index, op.op, status.HTTP_404_NOT_FOUND, "FlashCard not found")
+                continue
+            if before.user_id != current_user.id:
+                fail(index, op.op, status.HTTP_403_FORBIDDEN, f"Not authorized to {op.op} this flashcard")
+                continue
+            if op.op == "update" and op.question is None and op.answer is None and op.category_id is None:
+                fail(index, op.op, status.HTTP_422_UNPROCESSABLE_ENTITY, "Nothing to update")
+                continue
+
+        if op.op != "delete" and op.category_id is not None:
+            owner_id = category_owners.get(op.category_id)
+            if owner_id is None:
+                fail(index, op.op, status.HTTP_404_NOT_FOUND, "Category not found")
+                continue
+            if owner_id != current_user.id:
+                fail(index, op.op, status.HTTP_403_FORBIDDEN, "Not authorized to use this category")
+                continue
+
+        {"create": creates, "update": updates, "delete": deletes}[op.op].append((index, op))
+
+    # Compteurs des catégories, mis à jour dans la même transaction
+    deltas = CategoryCounterDeltas()
+    for _, op in creates:
+        deltas.add(op.category_id, is_new=True)
+    for _, op in updates:
+        before = flashcards_before[op.id]
+        if op.category_id is not None:
+            deltas.move(before.category_id, op.category_id, is_new=before.state == STATE_NEW)
+    for _, op in deletes:
+        before = flashcards_before[op.id]
+        deltas.add(before.category_id, is_new=before.state == STATE_NEW, sign=-1)
+
+    # Créations : INSERT multi-lignes, IDs renvoyés dans l'ordre des opérations
+    if creates:
+        created_ids = (await db.execute(
+            insert(FlashCard).returning(FlashCard.id, sort_by_parameter_order=True),
+            [
+                {
+                    "question": op.question,
+                    "answer": op.answer,
+                    "category_id": op.category_id,
+                    "user_id": current_user.id,
+                }
+                for _, op in creates
+            ],
+        )).scalars().all()
+        for (index, op), flashcard_id in zip(creates, created_ids):
+            results[index] = {"index": index, "op": op.op, "status_code": status.HTTP_201_CREATED, "id": flashcard_id}
+
+    # Modifications : un seul UPDATE ... FROM (VALUES ...), champs absents = inchangés
+    if updates:
+        rows = values(
+            column("id", Integer),
+            column("question", Text),
+            column("answer", Text),
+            column("category_id", Integer),
+            name="batch",
+        ).data([(op.id, op.question, op.answer, op.category_id) for _, op in updates])
+        await db.execute(
+            update(FlashCard)
+            .where(FlashCard.id == rows.c.id)
+            .values(
+                question=func.coalesce(rows.c.question, FlashCard.question),
+                answer=func.coalesce(rows.c.answer, FlashCard.answer),
+                category_id=func.coalesce(cast(rows.c.category_id, Integer), FlashCard.category_id),
+                updated_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        for index, op in updates:
+            results[index] = {"index": index, "op": op.op, "status_code": status.HTTP_200_OK, "id": op.id}
+
+    # Suppressions : un seul DELETE ... WHERE id = ANY(...)
+    if deletes:
+        delete_ids = [op.id for _, op in deletes]
+        await db.execute(
+            delete(FlashCard)
+            .where(FlashCard.id == any_(bindparam("delete_ids", delete_ids, type_=ARRAY(Integer))))
+            .execution_options(synchronize_session=False)
+        )
+        # Tombstones pour le delta sync (GET /api/sync)
+        await db.execute(
+            insert(Tombstone),
+            [
+                {"user_id": current_user.id, "entity_type": TOMBSTONE_FLASHCARD, "entity_id": flashcard_id}
+                for flashcard_id in delete_ids
+            ],
+        )
+        for index, op in deletes:
+            results[index] = {"index": index, "op": op.op, "status_code": status.HTTP_204_NO_CONTENT, "id": op.id}
+
+    counters = deltas.statement()
+    if counters is not None:
+        await db.execute(counters)
+
+    if creates or updates or deletes:
+        await db.execute(bump_revision(current_user.id))
+
+    # Cartes créées/modifiées renvoyées avec le nom de catégorie (une requête)
+    written_ids = [result["id"] for result in results if result["status_code"] in (200, 201)]
+    if written_ids:
+        flashcards = {
+            row.id: dict(row._mapping)
+            for row in await db.execute(
+                select(*FLASHCARD_COLUMNS)
+                .join(Category, Category.id == FlashCard.category_id)
+                .where(FlashCard.id == any_(bindparam("written_ids", written_ids, type_=ARRAY(Integer))))
+            )
         }
-        result.append(flashcard_dict)
+        for result in results:
+            if result["status_code"] in (200, 201):
+                result["flashcard"] = flashcards.get(result["id"])
+
+    await db.commit()
 
-    return result
+    return {"results": results}
 
 
 @router.post("", response_model=FlashCardResponse, status_code=status.HTTP_201_CREATED)
-def create_flashcard(
+async def create_flashcard(
     flashcard_data: FlashCardCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Créer une nouvelle flashcard
@@ -119,7 +398,7 @@ def create_flashcard(
         403: Si catégorie n'appartient pas au user
     """
     # Vérifier que la catégorie existe et appartient au user
-    category = db.query(Category).filter(Category.id == flashcard_data.category_id).first()
+    category = await db.get(Category, flashcard_data.category_id)
 
     if not category:
         raise HTTPException(
@@ -141,8 +420,12 @@ def create_flashcard(
         user_id=current_user.id
     )
     db.add(db_flashcard)
-    db.commit()
-    db.refresh(db_flashcard)
+    deltas = CategoryCounterDeltas()
+    deltas.add(flashcard_data.category_id, is_new=True)
+    await db.execute(deltas.statement())
+    await db.execute(bump_revision(current_user.id))
+    await db.commit()
+    await db.refresh(db_flashcard)
 
     return {
         "id": db_flashcard.id,
@@ -157,11 +440,11 @@ def create_flashcard(
 
 
 @router.put("/{flashcard_id}", response_model=FlashCardResponse)
-def update_flashcard(
+async def update_flashcard(
     flashcard_id: int,
     flashcard_data: FlashCardUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Modifier une flashcard
@@ -178,7 +461,7 @@ def update_flashcard(
         403: Si flashcard n'appartient pas au user
     """
     # Trouver la flashcard
-    flashcard = db.query(FlashCard).filter(FlashCard.id == flashcard_id).first()
+    flashcard = await db.get(FlashCard, flashcard_id)
 
     if not flashcard:
         raise HTTPException(
@@ -202,7 +485,7 @@ def update_flashcard(
 
     if flashcard_data.category_id is not None:
         # Vérifier que la nouvelle catégorie existe et appartient au user
-        category = db.query(Category).filter(Category.id == flashcard_data.category_id).first()
+        category = await db.get(Category, flashcard_data.category_id)
 
         if not category:
             raise HTTPException(
@@ -216,17 +499,28 @@ def update_flashcard(
                 detail="Not authorized to use this category"
             )
 
+        # Compteurs : la carte quitte son ancienne catégorie
+        deltas = CategoryCounterDeltas()
+        deltas.move(flashcard.category_id, flashcard_data.category_id, is_new=flashcard.state == STATE_NEW)
+        counters = deltas.statement()
+        if counters is not None:
+            await db.execute(counters)
+
         flashcard.category_id = flashcard_data.category_id
 
-    db.commit()
-    db.refresh(flashcard)
+    await db.execute(bump_revision(current_user.id))
+    await db.commit()
+    await db.refresh(flashcard)
+
+    # Pas de lazy-load de flashcard.category en async : nom lu explicitement
+    category_name = await db.scalar(select(Category.name).where(Category.id == flashcard.category_id))
 
     return {
         "id": flashcard.id,
         "question": flashcard.question,
         "answer": flashcard.answer,
         "category_id": flashcard.category_id,
-        "category_name": flashcard.category.name if flashcard.category else None,
+        "category_name": category_name,
         "user_id": flashcard.user_id,
         "created_at": flashcard.created_at,
         "updated_at": flashcard.updated_at
@@ -234,10 +528,10 @@ def update_flashcard(
 
 
 @router.delete("/{flashcard_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_flashcard(
+async def delete_flashcard(
     flashcard_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Supprimer une flashcard
@@ -250,7 +544,7 @@ def delete_flashcard(
         403: Si flashcard n'appartient pas au user
     """
     # Trouver la flashcard
-    flashcard = db.query(FlashCard).filter(FlashCard.id == flashcard_id).first()
+    flashcard = await db.get(FlashCard, flashcard_id)
 
     if not flashcard:
         raise HTTPException(
@@ -265,8 +559,13 @@ def delete_flashcard(
             detail="Not authorized to delete this flashcard"
         )
 
-    # Delete
-    db.delete(flashcard)
-    db.commit()
+    # Delete (+ tombstone pour le delta sync)
+    await db.delete(flashcard)
+    db.add(Tombstone(user_id=current_user.id, entity_type=TOMBSTONE_FLASHCARD, entity_id=flashcard.id))
+    deltas = CategoryCounterDeltas()
+    deltas.add(flashcard.category_id, is_new=flashcard.state == STATE_NEW, sign=-1)
+    await db.execute(deltas.statement())
+    await db.execute(bump_revision(current_user.id))
+    await db.commit()
 
     return None
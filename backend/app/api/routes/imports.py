@@ -0,0 +1,129 @@
+import logging
+import os
+import shutil
+import uuid
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
+from typing import Literal, Optional
+from app.core.config import settings
+from app.core.database import get_sync_db
+from app.core.revision import bump_revision
+from app.api.dependencies import get_current_user
+from app.models import User, Category
+from app.models.job import JOB_IMPORT_DECK
+from app.schemas import ImportResult, JobResponse
+from app.services.deck_import import DeckImporter, DeckImportError, detect_format, iter_import_rows
+from app.services.jobs import enqueue_job
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/import", tags=["Import"])
+
+
+@router.post(
+    "",
+    response_model=ImportResult,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobResponse, "description": "Import queued (background=true)"}},
+)
+def import_deck(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description=".apkg, .csv or .tsv file"),
+    format: Optional[Literal["apkg", "csv", "tsv"]] = Query(None, description="Default: from file extension"),
+    category_id: Optional[int] = Query(None, description="Category for rows without one"),
+    background: bool = Query(False, description="Import in a background job (202 + job)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_sync_db)
+):
+    """
+    Importer un deck (paquet Anki .apkg ou fichier CSV/TSV)
+
+    Formats:
+        apkg: Paquet Anki, une catégorie par deck (question = 1er champ, answer = 2e)
+        csv/tsv: Colonnes question, answer[, category] (en-tête optionnel)
+
+    Le fichier est lu de manière incrémentale et les cartes sont insérées par
+    batch de IMPORT_BATCH_SIZE dans une seule transaction : tout ou rien.
+
+    Query params:
+        format: (optionnel) Format du fichier, déduit de l'extension sinon
+        category_id: (optionnel) Catégorie des lignes sans catégorie
+                     (défaut: catégorie "Imported", créée si besoin)
+        background: (optionnel) Gros deck : fichier mis de côté et importé par
+                    un worker, progression avec GET /api/jobs/{id}
+
+    Returns:
+        201 + ImportResult: Nombre de cartes importées, catégories créées, lignes ignorées
+        202 + JobResponse: Import en file (background=true), résultat dans job.progress
+
+    Raises:
+        400: Si format inconnu ou fichier invalide
+        404: Si catégorie n'existe pas
+        403: Si catégorie n'appartient pas au user
+    """
+    format = format or detect_format(file.filename)
+    if format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown file format (use .apkg, .csv or .tsv, or the format parameter)"
+        )
+
+    if category_id is not None:
+        # Vérifier que la catégorie existe et appartient au user
+        category = db.query(Category).filter(Category.id == category_id).first()
+
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Category not found"
+            )
+
+        if category.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to use this category"
+            )
+
+    if background:
+        # Fichier partagé avec les workers (JOB_FILES_DIR), supprimé par le job
+        os.makedirs(settings.JOB_FILES_DIR, exist_ok=True)
+        path = os.path.join(settings.JOB_FILES_DIR, f"{uuid.uuid4().hex}.{format}")
+        with open(path, "wb") as saved:
+            shutil.copyfileobj(file.file, saved)
+
+        job = enqueue_job(
+            db, current_user.id, JOB_IMPORT_DECK,
+            {"path": path, "format": format, "category_id": category_id},
+            background_tasks,
+        )
+        return ORJSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=JobResponse.model_validate(job).model_dump(mode="json"),
+            headers={"Location": f"/api/jobs/{job.id}"},
+        )
+
+    def log_progress(progress: dict) -> None:
+        logger.info("Import for user %s: %s", current_user.id, progress)
+
+    importer = DeckImporter(
+        db,
+        current_user.id,
+        default_category_id=category_id,
+        batch_size=settings.IMPORT_BATCH_SIZE,
+        on_progress=log_progress,
+    )
+
+    try:
+        result = importer.run(iter_import_rows(file.file, format))
+    except DeckImportError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    db.execute(bump_revision(current_user.id))
+    db.commit()
+
+    return {"format": format, **result}
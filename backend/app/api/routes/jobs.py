@@ -0,0 +1,99 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.api.dependencies import get_current_user
+from app.models import User, Job
+from app.schemas import JobCreate, JobResponse
+from app.services.jobs import submit_job
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    job_data: JobCreate,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Lancer un job sur ses propres données
+
+    Kinds:
+        optimize_scheduler: Ajuster les paramètres FSRS sur l'historique de révisions
+        reconcile_counters: Recalculer les compteurs des catégories
+
+    Si le même job est déjà en attente ou en cours, il est renvoyé tel quel.
+
+    Returns:
+        JobResponse: Job en file (suivi avec GET /api/jobs/{id}, header Location)
+    """
+    job = await submit_job(db, background_tasks, current_user.id, job_data.kind, {"user_id": current_user.id})
+    await db.commit()
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+    return job
+
+
+# Avant /{job_id} : "status" n'est pas un id
+@router.get("/status/{token}", response_model=JobResponse)
+async def get_job_by_token(token: str, db: AsyncSession = Depends(get_db)):
+    """
+    Suivre un job sans authentification, avec le token renvoyé à sa création
+
+    Pour la suppression d'un compte (DELETE /auth/user/{id}, 202) : le user
+    ne peut plus s'authentifier, mais le job reste lisible jusqu'au bout.
+
+    Returns:
+        JobResponse: État et progression du job
+
+    Raises:
+        404: Si aucun job n'a ce token
+    """
+    job = (await db.execute(select(Job).where(Job.token == token))).scalars().first()
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return job
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Suivre un job en tâche de fond (suppression d'un compte, import, optimisation...)
+
+    À interroger périodiquement jusqu'à status = "succeeded" ou "failed" ;
+    après un échec temporaire, le job repasse "queued" (attempts < max_attempts).
+
+    Returns:
+        JobResponse: État et progression du job
+
+    Raises:
+        404: Si le job n'existe pas
+        403: Si le job n'appartient pas au user
+    """
+    job = await db.get(Job, job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    # Vérifier ownership
+    if job.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this job"
+        )
+
+    return job
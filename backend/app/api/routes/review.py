@@ -0,0 +1,167 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.core.config import settings
+from app.core.database import get_sync_db
+from app.core.revision import bump_revision
+from app.api.dependencies import get_current_user
+from app.api.routes.flashcards import FLASHCARD_COLUMNS
+from app.models import User, Category, FlashCard
+from app.scheduling import STATE_NEW, CardSchedule, FSRSScheduler
+from app.scheduling.review_log import review_log_writer
+from app.services.category_counters import CategoryCounterDeltas
+from app.schemas import ReviewAnswer, ReviewCard, ReviewResult
+
+router = APIRouter(prefix="/review", tags=["Review"])
+
+# Colonnes de planification renvoyées avec chaque carte
+SCHEDULE_COLUMNS = (
+    FlashCard.state,
+    FlashCard.due_at,
+    FlashCard.interval_days,
+    FlashCard.stability,
+    FlashCard.difficulty,
+    FlashCard.reps,
+    FlashCard.lapses,
+    FlashCard.last_reviewed_at,
+)
+
+
+def get_scheduler(user: User) -> FSRSScheduler:
+    """
+    Construit le planificateur FSRS d'un user
+
+    Utilise les paramètres ajustés sur son historique s'ils existent
+    (users.fsrs_weights), sinon les paramètres FSRS par défaut.
+    """
+    return FSRSScheduler(
+        weights=user.fsrs_weights,
+        desired_retention=settings.REVIEW_DESIRED_RETENTION,
+        maximum_interval=settings.REVIEW_MAXIMUM_INTERVAL_DAYS,
+        relearning_minutes=settings.REVIEW_RELEARNING_MINUTES,
+    )
+
+
+@router.get("/next", response_model=List[ReviewCard])
+def get_next_cards(
+    limit: int = Query(20, ge=1, le=200, description="Number of cards"),
+    category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_sync_db)
+):
+    """
+    Récupérer les prochaines cartes à réviser (dues maintenant)
+
+    Les cartes sont lues dans l'ordre de l'index (user_id, due_at) :
+    pas de tri du deck entier, seulement les `limit` premières cartes dues.
+
+    Query params:
+        limit: Nombre de cartes (max 200)
+        category_id: (optionnel) ID de la catégorie pour filtrer
+
+    Returns:
+        List[ReviewCard]: Cartes dues, les plus en retard en premier
+    """
+    query = (
+        db.query(*FLASHCARD_COLUMNS, *SCHEDULE_COLUMNS)
+        .join(Category, Category.id == FlashCard.category_id)
+        .filter(FlashCard.user_id == current_user.id)
+        .filter(FlashCard.due_at <= datetime.utcnow())
+    )
+
+    if category_id is not None:
+        query = query.filter(FlashCard.category_id == category_id)
+
+    rows = query.order_by(FlashCard.due_at).limit(limit).all()
+
+    return [dict(row._mapping) for row in rows]
+
+
+@router.post("/{flashcard_id}", response_model=ReviewResult)
+def review_flashcard(
+    flashcard_id: int,
+    answer: ReviewAnswer,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_sync_db)
+):
+    """
+    Répondre à une carte et la replanifier (FSRS)
+
+    La réponse est aussi ajoutée à review_logs (écriture différée, groupée).
+
+    Args:
+        flashcard_id: ID de la flashcard
+        answer: {"rating": 3, "elapsed_ms": 5400}
+
+    Returns:
+        ReviewResult: Nouvelle planification (due_at, interval_days, ...)
+
+    Raises:
+        404: Si flashcard n'existe pas
+        403: Si flashcard n'appartient pas au user
+    """
+    # FOR UPDATE : deux réponses simultanées sur la même carte sont sérialisées
+    flashcard = (
+        db.query(FlashCard)
+        .filter(FlashCard.id == flashcard_id)
+        .with_for_update()
+        .first()
+    )
+
+    if not flashcard:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="FlashCard not found"
+        )
+
+    # Vérifier ownership
+    if flashcard.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to review this flashcard"
+        )
+
+    schedule = CardSchedule(
+        state=flashcard.state,
+        stability=flashcard.stability,
+        difficulty=flashcard.difficulty,
+        interval_days=flashcard.interval_days,
+        reps=flashcard.reps,
+        lapses=flashcard.lapses,
+        due_at=flashcard.due_at,
+        last_reviewed_at=flashcard.last_reviewed_at,
+    )
+    new_schedule = get_scheduler(current_user).review(schedule, answer.rating, datetime.utcnow())
+
+    flashcard.state = new_schedule.state
+    flashcard.stability = new_schedule.stability
+    flashcard.difficulty = new_schedule.difficulty
+    flashcard.interval_days = new_schedule.interval_days
+    flashcard.reps = new_schedule.reps
+    flashcard.lapses = new_schedule.lapses
+    flashcard.due_at = new_schedule.due_at
+    flashcard.last_reviewed_at = new_schedule.last_reviewed_at
+
+    # Première révision : un "new" de moins dans la catégorie
+    if schedule.state == STATE_NEW and new_schedule.state != STATE_NEW:
+        deltas = CategoryCounterDeltas()
+        deltas.leave_new(flashcard.category_id)
+        db.execute(deltas.statement())
+        db.execute(bump_revision(current_user.id))  # new_count des catégories a changé
+
+    db.commit()
+    db.refresh(flashcard)
+
+    # Historique : écrit en batch par le thread de fond (pas de commit par réponse)
+    review_log_writer.submit({
+        "reviewed_at": new_schedule.last_reviewed_at,
+        "user_id": current_user.id,
+        "card_id": flashcard.id,
+        "rating": answer.rating,
+        "elapsed_ms": answer.elapsed_ms,
+        "state": schedule.state,
+        "interval_days": new_schedule.interval_days,
+    })
+
+    return flashcard
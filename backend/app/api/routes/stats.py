@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_read_db
+from app.api.dependencies import get_current_user
+from app.models import User, Category, DailyReviewStats, Job
+from app.models.job import JOB_REFRESH_STATS, JOB_SUCCEEDED
+from app.models.stats import category_maturity_view, due_forecast_view
+from app.schemas import StatsResponse
+from app.services.stats import FORECAST_DAYS
+
+router = APIRouter(prefix="/stats", tags=["Stats"])
+
+
+@router.get("", response_model=StatsResponse)
+async def get_stats(
+    days: int = Query(30, ge=1, le=365, description="History window in days"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Statistiques d'étude du user connecté (tableau de bord)
+
+    Lues dans des agrégats précalculés, sans parcourir review_logs ni les cartes :
+        reviews_per_day, retention: daily_review_stats (à jour à chaque écriture des review logs)
+        due_forecast, categories: vues matérialisées rafraîchies toutes les
+                                  STATS_REFRESH_INTERVAL_SECONDS (voir refreshed_at)
+
+    Jours en UTC.
+
+    Query params:
+        days: Période de l'historique (défaut: 30 derniers jours, aujourd'hui inclus)
+
+    Returns:
+        StatsResponse: Révisions par jour, rétention, prévision sur 30 jours, maturité par catégorie
+    """
+    today = datetime.utcnow().date()
+    start = today - timedelta(days=days - 1)
+
+    # Historique : au plus `days` lignes (clé primaire (user_id, day))
+    daily = {
+        row.day: row
+        for row in (await db.execute(
+            select(DailyReviewStats)
+            .where(DailyReviewStats.user_id == current_user.id, DailyReviewStats.day >= start)
+        )).scalars().all()
+    }
+    reviews_per_day = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = daily.get(day)
+        reviews_per_day.append({
+            "day": day,
+            "reviews": row.reviews if row else 0,
+            "new_cards": row.new_cards if row else 0,
+            "again": row.again if row else 0,
+            "time_ms": row.elapsed_ms if row else 0,
+        })
+
+    review_reviews = sum(row.review_reviews for row in daily.values())
+    review_passed = sum(row.review_passed for row in daily.values())
+    retention = {
+        "reviews": review_reviews,
+        "passed": review_passed,
+        "rate": round(review_passed / review_reviews, 4) if review_reviews else None,
+    }
+
+    # Prévision : jours déjà passés depuis le rafraîchissement = cartes en retard, dues aujourd'hui
+    forecast = [0] * FORECAST_DAYS
+    for day, cards in (await db.execute(
+        select(due_forecast_view.c.day, due_forecast_view.c.cards)
+        .where(due_forecast_view.c.user_id == current_user.id)
+    )).all():
+        offset = max((day - today).days, 0)
+        if offset < FORECAST_DAYS:
+            forecast[offset] += cards
+    due_forecast = [
+        {"day": today + timedelta(days=offset), "cards": cards}
+        for offset, cards in enumerate(forecast)
+    ]
+
+    # Catégories créées depuis le dernier rafraîchissement : zéros
+    maturity = category_maturity_view.c
+    categories = (await db.execute(
+        select(
+            Category.id.label("category_id"),
+            Category.name,
+            func.coalesce(maturity.new, 0).label("new"),
+            func.coalesce(maturity.learning, 0).label("learning"),
+            func.coalesce(maturity.young, 0).label("young"),
+            func.coalesce(maturity.mature, 0).label("mature"),
+        )
+        .outerjoin(category_maturity_view, maturity.category_id == Category.id)
+        .where(Category.user_id == current_user.id)
+        .order_by(Category.name)
+    )).all()
+
+    # Dernier job refresh_stats réussi (index (user_id, created_at), user_id NULL)
+    refreshed_at = (await db.execute(
+        select(Job.finished_at)
+        .where(Job.user_id.is_(None), Job.kind == JOB_REFRESH_STATS, Job.status == JOB_SUCCEEDED)
+        .order_by(Job.created_at.desc())
+        .limit(1)
+    )).scalar()
+
+    return {
+        "days": days,
+        "reviews_per_day": reviews_per_day,
+        "retention": retention,
+        "due_forecast": due_forecast,
+        "categories": [dict(row._mapping) for row in categories],
+        "refreshed_at": refreshed_at,
+    }
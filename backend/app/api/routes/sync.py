@@ -0,0 +1,148 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import text, tuple_
+from sqlalchemy.orm import Session
+from typing import Optional, Tuple
+from app.core.database import get_sync_db
+from app.api.dependencies import get_current_user
+from app.api.routes.flashcards import FLASHCARD_COLUMNS
+from app.api.routes.review import SCHEDULE_COLUMNS
+from app.models import User, Category, FlashCard, Tombstone
+from app.models.tombstone import TOMBSTONE_FLASHCARD, TOMBSTONE_CATEGORY
+from app.schemas import SyncResponse
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+# Plus ancienne transaction encore en cours : toutes celles avant sont terminées
+SNAPSHOT_XMIN = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+
+def encode_watermark(xid: int, last_id: int) -> str:
+    return f"{xid}|{last_id}"
+
+
+def decode_watermark(watermark: str) -> Tuple[int, int]:
+    """
+    Décode un watermark "xid|id" renvoyé par un sync précédent
+
+    Les anciens watermarks "timestamp|id" repartent du début (0, 0) : le
+    client reçoit à nouveau tout, suppressions comprises, sans rien manquer.
+
+    Raises:
+        400: Si le watermark est invalide
+    """
+    try:
+        xid, last_id = watermark.rsplit("|", 1)
+        last_id = int(last_id)
+        if xid.isdigit():
+            return int(xid), last_id
+        datetime.fromisoformat(xid)
+        return 0, 0
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid watermark"
+        )
+
+
+def next_watermark(
+    since_xid: int,
+    snapshot_xmin: int,
+    last_card: Optional[Tuple[int, int]] = None,
+) -> str:
+    """
+    Watermark à renvoyer au client pour son prochain sync
+
+    Args:
+        since_xid: Transaction du watermark reçu (0 = sync complet)
+        snapshot_xmin: Plus ancienne transaction en cours au début de ce sync
+        last_card: (sync_xid, id) de la dernière carte renvoyée s'il en reste (has_more)
+
+    Returns:
+        Page suivante : juste après la dernière carte renvoyée. Sinon
+        snapshot_xmin : les transactions en cours (même plus anciennes que
+        les lignes déjà renvoyées) seront lues au sync suivant, quelle que
+        soit l'heure de leurs écritures.
+    """
+    if last_card is not None:
+        return encode_watermark(*last_card)
+    return encode_watermark(max(snapshot_xmin, since_xid), 0)
+
+
+@router.get("", response_model=SyncResponse)
+def sync(
+    since: Optional[str] = Query(None, description="watermark of the previous sync (omit for a full sync)"),
+    limit: int = Query(1000, ge=1, le=5000, description="Max flashcards per response"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_sync_db)
+):
+    """
+    Delta sync : ce qui a changé depuis le dernier sync du client
+
+    Les lignes sont ordonnées par transaction (sync_xid, posé par trigger) et
+    non par updated_at : seules les transactions terminées avant le début du
+    sync (sync_xid < snapshot_xmin) sont lues, une écriture lente ne peut pas
+    commiter derrière le watermark. Une écriture n'apparaît donc qu'une fois
+    toutes les transactions plus anciennes terminées.
+
+    Process:
+        1. Flashcards avec (sync_xid, id) > watermark, dans l'ordre de
+           l'index (user_id, sync_xid, id), par pages de `limit`
+        2. Catégories avec sync_xid >= watermark
+        3. Tombstones (suppressions) avec sync_xid >= watermark
+        4. Nouveau watermark à renvoyer au prochain appel
+
+    Une catégorie ou une suppression peut être renvoyée deux fois (pages,
+    syncs successifs) : le client applique les changements de façon idempotente.
+
+    Query params:
+        since: (optionnel) watermark du sync précédent, absent = sync complet
+        limit: Nombre max de flashcards (si has_more, rappeler avec le watermark)
+
+    Returns:
+        SyncResponse: Changements + nouveau watermark
+    """
+    snapshot_xmin = db.execute(SNAPSHOT_XMIN).scalar_one()
+    since_xid, since_id = decode_watermark(since) if since else (None, 0)
+
+    # Flashcards créées/modifiées (keyset sur (sync_xid, id))
+    query = (
+        db.query(*FLASHCARD_COLUMNS, *SCHEDULE_COLUMNS, FlashCard.sync_xid)
+        .join(Category, Category.id == FlashCard.category_id)
+        .filter(FlashCard.user_id == current_user.id)
+        .filter(FlashCard.sync_xid < snapshot_xmin)
+    )
+    if since_xid is not None:
+        query = query.filter(tuple_(FlashCard.sync_xid, FlashCard.id) > tuple_(since_xid, since_id))
+
+    rows = query.order_by(FlashCard.sync_xid, FlashCard.id).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Catégories créées/modifiées
+    categories = db.query(Category).filter(Category.user_id == current_user.id)
+    if since_xid is not None:
+        categories = categories.filter(Category.sync_xid >= since_xid)
+
+    # Suppressions (inutiles pour un sync complet)
+    deleted = {TOMBSTONE_FLASHCARD: [], TOMBSTONE_CATEGORY: []}
+    if since_xid is not None:
+        tombstones = (
+            db.query(Tombstone.entity_type, Tombstone.entity_id)
+            .filter(Tombstone.user_id == current_user.id)
+            .filter(Tombstone.sync_xid >= since_xid)
+        )
+        for entity_type, entity_id in tombstones:
+            deleted[entity_type].append(entity_id)
+
+    last_card = (rows[-1].sync_xid, rows[-1].id) if has_more else None
+
+    return {
+        "watermark": next_watermark(since_xid or 0, snapshot_xmin, last_card),
+        "has_more": has_more,
+        "flashcards": [dict(row._mapping) for row in rows],
+        "categories": categories.all(),
+        "deleted_flashcard_ids": deleted[TOMBSTONE_FLASHCARD],
+        "deleted_category_ids": deleted[TOMBSTONE_CATEGORY],
+    }
@@ -0,0 +1,201 @@
+import logging
+import zlib
+from typing import Dict, List, Optional, Sequence
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optionnel : encodage "br"
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optionnel : encodage "zstd"
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Types compressibles (texte) ; .apkg/zip/images sont déjà compressés
+COMPRESSIBLE_MEDIA_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+)
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        # wbits 16 + MAX_WBITS = format gzip (header + CRC)
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        # SYNC_FLUSH : chaque bloc d'un streaming est décodable dès réception
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encodings(requested: Sequence[str]) -> List[str]:
+    """
+    Encodages demandés dont la librairie est installée (ordre de préférence conservé)
+    """
+    installed = {"gzip": True, "br": brotli is not None, "zstd": zstandard is not None}
+    encodings = []
+    for encoding in requested:
+        if encoding not in installed:
+            logger.warning("Unknown compression encoding %r ignored", encoding)
+        elif not installed[encoding]:
+            logger.warning("Compression encoding %r disabled: library not installed", encoding)
+        else:
+            encodings.append(encoding)
+    return encodings
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Compression des réponses (gzip, br, zstd), streaming compris
+
+    - L'encodage est le premier de `encodings` accepté par le client (Accept-Encoding)
+    - Réponses complètes plus petites que minimum_size : envoyées telles quelles
+    - Réponses en streaming (export...) : chaque bloc est compressé et envoyé
+      au fil de l'eau, sans bufferiser le corps entier
+    - Seuls les types texte (COMPRESSIBLE_MEDIA_TYPES) sont compressés
+
+    Usage:
+        app.add_middleware(CompressionMiddleware, encodings=["br", "gzip"], minimum_size=1024)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Sequence[str] = ("gzip",),
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.encodings = available_encodings(encodings)
+        self.minimum_size = minimum_size
+        self.levels: Dict[str, int] = {"gzip": gzip_level, "br": brotli_quality, "zstd": zstd_level}
+
+    def _choose_encoding(self, scope: Scope) -> Optional[str]:
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        for encoding in self.encodings:
+            if encoding in accepted:
+                return encoding
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = self._choose_encoding(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(send, encoding, self.levels[encoding], self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoding: str, level: int, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+
+    def _new_compressor(self):
+        if self.encoding == "br":
+            return _BrotliCompressor(self.level)
+        if self.encoding == "zstd":
+            return _ZstdCompressor(self.level)
+        return _GzipCompressor(self.level)
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Headers envoyés au premier bloc, une fois la décision prise
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or not media_type.startswith(COMPRESSIBLE_MEDIA_TYPES)
+            )
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.minimum_size:
+                # Petite réponse complète : la compression ne vaut pas le coût
+                self.passthrough = True
+                await self._flush_start()
+                await self._send(message)
+                return
+
+            self.compressor = self._new_compressor()
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            if not more_body:
+                compressed = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self._flush_start()
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            await self._flush_start()
+
+        compressed = self.compressor.compress(body)
+        if not more_body:
+            compressed += self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    async def _flush_start(self) -> None:
+        if self.start_message is not None:
+            await self._send(self.start_message)
+            self.start_message = None
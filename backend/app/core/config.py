@@ -21,14 +21,106 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        # Même base, driver asyncpg (routes async)
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
+    # Read replica (optionnel) : routes en lecture seule (listes, recherche, catégories)
+    POSTGRES_REPLICA_HOST: Optional[str] = None  # None = tout sur le primary
+    POSTGRES_REPLICA_PORT: int = 5432
+
+    @property
+    def ASYNC_REPLICA_DATABASE_URL(self) -> Optional[str]:
+        if not self.POSTGRES_REPLICA_HOST:
+            return None
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_REPLICA_HOST}:{self.POSTGRES_REPLICA_PORT}/{self.POSTGRES_DB}"
+
+    # Pool de connexions (par engine et par process worker)
+    DB_POOL_SIZE: int = 5  # Connexions gardées ouvertes
+    DB_MAX_OVERFLOW: int = 10  # Connexions en plus lors des pics
+    DB_POOL_TIMEOUT: int = 30  # Secondes d'attente d'une connexion libre avant erreur
+    DB_POOL_RECYCLE: int = 1800  # Secondes avant de recréer une connexion (-1 = jamais)
+    SQL_ECHO: bool = False  # Log de chaque requête SQL sur stdout (debug uniquement)
+
     # JWT Security
     SECRET_KEY: str  # Generate with: openssl rand -hex 32
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
 
+    # Password hashing (bcrypt dans un pool de process dédié)
+    BCRYPT_ROUNDS: int = 12  # Changer le coût → rehash transparent au prochain login
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # Process bcrypt (défaut: nb de CPU)
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Au-delà, 503 immédiat plutôt que d'empiler
+
     # CORS
     FRONTEND_URL: str = "http://localhost:5173"  # Vite dev server
 
+    # Search
+    # Seuil pg_trgm word_similarity pour mode=fuzzy (0 = tout matche, 1 = identique)
+    SEARCH_FUZZY_THRESHOLD: float = 0.5
+
+    # Review (spaced repetition FSRS)
+    REVIEW_DESIRED_RETENTION: float = 0.9  # Probabilité de rappel visée à chaque révision
+    REVIEW_MAXIMUM_INTERVAL_DAYS: int = 36500
+    REVIEW_RELEARNING_MINUTES: int = 10  # Délai avant de revoir une carte oubliée
+
+    # Review log (écritures groupées par un thread de fond)
+    REVIEW_LOG_BATCH_SIZE: int = 500  # Lignes max par INSERT multi-lignes
+    REVIEW_LOG_FLUSH_INTERVAL_MS: int = 1000  # Délai max avant flush du buffer
+    REVIEW_LOG_QUEUE_SIZE: int = 10000  # Au-delà, la requête insère elle-même
+    REVIEW_LOG_PARTITION_MONTHS_AHEAD: int = 2  # Partitions mensuelles créées à l'avance
+
+    # FSRS optimizer (job offline, voir app/scheduling/optimizer.py)
+    FSRS_OPTIMIZER_MIN_REVIEWS: int = 400  # Historique minimum pour ajuster les paramètres
+    FSRS_OPTIMIZER_WORKERS: Optional[int] = None  # Process parallèles (défaut: nb de CPU)
+
+    # Import de decks (POST /api/import)
+    IMPORT_BATCH_SIZE: int = 1000  # Flashcards par INSERT multi-lignes
+    IMPORT_MAX_APKG_COLLECTION_MB: int = 512  # Base SQLite d'un .apkg, une fois décompressée (zip bomb)
+
+    # Export de decks (GET /api/export)
+    EXPORT_BATCH_SIZE: int = 1000  # Lignes lues par aller-retour du curseur serveur
+
+    # Cache des users authentifiés (get_current_user)
+    AUTH_CACHE_TTL_SECONDS: int = 60  # Délai max avant de relire le user en DB
+    AUTH_CACHE_MAX_ENTRIES: int = 10000  # Users gardés en mémoire par process (LRU)
+    AUTH_CACHE_REDIS_URL: Optional[str] = None  # Ex: redis://redis:6379/0 (cache partagé)
+
+    # Compression des réponses (listes, exports)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ENCODINGS: str = "gzip"  # Ordre de préférence, ex: "br,zstd,gzip" (br/zstd : librairie optionnelle)
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Octets ; en dessous, réponse envoyée telle quelle
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1 (rapide) à 9 (plus compact)
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0 à 11 (au-delà de 5, trop lent pour du dynamique)
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Suppression d'un compte / d'une catégorie (voir app/services/bulk_delete.py)
+    DELETE_SYNC_MAX_CARDS: int = 5000  # Au-delà : job en tâche de fond (202 + GET /api/jobs/{id})
+    DELETE_BATCH_SIZE: int = 5000  # Lignes supprimées par transaction dans un job
+
+    # File de jobs en tâche de fond (table jobs, workers : python -m app.worker)
+    JOB_WORKER_CONCURRENCY: int = 2  # Jobs exécutés en parallèle par worker
+    JOB_WORKER_POOL: str = "thread"  # "thread" (jobs surtout SQL) ou "process" (calcul : optimiseur FSRS)
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0  # Attente quand la file est vide
+    JOB_MAX_ATTEMPTS: int = 3  # Essais avant l'échec définitif
+    JOB_RETRY_BACKOFF_SECONDS: float = 30  # Délai avant le 2e essai, doublé à chaque échec
+    JOB_STALE_SECONDS: int = 300  # Job "running" sans heartbeat depuis : worker mort, job remis en file
+    JOB_RUN_IN_APP: bool = False  # Dev sans worker : l'API exécute les jobs après la réponse
+    JOB_FILES_DIR: str = "/tmp/anki-jobs"  # Fichiers d'import en attente (partagé entre API et workers)
+    JOB_RETENTION_DAYS: int = 7  # Jobs terminés supprimés après (job prune_jobs, 0 = jamais)
+
+    # Statistiques d'étude (GET /api/stats, voir app/services/stats.py)
+    STATS_REFRESH_INTERVAL_SECONDS: int = 900  # Prévision et maturité recalculées par les workers (0 = cron seulement)
+
+    # Diagnostic des requêtes lentes (voir app/core/profiling.py)
+    SLOW_QUERY_THRESHOLD_MS: Optional[float] = None  # Requêtes SQL plus lentes loggées avec leur route (None = désactivé)
+    SLOW_QUERY_EXPLAIN: bool = False  # Ajouter le plan EXPLAIN au log (requête relancée en EXPLAIN dans un SAVEPOINT)
+    PROFILING_ENABLED: bool = False  # Profilage cProfile à la demande (header X-Profile)
+    PROFILING_TOKEN: Optional[str] = None  # Si défini, le header doit valoir ce token
+    PROFILING_SAMPLE_RATE: float = 0.0  # Fraction des requêtes profilées d'office (ex: 0.001)
+    PROFILING_OUTPUT_DIR: Optional[str] = None  # Dossier des .prof (sinon profil uniquement loggé)
+
     # App
     PROJECT_NAME: str = "Flashcards API"
     VERSION: str = "1.0.0"
@@ -1,32 +1,108 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument_engine
+from app.core.profiling import instrument_slow_queries
+
+# Paramètres du pool, communs à tous les engines
+POOL_OPTIONS = {
+    "pool_pre_ping": True,  # Vérifie que la connexion est vivante avant utilisation
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+}
 
 # Create database engine
-# echo=True pour voir les requêtes SQL en dev (utile pour debug)
+# SQL_ECHO=true pour voir les requêtes SQL en dev (utile pour debug, coûteux en prod)
+# Engine sync (psycopg2) : routes sync, thread des review logs, jobs offline
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,  # Vérifie que la connexion est vivante avant utilisation
+    echo=settings.SQL_ECHO,
+    poolclass=TimedQueuePool,
+    **POOL_OPTIONS,
+)
+
+# Engine async (asyncpg) : routes async (auth, categories, flashcards)
+# Une requête qui attend PostgreSQL libère la boucle d'événements au lieu
+# de bloquer un thread du threadpool de Starlette
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    echo=settings.SQL_ECHO,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    **POOL_OPTIONS,
 )
 
+# Engine async sur le read replica (si configuré), sinon le primary
+replica_engine = create_async_engine(
+    settings.ASYNC_REPLICA_DATABASE_URL,
+    echo=settings.SQL_ECHO,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    **POOL_OPTIONS,
+) if settings.ASYNC_REPLICA_DATABASE_URL else async_engine
+
+# Métriques Prometheus (requêtes SQL, temps DB, attente du pool)
+# + slow-query log (route + plan EXPLAIN)
+instrumented_engines = [(engine, "sync"), (async_engine.sync_engine, "async")]
+if replica_engine is not async_engine:
+    instrumented_engines.append((replica_engine.sync_engine, "replica"))
+for sync_engine, label in instrumented_engines:
+    instrument_engine(sync_engine, label)
+    if settings.SLOW_QUERY_THRESHOLD_MS is not None:
+        instrument_slow_queries(sync_engine, label, settings.SLOW_QUERY_THRESHOLD_MS / 1000, settings.SLOW_QUERY_EXPLAIN)
+
 # Session factory - crée des sessions DB
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# expire_on_commit=False : pas de lazy-load implicite (interdit en async) après commit
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+ReadSessionLocal = async_sessionmaker(replica_engine, autoflush=False, expire_on_commit=False)
+
 # Base class pour tous les modèles SQLAlchemy
 Base = declarative_base()
 
 
 # Dependency pour FastAPI - fournit une session DB par requête
-def get_db():
+async def get_db():
+    """
+    Crée une nouvelle session DB async pour chaque requête HTTP
+    La ferme automatiquement après la requête
+
+    Usage dans FastAPI:
+        @app.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_db)):
+            return (await db.execute(select(Item))).scalars().all()
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db():
+    """
+    Session DB async pour les routes en lecture seule (read replica si configuré)
+
+    Le replica peut avoir un léger retard sur le primary (réplication
+    asynchrone) : à réserver aux lectures qui tolèrent quelques ms de
+    décalage, jamais à une lecture qui précède une écriture.
+
+    Usage dans FastAPI:
+        @app.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_read_db)):
+            return (await db.execute(select(Item))).scalars().all()
+    """
+    async with ReadSessionLocal() as db:
+        yield db
+
+
+def get_sync_db():
     """
-    Crée une nouvelle session DB pour chaque requête HTTP
-    La ferme automatiquement après la requête (finally)
+    Session DB sync, pour les routes `def` (exécutées dans le threadpool)
 
     Usage dans FastAPI:
         @app.get("/items")
-        def get_items(db: Session = Depends(get_db)):
+        def get_items(db: Session = Depends(get_sync_db)):
             return db.query(Item).all()
     """
     db = SessionLocal()
@@ -0,0 +1,197 @@
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Buckets de latence HTTP / SQL (secondes)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served",
+    ["method"], multiprocess_mode="livesum",
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per HTTP request (N+1 detection)",
+    ["method", "route"], buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent in SQL per HTTP request",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed", ["engine"])
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "SQL statement latency", ["engine"], buckets=LATENCY_BUCKETS,
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time waiting for a pooled connection (pool exhaustion)",
+    ["engine"], buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out", ["engine"], multiprocess_mode="livesum",
+)
+
+
+@dataclass
+class RequestStats:
+    """
+    Compteurs SQL de la requête HTTP en cours (partagés via un ContextVar)
+    """
+    queries: int = 0
+    db_seconds: float = 0.0
+    scope: Optional[Scope] = None  # Pour retrouver la route (slow-query log)
+
+    @property
+    def route(self) -> str:
+        return route_label(self.scope) if self.scope is not None else "unmatched"
+
+
+# Requête en cours : visible dans les events SQLAlchemy (routes async, threadpool, greenlets)
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool qui mesure l'attente d'une connexion libre (db_pool_checkout_wait_seconds)
+    """
+    metrics_label = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.metrics_label).observe(time.perf_counter() - start)
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Équivalent de TimedQueuePool pour les engines async
+    """
+    metrics_label = "async"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.metrics_label).observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine: Engine, label: str) -> None:
+    """
+    Branche les events SQLAlchemy d'un engine (sync, ou async_engine.sync_engine) sur les métriques
+
+    Args:
+        engine: Engine sync à instrumenter
+        label: Valeur du label "engine" (ex: "sync", "async", "replica")
+    """
+    engine.pool.metrics_label = label
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERIES.labels(label).inc()
+        DB_QUERY_SECONDS.labels(label).observe(elapsed)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # Requête en erreur : after_cursor_execute n'est pas appelé
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start"):
+            connection.info["query_start"].pop()
+
+    @event.listens_for(engine.pool, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.labels(label).inc()
+
+    @event.listens_for(engine.pool, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.labels(label).dec()
+
+
+def route_label(scope: Scope) -> str:
+    # Template de la route ("/api/flashcards/{flashcard_id}"), posé dans le scope par le router
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Latence par route, requêtes en cours, nombre de requêtes SQL et temps DB par requête
+
+    Le label "route" est le template de la route (pas l'URL) : cardinalité bornée.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        stats = RequestStats(scope=scope)
+        token = current_request_stats.set(stats)
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Réponses en streaming : durée jusqu'au dernier bloc envoyé
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            current_request_stats.reset(token)
+            route = route_label(scope)
+            REQUEST_DURATION.labels(method, route, str(status_code)).observe(elapsed)
+            REQUEST_DB_QUERIES.labels(method, route).observe(stats.queries)
+            REQUEST_DB_SECONDS.labels(method, route).observe(stats.db_seconds)
+
+
+def render_metrics() -> tuple:
+    """
+    Métriques au format texte Prometheus
+
+    Avec plusieurs workers (uvicorn --workers, gunicorn), définir
+    PROMETHEUS_MULTIPROC_DIR : les métriques de tous les process sont agrégées.
+
+    Returns:
+        (corps, content-type)
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,97 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_and_update_password
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Trop de hash bcrypt en attente : la requête est refusée (503)
+    """
+    pass
+
+
+class PasswordHasher:
+    """
+    Pool de process dédié au bcrypt (≈250 ms de CPU par hash à coût 12)
+
+    Les routes n'occupent ni un thread du threadpool ni la boucle
+    d'événements pendant le hash ; au-delà de max_pending hash en cours
+    ou en attente, PasswordHasherBusy est levée tout de suite (503) :
+    un pic de logins ne bloque pas les autres endpoints.
+
+    Usage:
+        hashed = await password_hasher.hash("mypassword")
+        match, new_hash = await password_hasher.verify_and_update("mypassword", hashed)
+        password_hasher.stats()  # {"pending": ..., "rejected": ...}
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Créé au premier hash : pas de process lancés à l'import
+        with self._lock:
+            if self._pool is None:
+                # spawn : les process ne héritent ni des threads ni des connexions DB de l'app
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    async def _submit(self, function, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), function, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_password_hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Returns:
+            (match, nouveau hash si BCRYPT_ROUNDS a changé, sinon None)
+        """
+        return await self._submit(verify_and_update_password, password, hashed_password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+# Pool partagé par toutes les requêtes du process (arrêté dans main.py)
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
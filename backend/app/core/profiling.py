@@ -0,0 +1,171 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import current_request_stats, route_label
+
+logger = logging.getLogger(__name__)
+
+# Seules ces requêtes passent par EXPLAIN (pas de DDL, COPY, SET...)
+EXPLAINABLE_STATEMENT = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH|VALUES)\b", re.IGNORECASE)
+
+
+def instrument_slow_queries(engine: Engine, label: str, threshold_seconds: float, explain: bool = True) -> None:
+    """
+    Log des requêtes SQL plus lentes que le seuil, avec la route HTTP et le plan EXPLAIN
+
+    Le plan est obtenu par EXPLAIN (sans ANALYZE : la requête n'est pas rejouée)
+    sur la même connexion, dans un SAVEPOINT pour qu'un échec n'annule pas la
+    transaction en cours.
+
+    Args:
+        engine: Engine sync à instrumenter (ou async_engine.sync_engine)
+        label: Nom de l'engine dans les logs (ex: "sync", "async", "replica")
+        threshold_seconds: Durée à partir de laquelle une requête est loggée
+        explain: Ajouter le plan d'exécution au log
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["slow_query_start"].pop()
+        if elapsed < threshold_seconds:
+            return
+
+        stats = current_request_stats.get()
+        route = stats.route if stats is not None else "-"
+        plan = None
+        if explain and not executemany and EXPLAINABLE_STATEMENT.match(statement):
+            plan = _explain(conn, statement, parameters)
+        logger.warning(
+            "Slow query (%.1f ms, engine=%s, route=%s):\n%s%s",
+            elapsed * 1000, label, route, statement,
+            f"\nPlan:\n{plan}" if plan else "",
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("slow_query_start"):
+            connection.info["slow_query_start"].pop()
+
+
+def _explain(conn, statement: str, parameters) -> Optional[str]:
+    # Curseur DBAPI brut : mêmes paramètres que la requête d'origine, pas d'events SQLAlchemy
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute("EXPLAIN " + statement, parameters)
+            rows = cursor.fetchall()
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        return "\n".join(row[0] for row in rows)
+    except Exception:
+        # Pas de transaction (autocommit), connexion cassée... : log sans le plan
+        logger.debug("EXPLAIN failed for slow query", exc_info=True)
+        return None
+    finally:
+        cursor.close()
+
+
+class ProfilingMiddleware:
+    """
+    Profil cProfile d'une requête, à la demande (header) ou sur un échantillon
+
+    - Header `X-Profile: <PROFILING_TOKEN>` (ou n'importe quelle valeur sans token)
+    - PROFILING_SAMPLE_RATE : fraction des requêtes profilées d'office
+
+    Le profil (top des fonctions par temps cumulé) est loggé ; avec
+    PROFILING_OUTPUT_DIR, le .prof complet est aussi écrit sur disque
+    (snakeviz, `python -m pstats`) et son nom renvoyé dans `X-Profile-Id`.
+
+    Limites de cProfile :
+    - Un seul profil à la fois par process : les autres requêtes ne sont pas profilées
+    - Profile le thread de la boucle d'événements : les requêtes concurrentes
+      y apparaissent aussi ; le code des routes sync (threadpool) n'apparaît
+      que comme une attente (voir le slow-query log pour la partie SQL)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        header: str = "x-profile",
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        output_dir: Optional[str] = None,
+        top: int = 30,
+    ):
+        self.app = app
+        self.header = header.lower().encode("latin-1")
+        self.token = token
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.top = top
+        self._lock = threading.Lock()
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+    def _requested(self, scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == self.header:
+                return self.token is None or value.decode("latin-1") == self.token
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # Un profil déjà en cours dans ce process : requête servie normalement
+        if not self._lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.output_dir:
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", f"{profile_id}.prof".encode())]
+            await send(message)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                profiler.disable()
+        finally:
+            self._lock.release()
+            self._report(scope, profiler, profile_id, time.perf_counter() - start)
+
+    def _report(self, scope: Scope, profiler: cProfile.Profile, profile_id: str, elapsed: float) -> None:
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(self.top)
+        path = None
+        if self.output_dir:
+            path = os.path.join(self.output_dir, f"{profile_id}.prof")
+            profiler.dump_stats(path)
+        # Warning : visible sans configuration du logging (profil demandé explicitement)
+        logger.warning(
+            "Profile %s %s (route=%s, %.1f ms%s):\n%s",
+            scope["method"], scope["path"], route_label(scope), elapsed * 1000,
+            f", saved to {path}" if path else "", output.getvalue(),
+        )
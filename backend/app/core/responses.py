@@ -0,0 +1,33 @@
+from typing import Any, Dict, List, Optional, Sequence
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import MutableHeaders
+
+
+def rows_to_dicts(keys: Sequence[str], rows: Sequence[Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Lignes projetées (tuples) → dicts, les clés n'étant calculées qu'une fois
+
+    Plus rapide que dict(row._mapping) ligne par ligne.
+    """
+    keys = tuple(keys)
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def trusted_json_response(content: Any, headers: Optional[MutableHeaders] = None) -> ORJSONResponse:
+    """
+    Réponse JSON encodée directement par orjson, sans validation Pydantic
+
+    À réserver aux données lues en DB avec les colonnes du response_model
+    de la route (types déjà garantis par le schéma SQL) : FastAPI ne
+    revalide pas un objet Response, le response_model ne sert plus qu'à
+    la doc OpenAPI.
+
+    Args:
+        content: dicts/listes/datetime/None (orjson encode les datetime en ISO 8601)
+        headers: Headers déjà posés sur le `response: Response` de la route (ETag...)
+    """
+    extra = {
+        key: value for key, value in (headers or {}).items()
+        if key.lower() != "content-length"
+    }
+    return ORJSONResponse(content, headers=extra)
@@ -0,0 +1,79 @@
+import hashlib
+from typing import Optional
+from fastapi import Request, Response, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import User
+
+
+def bump_revision(user_id: int):
+    """
+    Statement qui incrémente users.revision (à exécuter dans la transaction de l'écriture)
+
+    À appeler à chaque écriture qui change une liste servie avec un ETag
+    (flashcards, catégories, compteurs) : les ETags du user deviennent
+    invalides au commit.
+    """
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(revision=User.revision + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def revision_etag(request: Request, revision: int) -> str:
+    """
+    ETag d'une liste : révision du user + paramètres de la requête
+
+    Weak (W/) : la même révision peut être encodée différemment (gzip...).
+    """
+    query = hashlib.sha1(f"{request.url.path}?{request.url.query}".encode("utf-8")).hexdigest()[:16]
+    return f'W/"{revision}-{query}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Vrai si le client a déjà cette version (If-None-Match) → 304 Not Modified
+    """
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Comparaison faible : W/"x" et "x" désignent la même version
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+async def not_modified_response(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    user_id: int,
+) -> Optional[Response]:
+    """
+    Requête conditionnelle d'une liste (GET avec If-None-Match)
+
+    Lit la révision du user AVANT les données : si une écriture commit entre
+    les deux, la réponse porte l'ancienne révision et sera simplement
+    redemandée au prochain appel (jamais de 304 sur des données périmées).
+
+    Usage dans une route:
+        not_modified = await not_modified_response(request, response, db, current_user.id)
+        if not_modified is not None:
+            return not_modified  # 304, ni requête lourde ni sérialisation
+
+    Returns:
+        Réponse 304 si le client a déjà cette version, sinon None
+        (ETag ajouté à `response`)
+    """
+    revision = await db.scalar(select(User.revision).where(User.id == user_id))
+    etag = revision_etag(request, revision or 0)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,106 @@
+import re
+from typing import Optional
+from sqlalchemy import func, literal, or_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.sql.elements import ColumnElement
+
+# Configurations text search PostgreSQL indexées dans flashcards.search_vector
+# (stemming propre à chaque langue, voir models/flashcard.py)
+SEARCH_LANGUAGES = ("english", "french")
+
+# Mots du texte tapé par l'user (lettres/chiffres, accents compris)
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_vector_expression() -> str:
+    """
+    Expression SQL de la colonne générée flashcards.search_vector
+
+    On indexe question (poids A) et answer (poids B) dans chaque langue de
+    SEARCH_LANGUAGES : un mot anglais ou français est retrouvé sous sa forme
+    racine ("running" → "run", "chevaux" → "cheval"), quelle que soit la
+    langue de la carte.
+
+    Returns:
+        Expression SQL IMMUTABLE utilisable dans GENERATED ALWAYS AS (...)
+    """
+    parts = []
+    for language in SEARCH_LANGUAGES:
+        parts.append(f"setweight(to_tsvector('{language}'::regconfig, question), 'A')")
+        parts.append(f"setweight(to_tsvector('{language}'::regconfig, answer), 'B')")
+    return " || ".join(parts)
+
+
+def build_prefix_query(q: str) -> Optional[str]:
+    """
+    Transforme le texte tapé en requête to_tsquery avec préfixes
+
+    Chaque mot devient "mot:*" (le dernier mot est souvent incomplet pendant
+    la frappe) et tous les mots doivent matcher (&).
+
+    Args:
+        q: Texte tapé par l'user (ex: "fast api")
+
+    Returns:
+        "fast:* & api:*", ou None si q ne contient aucun mot
+    """
+    words = _WORD_RE.findall(q.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def build_tsquery(prefix_query: str, language: Optional[str] = None) -> ColumnElement:
+    """
+    Construit le tsquery SQL pour une langue, ou pour toutes les langues indexées
+
+    Args:
+        prefix_query: Résultat de build_prefix_query
+        language: "english", "french" ou None (= toutes les langues indexées)
+
+    Returns:
+        Expression tsquery (OR des requêtes de chaque langue)
+    """
+    languages = (language,) if language else SEARCH_LANGUAGES
+    tsquery = None
+    for lang in languages:
+        lang_query = func.to_tsquery(literal(lang).cast(REGCONFIG), prefix_query)
+        tsquery = lang_query if tsquery is None else tsquery.op("||")(lang_query)
+    return tsquery
+
+
+def substring_filter(question, answer, q: str) -> ColumnElement:
+    """
+    Filtre "contient" insensible à la casse (ILIKE '%q%') sur question/answer
+
+    Les caractères spéciaux de LIKE (%, _) tapés par l'user sont échappés.
+    """
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{escaped}%"
+    return or_(
+        question.ilike(pattern, escape="\\"),
+        answer.ilike(pattern, escape="\\"),
+    )
+
+
+def fuzzy_filter(question, answer, q: str) -> ColumnElement:
+    """
+    Filtre tolérant aux fautes de frappe (pg_trgm) sur question/answer
+
+    q <% colonne = word_similarity(q, colonne) >= pg_trgm.word_similarity_threshold,
+    opérateur servi par les index GIN gin_trgm_ops.
+    """
+    return or_(
+        literal(q).op("<%")(question),
+        literal(q).op("<%")(answer),
+    )
+
+
+def fuzzy_rank(question, answer, q: str) -> ColumnElement:
+    """
+    Score de similarité (0..1) du meilleur champ entre question et answer
+    """
+    return func.greatest(
+        func.word_similarity(q, question),
+        func.word_similarity(q, answer),
+    )
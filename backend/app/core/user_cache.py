@@ -0,0 +1,278 @@
+import json
+import logging
+import select as select_module
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+
+try:
+    import redis
+except ImportError:  # Optionnel : seulement pour AUTH_CACHE_REDIS_URL
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Colonnes du user gardées en cache (jamais le hash du password)
+PRINCIPAL_FIELDS = ("id", "email", "created_at", "fsrs_weights")
+
+# Canal NOTIFY des invalidations (process API, workers de jobs, optimiseur)
+INVALIDATION_CHANNEL = "user_cache_invalidate"
+
+
+class PrincipalCacheBackend:
+    """
+    Interface d'un stockage de principals (snapshot du user, par user_id)
+
+    blocking : appels réseau, exécutés dans le threadpool depuis le code
+    async (aget / aset / ainvalidate de PrincipalCache)
+    """
+    blocking = False
+
+    def get(self, user_id: int) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def set(self, user_id: int, principal: Dict) -> None:
+        raise NotImplementedError
+
+    def delete(self, user_id: int) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryPrincipalCache(PrincipalCacheBackend):
+    """
+    Cache LRU + TTL local au process
+
+    Une invalidation ne touche que ce process : les autres process l'apprennent
+    par NOTIFY (user_changed_notification + InvalidationListener), la TTL ne
+    sert que de filet si le listener est déconnecté.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def set(self, user_id: int, principal: Dict) -> None:
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisPrincipalCache(PrincipalCacheBackend):
+    """
+    Cache partagé entre workers/instances (Redis, expiration native)
+
+    Une invalidation est visible par tous les process, y compris les jobs
+    offline (ex: optimiseur FSRS qui modifie users.fsrs_weights).
+
+    Client synchrone, partagé par l'API (via le threadpool) et les jobs.
+    """
+    blocking = True
+
+    def __init__(self, url: str, ttl: float, prefix: str = "auth:principal:"):
+        if redis is None:
+            raise RuntimeError("AUTH_CACHE_REDIS_URL requires the 'redis' package")
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, user_id: int) -> Optional[Dict]:
+        raw = self.client.get(f"{self.prefix}{user_id}")
+        if raw is None:
+            return None
+        principal = json.loads(raw)
+        principal["created_at"] = datetime.fromisoformat(principal["created_at"])
+        return principal
+
+    def set(self, user_id: int, principal: Dict) -> None:
+        raw = json.dumps({**principal, "created_at": principal["created_at"].isoformat()})
+        self.client.set(f"{self.prefix}{user_id}", raw, px=int(self.ttl * 1000))
+
+    def delete(self, user_id: int) -> None:
+        self.client.delete(f"{self.prefix}{user_id}")
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(f"{self.prefix}*"):
+            self.client.delete(key)
+
+
+class PrincipalCache:
+    """
+    Cache des users authentifiés, devant la requête users de get_current_user
+
+    Usage:
+        principal = user_cache.get(user_id)  # None = miss
+        user_cache.set(user_id, principal)  # après lecture en DB
+        user_cache.invalidate(user_id)  # après suppression / changement de password
+        user_cache.stats()  # {"hits": ..., "misses": ..., "hit_ratio": ...}
+
+    Dans le code async (routes, dependencies) : await aget / aset / ainvalidate,
+    qui ne bloquent pas la boucle d'événements avec un backend réseau (Redis).
+    """
+
+    def __init__(self, backend: PrincipalCacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def _count(self, principal: Optional[Dict]) -> Optional[Dict]:
+        if principal is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return principal
+
+    async def _run(self, method, *args):
+        if self.backend.blocking:
+            return await run_in_threadpool(method, *args)
+        return method(*args)  # En mémoire : pas d'I/O, inutile de changer de thread
+
+    def get(self, user_id: int) -> Optional[Dict]:
+        return self._count(self.backend.get(user_id))
+
+    def set(self, user_id: int, principal: Dict) -> None:
+        self.backend.set(user_id, principal)
+
+    def invalidate(self, user_id: int) -> None:
+        self.backend.delete(user_id)
+
+    async def aget(self, user_id: int) -> Optional[Dict]:
+        return self._count(await self._run(self.backend.get, user_id))
+
+    async def aset(self, user_id: int, principal: Dict) -> None:
+        await self._run(self.backend.set, user_id, principal)
+
+    async def ainvalidate(self, user_id: int) -> None:
+        await self._run(self.backend.delete, user_id)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+def user_changed_notification(user_id: int):
+    """
+    Statement qui invalide le user dans le cache de tous les process API
+    (à exécuter dans la transaction qui modifie ou supprime le user)
+
+    NOTIFY n'est envoyé qu'au commit : aucun process ne relit l'ancien user
+    après l'invalidation. Indispensable hors du process API (job, optimiseur)
+    avec le cache en mémoire, où user_cache.invalidate() ne touche que le
+    process appelant.
+    """
+    return select(func.pg_notify(INVALIDATION_CHANNEL, str(user_id)))
+
+
+class InvalidationListener:
+    """
+    Thread qui écoute les NOTIFY d'invalidation et vide le cache local
+
+    Connexion dédiée (détachée du pool) en LISTEN ; reconnexion automatique.
+    Inutile avec Redis : le cache y est déjà partagé.
+
+    Usage:
+        invalidation_listener.start(engine)  # au démarrage de l'app
+        invalidation_listener.stop()
+    """
+
+    def __init__(self, cache: "PrincipalCache", poll_interval: float = 1.0):
+        self.cache = cache
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, engine: Engine) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(engine,), name="user-cache-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, engine: Engine) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen(engine)
+            except Exception:
+                logger.exception("User cache listener disconnected")
+                # Des invalidations ont pu être manquées pendant la coupure
+                self.cache.clear()
+                self._stop.wait(self.poll_interval)
+
+    def _listen(self, engine: Engine) -> None:
+        connection = engine.raw_connection()
+        dbapi_connection = connection.driver_connection
+        connection.detach()  # Hors du pool : la connexion reste en LISTEN
+        try:
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {INVALIDATION_CHANNEL}")
+            while not self._stop.is_set():
+                if select_module.select([dbapi_connection], [], [], self.poll_interval) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notify = dbapi_connection.notifies.pop(0)
+                    self.cache.backend.delete(int(notify.payload))
+        finally:
+            dbapi_connection.close()
+
+
+def build_principal_cache() -> PrincipalCache:
+    if settings.AUTH_CACHE_REDIS_URL:
+        backend = RedisPrincipalCache(settings.AUTH_CACHE_REDIS_URL, settings.AUTH_CACHE_TTL_SECONDS)
+    else:
+        backend = InMemoryPrincipalCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_ENTRIES)
+    return PrincipalCache(backend)
+
+
+# Cache partagé par toutes les requêtes du process
+user_cache = build_principal_cache()
+
+# Démarré dans main.py avec le cache en mémoire
+invalidation_listener = InvalidationListener(user_cache)
@@ -1,17 +1,46 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.database import Base, engine
-from app.api.routes import auth, categories, flashcards
+from app.core.database import async_engine, engine, replica_engine
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.profiling import ProfilingMiddleware
+from app.core.password_hasher import PasswordHasherBusy, password_hasher
+from app.core.user_cache import InMemoryPrincipalCache, invalidation_listener, user_cache
+from app.api.routes import auth, categories, flashcards, review, imports, exports, sync, jobs, stats
+from app.scheduling.review_log import review_log_writer
+
+# Aucun DDL au démarrage : schéma créé / migré par `python -m app.migrate` (Alembic)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Démarrage / arrêt de l'app : thread d'écriture des review logs, listener
+    des invalidations du cache des users, pool async, pool de process bcrypt
+    """
+    review_log_writer.start()
+    # Cache en mémoire : invalidations des autres process (jobs, optimiseur) par NOTIFY
+    if isinstance(user_cache.backend, InMemoryPrincipalCache):
+        invalidation_listener.start(engine)
+    yield
+    invalidation_listener.stop()
+    # Vide le buffer avant de quitter
+    review_log_writer.stop()
+    await async_engine.dispose()
+    await replica_engine.dispose()
+    password_hasher.shutdown()
 
-# Créer les tables en DB (alternative à Alembic pour dev)
-Base.metadata.create_all(bind=engine)
 
 # Initialiser FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # Encodage JSON par orjson (plus rapide que json)
 )
 
 # Configuration CORS
@@ -26,10 +55,57 @@ app.add_middleware(
     allow_headers=["*"],  # Authorization, Content-Type, etc.
 )
 
+# Ordre des middlewares : le dernier ajouté est le plus externe
+#   Profilage → Métriques → Compression → CORS → routes
+# Métriques et profilage englobent la compression : ils comptent son temps
+# (ils ne lisent pas les corps de réponse, compressés ou non)
+
+# Compression des réponses
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        encodings=[encoding.strip() for encoding in settings.COMPRESSION_ENCODINGS.split(",") if encoding.strip()],
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+    )
+
+# Métriques par requête (autour de la compression : mesure aussi son temps)
+app.add_middleware(MetricsMiddleware)
+
+# Profilage cProfile à la demande (header X-Profile) ou sur un échantillon (le plus externe)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.PROFILING_TOKEN,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        output_dir=settings.PROFILING_OUTPUT_DIR,
+    )
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """
+    Pool bcrypt saturé : 503 immédiat, le client réessaie un peu plus tard
+    """
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many concurrent password operations, retry later"},
+        headers={"Retry-After": "1"},
+    )
+
+
 # Inclure les routes
 app.include_router(auth.router, prefix="/api")
 app.include_router(categories.router, prefix="/api")
 app.include_router(flashcards.router, prefix="/api")
+app.include_router(review.router, prefix="/api")
+app.include_router(imports.router, prefix="/api")
+app.include_router(exports.router, prefix="/api")
+app.include_router(sync.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api")
+app.include_router(stats.router, prefix="/api")
 
 
 @app.get("/")
@@ -48,5 +124,21 @@ def root():
 def health_check():
     """
     Health check endpoint pour Docker/monitoring
+
+    auth_cache: hits/misses du cache des users authentifiés (ce process)
+    password_hasher: hash bcrypt en cours/en attente, refusés (503)
+    """
+    return {
+        "status": "healthy",
+        "auth_cache": user_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Métriques Prometheus (latence par route, requêtes SQL par requête, pool DB...)
     """
-    return {"status": "healthy"}
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,105 @@
+import argparse
+import os
+import sys
+from datetime import datetime
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+from app.core.config import settings
+from app.core.database import engine
+from app.scheduling.review_log import ensure_review_log_partitions
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+# Révision qui correspond au schéma créé par l'ancien create_all au démarrage
+BASELINE_REVISION = "0001"
+
+# Colonnes de ce schéma : une base sans alembic_version n'est marquée que si
+# ses tables ont exactement celles-ci (sinon les migrations suivantes
+# seraient sautées ou échoueraient à mi-chemin)
+BASELINE_COLUMNS = {
+    "users": {"id", "email", "hashed_password", "created_at"},
+    "categories": {"id", "name", "user_id", "created_at"},
+    "flashcards": {"id", "question", "answer", "user_id", "category_id", "created_at", "updated_at"},
+}
+
+# Deux migrations lancées en même temps (déploiements) : la seconde attend la première
+MIGRATION_LOCK_ID = 7_420_001
+
+
+def baseline_mismatches(inspector) -> list:
+    """
+    Écarts entre les tables existantes et le schéma de BASELINE_REVISION
+
+    Returns:
+        Une ligne par table absente ou dont les colonnes diffèrent (vide si identique)
+    """
+    tables = set(inspector.get_table_names())
+    mismatches = []
+    for table, expected in BASELINE_COLUMNS.items():
+        if table not in tables:
+            mismatches.append(f"{table}: missing table")
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if columns != expected:
+            missing = ", ".join(sorted(expected - columns)) or "-"
+            extra = ", ".join(sorted(columns - expected)) or "-"
+            mismatches.append(f"{table}: missing columns {missing}; unexpected columns {extra}")
+    return mismatches
+
+
+def main() -> None:
+    """
+    Migration du schéma, à lancer une fois avant de démarrer l'app (service `migrate`)
+
+    L'app ne fait aucun DDL au démarrage : les workers ne touchent pas au schéma.
+
+    Process:
+        1. Verrou advisory (une seule migration à la fois)
+        2. Base créée avant Alembic (tables sans alembic_version) : marquée à la révision de référence
+           si ses colonnes sont celles de cette révision, sinon arrêt sans rien modifier
+        3. alembic upgrade
+        4. Partitions mensuelles de review_logs (mois courant + REVIEW_LOG_PARTITION_MONTHS_AHEAD)
+
+    Usage:
+        python -m app.migrate
+        python -m app.migrate --revision 0001
+    """
+    parser = argparse.ArgumentParser(description="Apply database migrations")
+    parser.add_argument("--revision", default="head", help="Target revision (default: head)")
+    args = parser.parse_args()
+
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations"))
+
+    # AUTOCOMMIT : la connexion du verrou ne garde pas de transaction ouverte,
+    # sinon CREATE INDEX CONCURRENTLY l'attendrait indéfiniment
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock:
+        lock.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        try:
+            inspector = inspect(lock)
+            tables = inspector.get_table_names()
+            if "users" in tables and "alembic_version" not in tables:
+                mismatches = baseline_mismatches(inspector)
+                if mismatches:
+                    sys.exit(
+                        f"Existing schema without migrations does not match revision {BASELINE_REVISION}, "
+                        "refusing to stamp it:\n  " + "\n  ".join(mismatches)
+                    )
+                print(f"Existing schema without migrations: stamping revision {BASELINE_REVISION}")
+                command.stamp(config, BASELINE_REVISION)
+            command.upgrade(config, args.revision)
+        finally:
+            lock.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+
+    # review_logs n'existe qu'à partir de 0002 (--revision 0001)
+    if "review_logs" not in inspect(engine).get_table_names():
+        return
+    partitions = ensure_review_log_partitions(
+        engine, datetime.utcnow(), settings.REVIEW_LOG_PARTITION_MONTHS_AHEAD + 1,
+    )
+    print(f"review_logs partitions: {', '.join(partitions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 from app.models.user import User
 from app.models.category import Category
 from app.models.flashcard import FlashCard
+from app.models.review_log import ReviewLog
+from app.models.tombstone import Tombstone
+from app.models.job import Job
+from app.models.stats import DailyReviewStats
 
-__all__ = ["User", "Category", "FlashCard"]
+__all__ = ["User", "Category", "FlashCard", "ReviewLog", "Tombstone", "Job", "DailyReviewStats"]
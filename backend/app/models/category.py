@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Index, FetchedValue
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -13,12 +13,25 @@ class Category(Base):
         - 1 Category → N FlashCards (category.flashcards)
     """
     __tablename__ = "categories"
+    __table_args__ = (
+        # Delta sync : catégories modifiées depuis un watermark
+        Index("ix_categories_user_id_sync_xid", "user_id", "sync_xid"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Transaction de la dernière écriture (delta sync), posé par le trigger
+    # set_sync_xid quand updated_at change : pas pour les compteurs ci-dessous
+    sync_xid = Column(BigInteger, server_default="0", server_onupdate=FetchedValue(), nullable=False)
+
+    # Compteurs dénormalisés, maintenus dans la transaction de chaque écriture
+    # de flashcards (voir app/services/category_counters.py)
+    card_count = Column(Integer, default=0, server_default="0", nullable=False)
+    new_count = Column(Integer, default=0, server_default="0", nullable=False)  # Cartes jamais révisées
 
     # Relations
     owner = relationship("User", back_populates="categories")
-    flashcards = relationship("FlashCard", back_populates="category", cascade="all, delete-orphan")
+    flashcards = relationship("FlashCard", back_populates="category", cascade="all, delete-orphan", passive_deletes=True)
@@ -1,7 +1,13 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, Text, DateTime, Float, ForeignKey, Index, Computed, DDL,
+    FetchedValue, event,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
+from app.core.search import search_vector_expression
+from app.scheduling import STATE_NEW
 
 
 class FlashCard(Base):
@@ -13,15 +19,56 @@ class FlashCard(Base):
         - N FlashCards → 1 Category (flashcard.category)
     """
     __tablename__ = "flashcards"
+    __table_args__ = (
+        # Pagination keyset (user_id, id) : chaque page = un range scan d'index
+        Index("ix_flashcards_user_id_id", "user_id", "id"),
+        # File de révision : "prochaines cartes dues" = range scan (user_id, due_at)
+        Index("ix_flashcards_user_id_due_at", "user_id", "due_at"),
+        # Delta sync : keyset (sync_xid, id) sur les cartes modifiées depuis un watermark
+        Index("ix_flashcards_user_id_sync_xid_id", "user_id", "sync_xid", "id"),
+        # Recherche full-text : index GIN sur le tsvector
+        Index("ix_flashcards_search_vector", "search_vector", postgresql_using="gin"),
+        # Recherche floue (fautes de frappe) + ILIKE '%q%' : index trigrammes (pg_trgm)
+        Index(
+            "ix_flashcards_question_trgm", "question",
+            postgresql_using="gin", postgresql_ops={"question": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_flashcards_answer_trgm", "answer",
+            postgresql_using="gin", postgresql_ops={"answer": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     question = Column(Text, nullable=False)
     answer = Column(Text, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Transaction de la dernière écriture (delta sync), posé par le trigger
+    # set_sync_xid quand updated_at change (migration 0007)
+    sync_xid = Column(BigInteger, server_default="0", server_onupdate=FetchedValue(), nullable=False)
+
+    # Planification (spaced repetition, voir app/scheduling)
+    # Une nouvelle carte est due immédiatement
+    state = Column(String(16), default=STATE_NEW, nullable=False)
+    due_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    stability = Column(Float, nullable=True)  # Jours avant de retomber à 90% de rappel
+    difficulty = Column(Float, nullable=True)  # 1 (facile) → 10 (difficile)
+    interval_days = Column(Integer, default=0, nullable=False)
+    reps = Column(Integer, default=0, nullable=False)
+    lapses = Column(Integer, default=0, nullable=False)
+    last_reviewed_at = Column(DateTime, nullable=True)
+
+    # tsvector maintenu par PostgreSQL (colonne générée) à chaque INSERT/UPDATE
+    search_vector = Column(TSVECTOR, Computed(search_vector_expression(), persisted=True))
 
     # Relations
     owner = relationship("User", back_populates="flashcards")
     category = relationship("Category", back_populates="flashcards")
+
+
+# Extension pg_trgm requise par les index *_trgm (créée avant la table)
+PG_TRGM_EXTENSION = DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+event.listen(FlashCard.__table__, "before_create", PG_TRGM_EXTENSION)
@@ -0,0 +1,66 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+import secrets
+from app.core.database import Base
+
+# Types de jobs
+JOB_DELETE_USER = "delete_user"
+JOB_DELETE_CATEGORY = "delete_category"
+JOB_IMPORT_DECK = "import_deck"
+JOB_RECONCILE_COUNTERS = "reconcile_counters"
+JOB_OPTIMIZE_SCHEDULER = "optimize_scheduler"
+JOB_REFRESH_STATS = "refresh_stats"
+JOB_PRUNE_JOBS = "prune_jobs"
+
+# États d'un job
+JOB_QUEUED = "queued"  # En attente (ou d'un nouvel essai, après run_after)
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class Job(Base):
+    """
+    Modèle Job - Table 'jobs' en DB
+
+    Opération longue exécutée hors de la requête HTTP (suppression d'un
+    compte ou d'une grosse catégorie, import, optimisation FSRS...). Le
+    client suit son avancement avec GET /api/jobs/{id}.
+
+    La table sert de file d'attente : les workers (python -m app.worker)
+    prennent les jobs "queued" avec SELECT ... FOR UPDATE SKIP LOCKED
+    (voir app/services/jobs.py).
+
+    Pas de ForeignKey vers users : le job qui supprime un compte ne doit
+    pas disparaître avec lui (cascade).
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_user_id_created_at", "user_id", "created_at"),
+        # File d'attente : prochain job prêt = début de l'index partiel
+        Index("ix_jobs_queue", "run_after", "id", postgresql_where=text("status = 'queued'")),
+        Index("ix_jobs_token", "token", unique=True),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(Integer, nullable=True)  # Propriétaire (seul à pouvoir lire le job)
+    kind = Column(String(32), nullable=False)
+    status = Column(String(16), default=JOB_QUEUED, nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)  # Paramètres (ex: {"category_id": 3})
+    progress = Column(JSONB, nullable=False, default=dict)  # Ex: {"flashcards": 12000}
+    error = Column(Text, nullable=True)  # Dernière erreur (conservée entre deux essais)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Exécution par les workers
+    attempts = Column(Integer, default=0, server_default="0", nullable=False)  # Essais commencés
+    max_attempts = Column(Integer, default=3, server_default="3", nullable=False)
+    run_after = Column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)  # Backoff
+    locked_by = Column(String(64), nullable=True)  # Worker qui exécute le job
+    heartbeat_at = Column(DateTime, nullable=True)  # Worker mort si trop ancien → job remis en file
+
+    # Lecture sans authentification (GET /api/jobs/status/{token}) : suivi de la
+    # suppression d'un compte, dont le user ne peut plus s'authentifier
+    token = Column(String(43), default=lambda: secrets.token_urlsafe(32), nullable=True)
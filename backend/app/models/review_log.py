@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, String, DateTime, Index, Sequence
+from datetime import datetime
+from app.core.database import Base
+
+# Séquence partagée par toutes les partitions (pas de SERIAL sur une table partitionnée)
+review_log_id_seq = Sequence("review_logs_id_seq")
+
+
+class ReviewLog(Base):
+    """
+    Modèle ReviewLog - Table 'review_logs' en DB (append-only)
+
+    Une ligne par réponse à une carte. Table partitionnée par mois sur
+    reviewed_at (review_logs_y2024m01, ...) : archiver un vieux mois =
+    DETACH PARTITION, sans DELETE (voir app/scheduling/review_log.py).
+
+    Pas de ForeignKey : l'historique survit à la suppression des cartes
+    (statistiques) et chaque INSERT évite un contrôle d'intégrité.
+    """
+    __tablename__ = "review_logs"
+    __table_args__ = (
+        # Historique d'un user (optimiseur FSRS, statistiques)
+        Index("ix_review_logs_user_id_reviewed_at", "user_id", "reviewed_at"),
+        {"postgresql_partition_by": "RANGE (reviewed_at)"},
+    )
+
+    # La clé de partition doit faire partie de la clé primaire
+    id = Column(BigInteger, review_log_id_seq, server_default=review_log_id_seq.next_value(), primary_key=True)
+    reviewed_at = Column(DateTime, default=datetime.utcnow, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    card_id = Column(Integer, nullable=False)
+    rating = Column(SmallInteger, nullable=False)  # 1 Again, 2 Hard, 3 Good, 4 Easy
+    elapsed_ms = Column(Integer, nullable=True)  # Temps de réponse
+    state = Column(String(16), nullable=False)  # État de la carte avant la révision
+    interval_days = Column(Integer, nullable=False)  # Intervalle planifié après la révision
@@ -0,0 +1,54 @@
+from sqlalchemy import BigInteger, Column, Date, Integer, MetaData, Table
+from app.core.database import Base
+
+# Intervalle à partir duquel une carte est "mature" (même seuil qu'Anki)
+MATURE_INTERVAL_DAYS = 21
+
+
+class DailyReviewStats(Base):
+    """
+    Modèle DailyReviewStats - Table 'daily_review_stats' en DB
+
+    Agrégat quotidien (jour UTC) des révisions d'un user, mis à jour dans la
+    transaction qui écrit les review logs (voir app/services/stats.py) :
+    GET /api/stats lit quelques lignes au lieu d'agréger tout review_logs.
+
+    Pas de ForeignKey, comme review_logs : les review logs sont écrits en
+    différé, après une éventuelle suppression du compte. Les statistiques
+    survivent aussi au détachement des vieilles partitions de review_logs.
+    """
+    __tablename__ = "daily_review_stats"
+
+    user_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    reviews = Column(Integer, default=0, nullable=False)
+    new_cards = Column(Integer, default=0, nullable=False)  # Premières révisions
+    again = Column(Integer, default=0, nullable=False)  # Réponses "Again"
+    review_reviews = Column(Integer, default=0, nullable=False)  # Cartes en phase "review" (base de la rétention)
+    review_passed = Column(Integer, default=0, nullable=False)  # ... dont le rappel a réussi (rating > Again)
+    elapsed_ms = Column(BigInteger, default=0, nullable=False)  # Temps de réponse cumulé
+
+
+# Vues matérialisées sur l'état des cartes (créées par les migrations,
+# rafraîchies par le job refresh_stats). MetaData à part : Alembic ne les
+# prend pas pour des tables à créer.
+views_metadata = MetaData()
+
+# Cartes déjà étudiées dues par jour (jours passés regroupés sur le jour du rafraîchissement)
+due_forecast_view = Table(
+    "due_forecast_stats", views_metadata,
+    Column("user_id", Integer),
+    Column("day", Date),
+    Column("cards", Integer),
+)
+
+# Maturité des cartes de chaque catégorie
+category_maturity_view = Table(
+    "category_maturity_stats", views_metadata,
+    Column("category_id", Integer),
+    Column("user_id", Integer),
+    Column("new", Integer),
+    Column("learning", Integer),  # learning + relearning
+    Column("young", Integer),  # review, intervalle < MATURE_INTERVAL_DAYS
+    Column("mature", Integer),  # review, intervalle >= MATURE_INTERVAL_DAYS
+)
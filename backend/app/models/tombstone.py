@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Index
+from datetime import datetime
+from app.core.database import Base
+
+# Types d'entités supprimées
+TOMBSTONE_FLASHCARD = "flashcard"
+TOMBSTONE_CATEGORY = "category"
+
+
+class Tombstone(Base):
+    """
+    Modèle Tombstone - Table 'tombstones' en DB
+
+    Trace d'une suppression (les lignes supprimées n'existent plus) pour que
+    GET /api/sync puisse dire aux clients quoi supprimer localement.
+
+    Une catégorie supprimée emporte ses flashcards (cascade) : seule la
+    catégorie a un tombstone, le client supprime ses cartes lui-même.
+    """
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_user_id_sync_xid", "user_id", "sync_xid"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    entity_type = Column(String(16), nullable=False)  # "flashcard" ou "category"
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Transaction de la suppression (delta sync), posé par le trigger set_sync_xid
+    sync_xid = Column(BigInteger, server_default="0", nullable=False)
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Float
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -19,6 +20,18 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Paramètres FSRS ajustés sur l'historique du user (null = paramètres par défaut)
+    # Écrits par le job app/scheduling/optimizer.py
+    fsrs_weights = Column(ARRAY(Float), nullable=True)
+
+    # Incrémenté à chaque écriture sur les cartes/catégories du user
+    # (ETag des listes, voir app/core/revision.py)
+    revision = Column(BigInteger, default=0, server_default="0", nullable=False)
+
+    # Suppression en cours (job delete_user) : le user ne peut plus s'authentifier
+    deleted_at = Column(DateTime, nullable=True)
+
     # Relations
-    categories = relationship("Category", back_populates="owner", cascade="all, delete-orphan")
-    flashcards = relationship("FlashCard", back_populates="owner", cascade="all, delete-orphan")
+    # passive_deletes : ON DELETE CASCADE en DB, l'ORM ne charge pas les enfants pour les supprimer
+    categories = relationship("Category", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
+    flashcards = relationship("FlashCard", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
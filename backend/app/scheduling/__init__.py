@@ -0,0 +1,25 @@
+from app.scheduling.fsrs import (
+    AGAIN,
+    HARD,
+    GOOD,
+    EASY,
+    STATE_NEW,
+    STATE_LEARNING,
+    STATE_REVIEW,
+    STATE_RELEARNING,
+    CardSchedule,
+    FSRSScheduler,
+)
+
+__all__ = [
+    "AGAIN",
+    "HARD",
+    "GOOD",
+    "EASY",
+    "STATE_NEW",
+    "STATE_LEARNING",
+    "STATE_REVIEW",
+    "STATE_RELEARNING",
+    "CardSchedule",
+    "FSRSScheduler",
+]
@@ -0,0 +1,178 @@
+import math
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
+# Notes possibles pour une révision (comme les 4 boutons d'Anki)
+AGAIN = 1
+HARD = 2
+GOOD = 3
+EASY = 4
+
+# États d'une carte
+STATE_NEW = "new"
+STATE_LEARNING = "learning"
+STATE_REVIEW = "review"
+STATE_RELEARNING = "relearning"
+
+# Paramètres FSRS-4.5 par défaut (appris sur des millions de révisions Anki)
+DEFAULT_WEIGHTS = (
+    0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031,
+    1.6474, 0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755,
+)
+
+# Courbe d'oubli : R(t, S) = (1 + FACTOR * t / S) ^ DECAY
+# FACTOR est choisi pour que R(S, S) = 0.9 (S = jours pour retomber à 90%)
+DECAY = -0.5
+FACTOR = 0.9 ** (1 / DECAY) - 1
+
+
+@dataclass(frozen=True)
+class CardSchedule:
+    """
+    État de planification d'une carte (colonnes de flashcards)
+
+    stability: Jours pour que la probabilité de rappel retombe à 90%
+    difficulty: Difficulté de la carte (1 = facile, 10 = difficile)
+    """
+    state: str = STATE_NEW
+    stability: Optional[float] = None
+    difficulty: Optional[float] = None
+    interval_days: int = 0
+    reps: int = 0
+    lapses: int = 0
+    due_at: Optional[datetime] = None
+    last_reviewed_at: Optional[datetime] = None
+
+
+def retrievability(elapsed_days: float, stability: float) -> float:
+    """
+    Probabilité de se souvenir de la carte après elapsed_days jours
+    """
+    return (1 + FACTOR * elapsed_days / stability) ** DECAY
+
+
+class FSRSScheduler:
+    """
+    Planificateur FSRS (Free Spaced Repetition Scheduler)
+
+    Modèle mémoire à 3 composantes (difficulté, stabilité, retrievability) :
+    après chaque révision, la stabilité est mise à jour selon la note, puis
+    le prochain intervalle est choisi pour que la probabilité de rappel soit
+    égale à desired_retention le jour de la révision suivante.
+
+    Usage:
+        scheduler = FSRSScheduler()
+        new_schedule = scheduler.review(schedule, GOOD, datetime.utcnow())
+    """
+
+    def __init__(
+        self,
+        weights: Optional[Sequence[float]] = None,
+        desired_retention: float = 0.9,
+        maximum_interval: int = 36500,
+        relearning_minutes: int = 10,
+    ):
+        self.w = tuple(weights) if weights else DEFAULT_WEIGHTS
+        self.desired_retention = desired_retention
+        self.maximum_interval = maximum_interval
+        self.relearning_step = timedelta(minutes=relearning_minutes)
+
+    def review(self, schedule: CardSchedule, rating: int, now: datetime) -> CardSchedule:
+        """
+        Calcule le nouvel état d'une carte après une révision
+
+        Args:
+            schedule: État actuel de la carte
+            rating: AGAIN, HARD, GOOD ou EASY
+            now: Date de la révision
+
+        Returns:
+            Nouvel état (due_at = date de la prochaine révision)
+        """
+        if rating not in (AGAIN, HARD, GOOD, EASY):
+            raise ValueError(f"Invalid rating: {rating}")
+
+        if schedule.state == STATE_NEW or schedule.stability is None:
+            stability = self._init_stability(rating)
+            difficulty = self._init_difficulty(rating)
+        else:
+            elapsed_days = 0.0
+            if schedule.last_reviewed_at is not None:
+                elapsed_days = max((now - schedule.last_reviewed_at).total_seconds() / 86400, 0.0)
+            r = retrievability(elapsed_days, schedule.stability)
+            difficulty = self._next_difficulty(schedule.difficulty, rating)
+            if rating == AGAIN:
+                stability = self._forget_stability(schedule.difficulty, schedule.stability, r)
+            else:
+                stability = self._recall_stability(schedule.difficulty, schedule.stability, r, rating)
+
+        lapses = schedule.lapses
+        if rating == AGAIN:
+            # Oubli : on revoit la carte dans quelques minutes
+            if schedule.state == STATE_REVIEW:
+                lapses += 1
+            state = STATE_LEARNING if schedule.state in (STATE_NEW, STATE_LEARNING) else STATE_RELEARNING
+            interval_days = 0
+            due_at = now + self.relearning_step
+        else:
+            state = STATE_REVIEW
+            interval_days = self.next_interval(stability)
+            due_at = now + timedelta(days=interval_days)
+
+        return replace(
+            schedule,
+            state=state,
+            stability=stability,
+            difficulty=difficulty,
+            interval_days=interval_days,
+            reps=schedule.reps + 1,
+            lapses=lapses,
+            due_at=due_at,
+            last_reviewed_at=now,
+        )
+
+    def next_interval(self, stability: float) -> int:
+        """
+        Intervalle (jours) pour lequel R(intervalle, stability) = desired_retention
+        """
+        interval = stability / FACTOR * (self.desired_retention ** (1 / DECAY) - 1)
+        return min(max(round(interval), 1), self.maximum_interval)
+
+    def _init_stability(self, rating: int) -> float:
+        return max(self.w[rating - 1], 0.1)
+
+    def _init_difficulty(self, rating: int) -> float:
+        return _clamp_difficulty(self.w[4] - (rating - 3) * self.w[5])
+
+    def _next_difficulty(self, difficulty: float, rating: int) -> float:
+        next_d = difficulty - self.w[6] * (rating - 3)
+        # Mean reversion vers la difficulté initiale d'une carte notée GOOD
+        return _clamp_difficulty(self.w[7] * self._init_difficulty(GOOD) + (1 - self.w[7]) * next_d)
+
+    def _recall_stability(self, difficulty: float, stability: float, r: float, rating: int) -> float:
+        hard_penalty = self.w[15] if rating == HARD else 1.0
+        easy_bonus = self.w[16] if rating == EASY else 1.0
+        return stability * (
+            1
+            + math.exp(self.w[8])
+            * (11 - difficulty)
+            * stability ** -self.w[9]
+            * (math.exp(self.w[10] * (1 - r)) - 1)
+            * hard_penalty
+            * easy_bonus
+        )
+
+    def _forget_stability(self, difficulty: float, stability: float, r: float) -> float:
+        next_s = (
+            self.w[11]
+            * difficulty ** -self.w[12]
+            * ((stability + 1) ** self.w[13] - 1)
+            * math.exp(self.w[14] * (1 - r))
+        )
+        # Une carte oubliée ne peut pas devenir plus stable qu'avant
+        return min(next_s, stability)
+
+
+def _clamp_difficulty(difficulty: float) -> float:
+    return min(max(difficulty, 1.0), 10.0)
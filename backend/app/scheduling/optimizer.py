@@ -0,0 +1,342 @@
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+import numpy as np
+from sqlalchemy import func, select, update
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.user_cache import user_cache, user_changed_notification
+from app.models import User, ReviewLog
+from app.scheduling.fsrs import AGAIN, HARD, EASY, DECAY, FACTOR, DEFAULT_WEIGHTS
+
+logger = logging.getLogger(__name__)
+
+# Bornes de chaque paramètre FSRS (mêmes bornes que l'optimiseur officiel)
+LOWER_BOUNDS = np.array([
+    0.1, 0.1, 0.1, 0.1, 1.0, 0.1, 0.1, 0.0,
+    0.0, 0.0, 0.01, 0.1, 0.01, 0.01, 0.01, 0.0, 1.0,
+])
+UPPER_BOUNDS = np.array([
+    100.0, 100.0, 100.0, 100.0, 10.0, 5.0, 5.0, 0.5,
+    3.0, 0.8, 2.5, 5.0, 0.2, 0.9, 2.0, 1.0, 4.0,
+])
+
+# Au-delà, les révisions d'une carte sont ignorées (bornes la taille des tableaux)
+MAX_REVIEWS_PER_CARD = 64
+
+
+@dataclass
+class ReviewHistory:
+    """
+    Historique d'un user sous forme de tableaux NumPy (une ligne par carte)
+
+    ratings: Notes (1..4), shape (n_cards, n_steps), 0 = pas de révision
+    delta_days: Jours écoulés depuis la révision précédente de la carte
+    mask: True là où une révision existe
+    """
+    ratings: np.ndarray
+    delta_days: np.ndarray
+    mask: np.ndarray
+
+    @property
+    def n_reviews(self) -> int:
+        return int(self.mask.sum())
+
+
+def build_history(card_ids: np.ndarray, ratings: np.ndarray, reviewed_at: np.ndarray) -> ReviewHistory:
+    """
+    Transforme les logs (triés par card_id puis reviewed_at) en tableaux (carte, étape)
+
+    Args:
+        card_ids: ID de carte de chaque révision
+        ratings: Note de chaque révision
+        reviewed_at: Date de chaque révision (datetime64)
+
+    Returns:
+        ReviewHistory prête pour loss_batch()
+    """
+    if len(card_ids) == 0:
+        empty = np.zeros((0, 0))
+        return ReviewHistory(empty.astype(np.int8), empty, empty.astype(bool))
+
+    # Début de chaque carte dans le tableau trié, puis rang de la révision dans sa carte
+    starts = np.flatnonzero(np.r_[True, card_ids[1:] != card_ids[:-1]])
+    card_index = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(card_ids)]))
+    step = np.arange(len(card_ids)) - starts[card_index]
+
+    seconds = reviewed_at.astype("datetime64[s]").astype(np.int64)
+    delta = np.zeros(len(card_ids))
+    delta[1:] = (seconds[1:] - seconds[:-1]) / 86400
+    delta[step == 0] = 0.0
+
+    keep = step < MAX_REVIEWS_PER_CARD
+    n_steps = int(min(step.max() + 1, MAX_REVIEWS_PER_CARD))
+    shape = (len(starts), n_steps)
+
+    history = ReviewHistory(
+        ratings=np.zeros(shape, dtype=np.int8),
+        delta_days=np.zeros(shape),
+        mask=np.zeros(shape, dtype=bool),
+    )
+    history.ratings[card_index[keep], step[keep]] = ratings[keep]
+    history.delta_days[card_index[keep], step[keep]] = delta[keep]
+    history.mask[card_index[keep], step[keep]] = True
+    return history
+
+
+def loss_batch(weights: np.ndarray, history: ReviewHistory) -> np.ndarray:
+    """
+    Log-loss moyenne des prédictions de rappel, pour plusieurs jeux de paramètres
+
+    Toutes les cartes et tous les jeux de paramètres avancent ensemble, étape
+    par étape : la seule boucle Python porte sur le rang de la révision
+    (≤ MAX_REVIEWS_PER_CARD), pas sur les révisions.
+
+    Args:
+        weights: shape (n_sets, 17)
+        history: Historique du user
+
+    Returns:
+        Loss de chaque jeu de paramètres, shape (n_sets,)
+    """
+    w = weights[:, :, None]  # (n_sets, 17, 1) → broadcast sur les cartes
+    ratings = history.ratings
+    first = ratings[:, 0]
+
+    # Étape 0 : stabilité/difficulté initiales selon la première note
+    first_index = np.broadcast_to((first - 1).astype(np.intp), (len(weights), len(first)))
+    stability = np.take_along_axis(weights, first_index, axis=1)
+    difficulty = _init_difficulty(w, first)
+
+    total = np.zeros(len(weights))
+    count = 0
+    for k in range(1, ratings.shape[1]):
+        mask = history.mask[:, k]
+        if not mask.any():
+            break
+        rating = ratings[:, k]
+        t = history.delta_days[:, k]
+
+        r = np.clip((1 + FACTOR * t / stability) ** DECAY, 1e-6, 1 - 1e-6)
+
+        # Les révisions du même jour (réapprentissage) ne servent pas à la loss
+        scored = mask & (t >= 1)
+        recalled = rating > AGAIN
+        log_likelihood = np.where(recalled, np.log(r), np.log(1 - r))
+        total -= (log_likelihood * scored).sum(axis=1)
+        count += int(scored.sum())
+
+        next_stability = np.where(
+            recalled,
+            _recall_stability(w, difficulty, stability, r, rating),
+            _forget_stability(w, difficulty, stability, r),
+        )
+        next_difficulty = _next_difficulty(w, difficulty, rating)
+
+        stability = np.where(mask, np.clip(next_stability, 0.01, 36500), stability)
+        difficulty = np.where(mask, next_difficulty, difficulty)
+
+    return total / max(count, 1)
+
+
+def _init_difficulty(w: np.ndarray, rating: np.ndarray) -> np.ndarray:
+    return np.clip(w[:, 4] - (rating - 3) * w[:, 5], 1, 10)
+
+
+def _next_difficulty(w: np.ndarray, difficulty: np.ndarray, rating: np.ndarray) -> np.ndarray:
+    next_d = difficulty - w[:, 6] * (rating - 3)
+    return np.clip(w[:, 7] * _init_difficulty(w, 3) + (1 - w[:, 7]) * next_d, 1, 10)
+
+
+def _recall_stability(w, difficulty, stability, r, rating):
+    hard_penalty = np.where(rating == HARD, w[:, 15], 1.0)
+    easy_bonus = np.where(rating == EASY, w[:, 16], 1.0)
+    return stability * (
+        1
+        + np.exp(w[:, 8])
+        * (11 - difficulty)
+        * stability ** -w[:, 9]
+        * (np.exp(w[:, 10] * (1 - r)) - 1)
+        * hard_penalty
+        * easy_bonus
+    )
+
+
+def _forget_stability(w, difficulty, stability, r):
+    next_s = (
+        w[:, 11]
+        * difficulty ** -w[:, 12]
+        * ((stability + 1) ** w[:, 13] - 1)
+        * np.exp(w[:, 14] * (1 - r))
+    )
+    return np.minimum(next_s, stability)
+
+
+def loss_and_gradient(weights: np.ndarray, history: ReviewHistory, epsilon: float = 1e-4):
+    """
+    Loss et gradient (différences centrées) en un seul passage vectorisé
+
+    Les 2 × 17 jeux de paramètres perturbés + le jeu courant sont évalués
+    ensemble par loss_batch().
+
+    Returns:
+        (loss, gradient de shape (17,))
+    """
+    n = len(weights)
+    offsets = np.eye(n) * epsilon
+    batch = np.vstack([weights[None, :], weights + offsets, weights - offsets])
+    losses = loss_batch(batch, history)
+    gradient = (losses[1:n + 1] - losses[n + 1:]) / (2 * epsilon)
+    return losses[0], gradient
+
+
+def fit_weights(
+    history: ReviewHistory,
+    initial: Optional[Sequence[float]] = None,
+    iterations: int = 200,
+    learning_rate: float = 0.05,
+) -> Dict:
+    """
+    Ajuste les paramètres FSRS sur l'historique (Adam + projection sur les bornes)
+
+    Returns:
+        {"weights": [...], "initial_loss": float, "loss": float}
+    """
+    weights = np.clip(np.array(initial or DEFAULT_WEIGHTS, dtype=float), LOWER_BOUNDS, UPPER_BOUNDS)
+    m = np.zeros_like(weights)
+    v = np.zeros_like(weights)
+    beta1, beta2 = 0.9, 0.999
+
+    initial_loss = loss_batch(weights[None, :], history)[0]
+    best_weights, best_loss = weights.copy(), initial_loss
+
+    for i in range(1, iterations + 1):
+        loss, gradient = loss_and_gradient(weights, history)
+        if loss < best_loss:
+            best_weights, best_loss = weights.copy(), loss
+
+        m = beta1 * m + (1 - beta1) * gradient
+        v = beta2 * v + (1 - beta2) * gradient ** 2
+        m_hat = m / (1 - beta1 ** i)
+        v_hat = v / (1 - beta2 ** i)
+        weights = np.clip(weights - learning_rate * m_hat / (np.sqrt(v_hat) + 1e-8), LOWER_BOUNDS, UPPER_BOUNDS)
+
+    final_loss = loss_batch(weights[None, :], history)[0]
+    if final_loss < best_loss:
+        best_weights, best_loss = weights, final_loss
+
+    return {
+        "weights": [round(float(x), 4) for x in best_weights],
+        "initial_loss": float(initial_loss),
+        "loss": float(best_loss),
+    }
+
+
+def load_history(db, user_id: int) -> ReviewHistory:
+    """
+    Charge les review logs d'un user directement en tableaux NumPy
+    """
+    rows = db.execute(
+        select(ReviewLog.card_id, ReviewLog.rating, ReviewLog.reviewed_at)
+        .where(ReviewLog.user_id == user_id)
+        .order_by(ReviewLog.card_id, ReviewLog.reviewed_at)
+    ).all()
+
+    card_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    ratings = np.fromiter((row[1] for row in rows), dtype=np.int8, count=len(rows))
+    reviewed_at = np.array([row[2] for row in rows], dtype="datetime64[us]")
+    return build_history(card_ids, ratings, reviewed_at)
+
+
+def optimize_user(user_id: int) -> Dict:
+    """
+    Ajuste et enregistre les paramètres FSRS d'un user (users.fsrs_weights)
+
+    Les paramètres ne sont remplacés que si l'historique est assez grand
+    et que la loss s'améliore.
+
+    Returns:
+        {"user_id": ..., "status": "updated" | "skipped", ...}
+    """
+    with SessionLocal() as db:
+        history = load_history(db, user_id)
+        if history.n_reviews < settings.FSRS_OPTIMIZER_MIN_REVIEWS:
+            return {"user_id": user_id, "status": "skipped", "reviews": history.n_reviews}
+
+        current = db.execute(select(User.fsrs_weights).where(User.id == user_id)).scalar_one_or_none()
+        result = fit_weights(history, initial=current)
+
+        status = "skipped"
+        if result["loss"] < result["initial_loss"]:
+            db.execute(update(User).where(User.id == user_id).values(fsrs_weights=result["weights"]))
+            # Process à part : le cache en mémoire des process API est invalidé par NOTIFY
+            db.execute(user_changed_notification(user_id))
+            db.commit()
+            user_cache.invalidate(user_id)
+            status = "updated"
+
+    return {"user_id": user_id, "status": status, "reviews": history.n_reviews, **result}
+
+
+def optimize_scheduler_job(db, job, report: Callable) -> None:
+    """
+    optimize_user en tâche de fond (job JOB_OPTIMIZE_SCHEDULER, payload {"user_id": ...})
+    """
+    result = optimize_user(job.payload["user_id"])
+    report({key: result[key] for key in ("status", "reviews", "initial_loss", "loss") if key in result})
+
+
+def _init_worker() -> None:
+    # Les connexions héritées du process parent (fork) ne doivent pas être réutilisées
+    engine.dispose(close=False)
+
+
+def optimize_users(user_ids: List[int], workers: Optional[int] = None) -> List[Dict]:
+    """
+    Optimise plusieurs users en parallèle (un process par cœur par défaut)
+    """
+    workers = workers or settings.FSRS_OPTIMIZER_WORKERS or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(optimize_user, user_ids))
+
+
+def eligible_user_ids() -> List[int]:
+    """
+    Users avec assez de révisions pour être optimisés
+    """
+    with SessionLocal() as db:
+        return db.execute(
+            select(ReviewLog.user_id)
+            .group_by(ReviewLog.user_id)
+            .having(func.count() >= settings.FSRS_OPTIMIZER_MIN_REVIEWS)
+        ).scalars().all()
+
+
+def main() -> None:
+    """
+    Job d'optimisation des paramètres FSRS
+
+    Usage:
+        python -m app.scheduling.optimizer                 # tous les users éligibles
+        python -m app.scheduling.optimizer --user-id 1 2   # users précis
+    """
+    parser = argparse.ArgumentParser(description="Fit per-user FSRS parameters from review_logs")
+    parser.add_argument("--user-id", type=int, nargs="*", help="Users to optimize (default: all eligible)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    user_ids = args.user_id or eligible_user_ids()
+    for result in optimize_users(user_ids, args.workers):
+        logger.info(
+            "user %s: %s (%s reviews, loss %.4f → %.4f)",
+            result["user_id"], result["status"], result["reviews"],
+            result.get("initial_loss", float("nan")), result.get("loss", float("nan")),
+        )
+
+
+if __name__ == "__main__":
+    main()
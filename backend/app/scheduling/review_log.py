@@ -0,0 +1,239 @@
+import argparse
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Set, Tuple
+from sqlalchemy import insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.models import ReviewLog
+from app.services.stats import ReviewStatsDeltas
+
+logger = logging.getLogger(__name__)
+
+
+def _month_start(year: int, month: int) -> datetime:
+    # Normalise les mois hors 1..12 (ex: mois 13 = janvier de l'année suivante)
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return datetime(year, month, 1)
+
+
+def partition_name(month: datetime) -> str:
+    """
+    Nom de la partition d'un mois (ex: review_logs_y2024m01)
+    """
+    return f"review_logs_y{month.year:04d}m{month.month:02d}"
+
+
+def ensure_review_log_partitions(bind: Engine, start: datetime, months: int) -> List[str]:
+    """
+    Crée (si besoin) les partitions mensuelles de review_logs
+
+    Args:
+        bind: Engine (ou connexion) sur lequel exécuter le DDL
+        start: Date dans le premier mois à couvrir
+        months: Nombre de mois à couvrir à partir de start
+
+    Returns:
+        Noms des partitions couvertes
+    """
+    names = []
+    with bind.begin() as conn:
+        for offset in range(months):
+            lower = _month_start(start.year, start.month + offset)
+            upper = _month_start(start.year, start.month + offset + 1)
+            name = partition_name(lower)
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF review_logs "
+                f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+            ))
+            names.append(name)
+    return names
+
+
+def detach_review_log_partitions(bind: Engine, before: datetime) -> List[str]:
+    """
+    Détache les partitions dont tout le mois est antérieur à `before`
+
+    Une partition détachée devient une table normale : on peut l'exporter
+    (pg_dump -t review_logs_y2024m01) puis la supprimer, sans DELETE ligne
+    par ligne ni VACUUM sur review_logs.
+
+    Returns:
+        Noms des partitions détachées
+    """
+    cutoff = partition_name(_month_start(before.year, before.month))
+    detached = []
+    with bind.begin() as conn:
+        rows = conn.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = 'review_logs' ORDER BY child.relname"
+        )).scalars().all()
+        for name in rows:
+            # Les noms review_logs_yYYYYmMM sont triables chronologiquement
+            if name < cutoff:
+                conn.execute(text(f"ALTER TABLE review_logs DETACH PARTITION {name}"))
+                detached.append(name)
+    return detached
+
+
+class ReviewLogWriter:
+    """
+    Buffer des review logs, vidé par un thread de fond en INSERT multi-lignes
+
+    Les routes appellent submit() (non bloquant) au lieu de faire un
+    db.commit() par réponse : le thread regroupe jusqu'à batch_size lignes
+    (ou ce qui est arrivé en flush_interval) dans une seule transaction.
+
+    Usage:
+        review_log_writer.start()   # au démarrage de l'app
+        review_log_writer.submit({"user_id": 1, "card_id": 2, ...})
+        review_log_writer.stop()    # à l'arrêt : vide le buffer
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int,
+        flush_interval: float,
+        queue_size: int,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._partitions: Set[Tuple[int, int]] = set()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="review-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Arrête le thread après avoir écrit tout ce qui reste dans le buffer
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, row: Dict) -> None:
+        """
+        Ajoute une révision au buffer
+
+        Si le buffer est plein (DB lente), la ligne est écrite tout de suite
+        par l'appelant : back-pressure plutôt que perte de données.
+        """
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._flush([row])
+
+    def _run(self) -> None:
+        while not self._stop.is_set() or not self._queue.empty():
+            batch = self._collect()
+            if batch:
+                self._flush(batch)
+
+    def _collect(self) -> List[Dict]:
+        batch: List[Dict] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, rows: List[Dict]) -> None:
+        for attempt in range(3):
+            try:
+                self._write(rows)
+                return
+            except Exception:
+                logger.exception("Review log flush failed (attempt %d, %d rows)", attempt + 1, len(rows))
+                time.sleep(0.5 * 2 ** attempt)
+
+        # Une ligne invalide ne doit pas faire perdre tout le batch (et les autres users)
+        dropped = 0
+        if len(rows) > 1:
+            for row in rows:
+                try:
+                    self._write([row])
+                except Exception:
+                    logger.exception("Review log row rejected: %r", row)
+                    dropped += 1
+        else:
+            dropped = len(rows)
+        if dropped:
+            logger.error("Dropped %d review log rows", dropped)
+
+    def _write(self, rows: List[Dict]) -> None:
+        self._ensure_partitions(rows)
+        with self.session_factory() as db:
+            # executemany → INSERT ... VALUES (...), (...), ... (insertmanyvalues)
+            db.execute(insert(ReviewLog), rows)
+            # Agrégats quotidiens (GET /api/stats) : même transaction que les logs
+            deltas = ReviewStatsDeltas()
+            for row in rows:
+                deltas.add(row)
+            db.execute(deltas.statement())
+            db.commit()
+
+    def _ensure_partitions(self, rows: List[Dict]) -> None:
+        months = {(row["reviewed_at"].year, row["reviewed_at"].month) for row in rows}
+        for year, month in months - self._partitions:
+            ensure_review_log_partitions(engine, datetime(year, month, 1), 1)
+            self._partitions.add((year, month))
+
+
+# Writer partagé par toutes les requêtes du process (démarré dans main.py)
+review_log_writer = ReviewLogWriter(
+    SessionLocal,
+    batch_size=settings.REVIEW_LOG_BATCH_SIZE,
+    flush_interval=settings.REVIEW_LOG_FLUSH_INTERVAL_MS / 1000,
+    queue_size=settings.REVIEW_LOG_QUEUE_SIZE,
+)
+
+
+def main() -> None:
+    """
+    Maintenance des partitions de review_logs
+
+    Usage:
+        python -m app.scheduling.review_log ensure
+        python -m app.scheduling.review_log detach --keep-months 12
+    """
+    parser = argparse.ArgumentParser(description="review_logs partition maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("ensure", help="Create the current and upcoming monthly partitions")
+    detach = subparsers.add_parser("detach", help="Detach partitions older than --keep-months")
+    detach.add_argument("--keep-months", type=int, default=12)
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    if args.command == "ensure":
+        names = ensure_review_log_partitions(engine, now, settings.REVIEW_LOG_PARTITION_MONTHS_AHEAD + 1)
+    else:
+        names = detach_review_log_partitions(engine, _month_start(now.year, now.month - args.keep_months))
+    for name in names:
+        print(name)
+
+
+if __name__ == "__main__":
+    main()
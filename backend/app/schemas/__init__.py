@@ -1,10 +1,20 @@
-from app.schemas.user import UserCreate, UserLogin, UserResponse, Token, TokenData
+from app.schemas.user import UserCreate, UserLogin, PasswordChange, UserResponse, Token, TokenData
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
-from app.schemas.flashcard import FlashCardCreate, FlashCardUpdate, FlashCardResponse
+from app.schemas.flashcard import (
+    FlashCardCreate, FlashCardUpdate, FlashCardResponse, FlashCardPage,
+    FlashCardSearchResult, FlashCardSearchPage,
+    FlashCardBatchOperation, FlashCardBatchRequest, FlashCardBatchItemResult, FlashCardBatchResponse,
+)
+from app.schemas.review import ReviewAnswer, ReviewSchedule, ReviewCard, ReviewResult
+from app.schemas.deck import ImportResult
+from app.schemas.sync import SyncFlashCard, SyncCategory, SyncResponse
+from app.schemas.job import JobCreate, JobResponse
+from app.schemas.stats import DailyReviews, Retention, DueForecastDay, CategoryMaturity, StatsResponse
 
 __all__ = [
     "UserCreate",
     "UserLogin",
+    "PasswordChange",
     "UserResponse",
     "Token",
     "TokenData",
@@ -14,4 +24,26 @@ __all__ = [
     "FlashCardCreate",
     "FlashCardUpdate",
     "FlashCardResponse",
+    "FlashCardPage",
+    "FlashCardSearchResult",
+    "FlashCardSearchPage",
+    "FlashCardBatchOperation",
+    "FlashCardBatchRequest",
+    "FlashCardBatchItemResult",
+    "FlashCardBatchResponse",
+    "ReviewAnswer",
+    "ReviewSchedule",
+    "ReviewCard",
+    "ReviewResult",
+    "ImportResult",
+    "SyncFlashCard",
+    "SyncCategory",
+    "SyncResponse",
+    "JobCreate",
+    "JobResponse",
+    "DailyReviews",
+    "Retention",
+    "DueForecastDay",
+    "CategoryMaturity",
+    "StatsResponse",
 ]
@@ -35,13 +35,15 @@ class CategoryResponse(CategoryBase):
         "name": "Python",
         "user_id": 1,
         "created_at": "2024-01-01T00:00:00",
-        "flashcard_count": 5
+        "flashcard_count": 5,
+        "new_count": 2
     }
     """
     id: int
     user_id: int
     created_at: datetime
     flashcard_count: Optional[int] = 0  # Nombre de flashcards dans cette catégorie
+    new_count: Optional[int] = 0  # Dont jamais révisées
 
     class Config:
         from_attributes = True
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+class ImportResult(BaseModel):
+    """
+    Schema pour le résultat d'un import (POST /api/import)
+
+    Output: {
+        "format": "apkg",
+        "cards_imported": 30000,
+        "categories_created": 4,
+        "rows_skipped": 12
+    }
+    """
+    format: str
+    cards_imported: int
+    categories_created: int
+    rows_skipped: int
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 
 class FlashCardBase(BaseModel):
@@ -61,3 +61,90 @@ class FlashCardResponse(FlashCardBase):
 
     class Config:
         from_attributes = True
+
+
+class FlashCardPage(BaseModel):
+    """
+    Schema pour une page de flashcards (pagination keyset)
+
+    Output: {
+        "items": [FlashCardResponse, ...],
+        "next_cursor": 42  # null s'il n'y a plus de page
+    }
+    """
+    items: List[FlashCardResponse]
+    next_cursor: Optional[int] = None  # ID de la dernière carte de la page
+
+
+class FlashCardSearchResult(FlashCardResponse):
+    """
+    Schema pour un résultat de recherche (flashcard + score de pertinence)
+    """
+    rank: float = 0.0  # ts_rank (plus haut = plus pertinent)
+
+
+class FlashCardSearchPage(BaseModel):
+    """
+    Schema pour une page de résultats de recherche (triés par pertinence)
+
+    Output: {
+        "items": [FlashCardSearchResult, ...],
+        "next_offset": 20  # null s'il n'y a plus de résultats
+    }
+    """
+    items: List[FlashCardSearchResult]
+    next_offset: Optional[int] = None
+
+
+class FlashCardBatchOperation(BaseModel):
+    """
+    Schema pour une opération d'un batch (POST /api/flashcards/batch)
+
+    Input: {"op": "create", "question": "...", "answer": "...", "category_id": 1}
+           {"op": "update", "id": 12, "answer": "..."}
+           {"op": "delete", "id": 13}
+    """
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None  # update / delete
+    question: Optional[str] = None
+    answer: Optional[str] = None
+    category_id: Optional[int] = None
+
+
+class FlashCardBatchRequest(BaseModel):
+    """
+    Schema pour un batch d'opérations (appliquées dans une seule transaction)
+
+    Input: {"operations": [FlashCardBatchOperation, ...]}
+    """
+    operations: List[FlashCardBatchOperation] = Field(..., min_length=1, max_length=1000)
+
+
+class FlashCardBatchItemResult(BaseModel):
+    """
+    Schema pour le résultat d'une opération (même index que dans la requête)
+
+    Output: {
+        "index": 0,
+        "op": "create",
+        "status_code": 201,
+        "id": 42,
+        "detail": null,  # Message d'erreur si status_code >= 400
+        "flashcard": FlashCardResponse  # null pour delete et les erreurs
+    }
+    """
+    index: int
+    op: str
+    status_code: int
+    id: Optional[int] = None
+    detail: Optional[str] = None
+    flashcard: Optional[FlashCardResponse] = None
+
+
+class FlashCardBatchResponse(BaseModel):
+    """
+    Schema pour les résultats d'un batch
+
+    Output: {"results": [FlashCardBatchItemResult, ...]}
+    """
+    results: List[FlashCardBatchItemResult]
@@ -0,0 +1,48 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+
+
+class JobCreate(BaseModel):
+    """
+    Schema pour lancer un job à la demande (POST /api/jobs)
+
+    Input: {
+        "kind": "optimize_scheduler"  # ou "reconcile_counters"
+    }
+    """
+    kind: Literal["optimize_scheduler", "reconcile_counters"]
+
+
+class JobResponse(BaseModel):
+    """
+    Schema pour l'état d'un job en tâche de fond (GET /api/jobs/{id})
+
+    Output: {
+        "id": 12,
+        "kind": "delete_category",
+        "status": "running",  # queued, running, succeeded, failed
+        "progress": {"flashcards": 15000},
+        "error": null,  # Dernière erreur (aussi pendant les nouveaux essais)
+        "attempts": 1,
+        "max_attempts": 3,
+        "token": "Qm9u...",  # Suivi sans authentification : GET /api/jobs/status/{token}
+        "created_at": "...",
+        "started_at": "...",
+        "finished_at": null
+    }
+    """
+    id: int
+    kind: str
+    status: str
+    progress: Dict[str, Any]
+    error: Optional[str] = None
+    attempts: int = 0
+    max_attempts: int
+    token: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
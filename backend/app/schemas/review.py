@@ -0,0 +1,68 @@
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
+from typing import Optional
+from app.schemas.flashcard import FlashCardResponse
+
+# Temps de réponse conservé au plus (review_logs.elapsed_ms est un INTEGER 32 bits)
+MAX_ELAPSED_MS = 24 * 60 * 60 * 1000
+
+
+class ReviewAnswer(BaseModel):
+    """
+    Schema pour répondre à une carte (POST /api/review/{id})
+
+    Input: {
+        "rating": 3,        # 1 = Again, 2 = Hard, 3 = Good, 4 = Easy
+        "elapsed_ms": 5400  # Temps passé sur la carte (optionnel)
+    }
+    """
+    rating: int = Field(..., ge=1, le=4)
+    elapsed_ms: Optional[int] = Field(None, ge=0)
+
+    @field_validator("elapsed_ms")
+    @classmethod
+    def cap_elapsed_ms(cls, value: Optional[int]) -> Optional[int]:
+        # Carte restée ouverte (onglet oublié...) : plafonnée plutôt que refusée
+        return min(value, MAX_ELAPSED_MS) if value is not None else None
+
+
+class ReviewSchedule(BaseModel):
+    """
+    Schema pour l'état de planification d'une carte
+
+    Output: {
+        "state": "review",
+        "due_at": "2024-01-04T00:00:00",
+        "interval_days": 3,
+        "stability": 3.71,
+        "difficulty": 5.16,
+        "reps": 1,
+        "lapses": 0,
+        "last_reviewed_at": "2024-01-01T00:00:00"
+    }
+    """
+    state: str
+    due_at: datetime
+    interval_days: int
+    stability: Optional[float] = None
+    difficulty: Optional[float] = None
+    reps: int
+    lapses: int
+    last_reviewed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ReviewCard(FlashCardResponse, ReviewSchedule):
+    """
+    Schema pour une carte à réviser (flashcard + planification)
+    """
+    pass
+
+
+class ReviewResult(ReviewSchedule):
+    """
+    Schema pour le résultat d'une révision (nouvelle planification)
+    """
+    id: int
@@ -0,0 +1,89 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import List, Optional
+
+
+class DailyReviews(BaseModel):
+    """
+    Schema pour les révisions d'un jour (UTC)
+
+    Output: {
+        "day": "2024-01-01",
+        "reviews": 120,
+        "new_cards": 20,   # Premières révisions
+        "again": 11,       # Réponses "Again"
+        "time_ms": 540000  # Temps de réponse cumulé
+    }
+    """
+    day: date
+    reviews: int
+    new_cards: int
+    again: int
+    time_ms: int
+
+
+class Retention(BaseModel):
+    """
+    Schema pour la rétention (rappels réussis des cartes en phase "review")
+
+    Output: {
+        "reviews": 800,
+        "passed": 712,
+        "rate": 0.89  # null si aucune révision
+    }
+    """
+    reviews: int
+    passed: int
+    rate: Optional[float] = None
+
+
+class DueForecastDay(BaseModel):
+    """
+    Schema pour les cartes dues un jour donné (le premier jour inclut les cartes en retard)
+
+    Output: {"day": "2024-01-02", "cards": 45}
+    """
+    day: date
+    cards: int
+
+
+class CategoryMaturity(BaseModel):
+    """
+    Schema pour la maturité des cartes d'une catégorie
+
+    Output: {
+        "category_id": 1,
+        "name": "Python",
+        "new": 10,
+        "learning": 3,  # learning + relearning
+        "young": 25,    # intervalle < 21 jours
+        "mature": 40    # intervalle >= 21 jours
+    }
+    """
+    category_id: int
+    name: str
+    new: int
+    learning: int
+    young: int
+    mature: int
+
+
+class StatsResponse(BaseModel):
+    """
+    Schema pour les statistiques d'étude (GET /api/stats)
+
+    Output: {
+        "days": 30,
+        "reviews_per_day": [DailyReviews, ...],  # Un élément par jour, du plus ancien à aujourd'hui
+        "retention": Retention,                  # Sur la même période
+        "due_forecast": [DueForecastDay, ...],   # 30 jours à partir d'aujourd'hui
+        "categories": [CategoryMaturity, ...],
+        "refreshed_at": "..."                    # Calcul de due_forecast / categories (null si jamais rafraîchi par un worker)
+    }
+    """
+    days: int
+    reviews_per_day: List[DailyReviews]
+    retention: Retention
+    due_forecast: List[DueForecastDay]
+    categories: List[CategoryMaturity]
+    refreshed_at: Optional[datetime] = None
@@ -0,0 +1,49 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List
+from app.schemas.flashcard import FlashCardResponse
+from app.schemas.review import ReviewSchedule
+
+
+class SyncFlashCard(FlashCardResponse, ReviewSchedule):
+    """
+    Schema pour une flashcard dans un delta sync (contenu + planification)
+    """
+    pass
+
+
+class SyncCategory(BaseModel):
+    """
+    Schema pour une catégorie dans un delta sync
+
+    Output: {"id": 1, "name": "Python", "user_id": 1, "created_at": "...", "updated_at": "..."}
+    """
+    id: int
+    name: str
+    user_id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SyncResponse(BaseModel):
+    """
+    Schema pour un delta sync (GET /api/sync?since=<watermark>)
+
+    Output: {
+        "watermark": "748|0",  # Opaque, à renvoyer en since au prochain sync
+        "has_more": false,  # true = rappeler tout de suite avec watermark
+        "flashcards": [SyncFlashCard, ...],  # Créées ou modifiées
+        "categories": [SyncCategory, ...],  # Créées ou modifiées
+        "deleted_flashcard_ids": [12],
+        "deleted_category_ids": [3]  # Leurs flashcards sont supprimées aussi
+    }
+    """
+    watermark: str
+    has_more: bool
+    flashcards: List[SyncFlashCard]
+    categories: List[SyncCategory]
+    deleted_flashcard_ids: List[int]
+    deleted_category_ids: List[int]
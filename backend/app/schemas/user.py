@@ -27,6 +27,16 @@ class UserLogin(BaseModel):
     password: str
 
 
+class PasswordChange(BaseModel):
+    """
+    Schema pour changer de password (POST /auth/change-password)
+
+    Input: {"current_password": "mypassword", "new_password": "newpassword"}
+    """
+    current_password: str
+    new_password: str
+
+
 class UserResponse(UserBase):
     """
     Schema pour retourner un user (SANS password)
@@ -0,0 +1 @@
+# Services (traitements lourds partagés par les routes et les jobs)
@@ -0,0 +1,117 @@
+from typing import Callable
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.revision import bump_revision
+from app.core.user_cache import user_cache, user_changed_notification
+from app.models import Category, DailyReviewStats, FlashCard, Job, ReviewLog, Tombstone, User
+from app.models.tombstone import TOMBSTONE_CATEGORY
+from app.scheduling import STATE_NEW
+from app.services.category_counters import CategoryCounterDeltas
+
+
+def _delete_batch(db: Session, model, where, batch_size: int):
+    """
+    DELETE d'au plus batch_size lignes (par id, via l'index de `where`)
+
+    Returns:
+        Lignes supprimées (state pour les flashcards, sinon id)
+    """
+    ids = select(model.id).where(where).limit(batch_size).scalar_subquery()
+    returning = model.state if model is FlashCard else model.id
+    return db.execute(
+        delete(model)
+        .where(where, model.id.in_(ids))
+        .returning(returning)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+
+def _delete_in_batches(db: Session, model, where, on_batch: Callable = None, batch_size: int = None) -> int:
+    """
+    Supprime toutes les lignes de `where`, une transaction courte par batch
+
+    Chaque commit libère les verrous : les autres requêtes du user (et
+    l'autovacuum) ne restent pas bloquées pendant toute la suppression.
+
+    Args:
+        on_batch: Appelé avec les lignes de chaque batch, avant son commit
+    """
+    batch_size = batch_size or settings.DELETE_BATCH_SIZE
+    total = 0
+    while True:
+        rows = _delete_batch(db, model, where, batch_size)
+        if not rows:
+            return total
+        total += len(rows)
+        if on_batch is not None:
+            on_batch(rows)
+        db.commit()
+
+
+def delete_category_in_batches(db: Session, job: Job, report: Callable) -> None:
+    """
+    Supprime une catégorie et ses flashcards par batches (job JOB_DELETE_CATEGORY)
+
+    Les compteurs et la révision du user suivent chaque batch : la liste des
+    catégories reste juste pendant la suppression. La catégorie elle-même
+    (et son tombstone) part à la fin, avec les cartes créées entre-temps.
+
+    Args:
+        job: payload {"category_id": ...}
+        report: Enregistre la progression du job (visible tout de suite)
+    """
+    category_id = job.payload["category_id"]
+    user_id = job.user_id
+    deleted = 0
+
+    def on_batch(states) -> None:
+        nonlocal deleted
+        deltas = CategoryCounterDeltas()
+        for state in states:
+            deltas.add(category_id, is_new=state == STATE_NEW, sign=-1)
+        db.execute(deltas.statement())
+        db.execute(bump_revision(user_id))
+        deleted += len(states)
+        report({"flashcards": deleted})
+
+    _delete_in_batches(db, FlashCard, FlashCard.category_id == category_id, on_batch)
+
+    # Reste éventuel (cartes créées pendant le job) : cascade en DB
+    if db.execute(delete(Category).where(Category.id == category_id).returning(Category.id)).first():
+        db.add(Tombstone(user_id=user_id, entity_type=TOMBSTONE_CATEGORY, entity_id=category_id))
+        db.execute(bump_revision(user_id))
+    report({"flashcards": deleted, "category": 1})
+    db.commit()
+
+
+def delete_user_in_batches(db: Session, job: Job, report: Callable) -> None:
+    """
+    Supprime un compte et toutes ses données par batches (job JOB_DELETE_USER)
+
+    Ordre : flashcards, historique des révisions, tombstones, puis le user
+    et ses statistiques (ON DELETE CASCADE emporte ses catégories, déjà vides).
+
+    Args:
+        job: payload {"user_id": ...}
+        report: Enregistre la progression du job (visible tout de suite)
+    """
+    user_id = job.payload["user_id"]
+    progress = {"flashcards": 0, "review_logs": 0, "tombstones": 0}
+
+    def counter(key: str) -> Callable:
+        def on_batch(rows) -> None:
+            progress[key] += len(rows)
+            report(dict(progress))
+        return on_batch
+
+    _delete_in_batches(db, FlashCard, FlashCard.user_id == user_id, counter("flashcards"))
+    _delete_in_batches(db, ReviewLog, ReviewLog.user_id == user_id, counter("review_logs"))
+    _delete_in_batches(db, Tombstone, Tombstone.user_id == user_id, counter("tombstones"))
+
+    db.execute(delete(DailyReviewStats).where(DailyReviewStats.user_id == user_id))
+    db.execute(delete(User).where(User.id == user_id))
+    db.execute(user_changed_notification(user_id))  # Cache des process API
+    report({**progress, "user": 1})
+    db.commit()
+    user_cache.invalidate(user_id)
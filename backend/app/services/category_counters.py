@@ -0,0 +1,154 @@
+import argparse
+from collections import Counter
+from typing import Callable, Optional
+from sqlalchemy import Integer, and_, column, func, or_, select, update, values
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.core.revision import bump_revision
+from app.models import Category, FlashCard, Job
+from app.scheduling import STATE_NEW
+
+
+class CategoryCounterDeltas:
+    """
+    Variations de categories.card_count / new_count à appliquer dans la
+    transaction qui crée, déplace ou supprime des flashcards
+
+    Usage:
+        deltas = CategoryCounterDeltas()
+        deltas.add(category_id, is_new=True)          # carte créée
+        deltas.move(old_id, new_id, is_new=False)     # carte déplacée
+        deltas.add(category_id, is_new=True, sign=-1) # carte supprimée
+        statement = deltas.statement()
+        if statement is not None:
+            db.execute(statement)  # Session ou AsyncSession (await)
+    """
+
+    def __init__(self):
+        self.cards: Counter = Counter()
+        self.new: Counter = Counter()
+
+    def add(self, category_id: int, is_new: bool, sign: int = 1) -> None:
+        self.cards[category_id] += sign
+        if is_new:
+            self.new[category_id] += sign
+
+    def move(self, from_category_id: int, to_category_id: int, is_new: bool) -> None:
+        if from_category_id != to_category_id:
+            self.add(from_category_id, is_new, sign=-1)
+            self.add(to_category_id, is_new)
+
+    def leave_new(self, category_id: int) -> None:
+        # Première révision : la carte n'est plus "new"
+        self.new[category_id] -= 1
+
+    def statement(self):
+        """
+        Un seul UPDATE ... FROM (VALUES ...) pour toutes les catégories touchées
+
+        Returns:
+            Statement à exécuter, ou None s'il n'y a rien à changer
+        """
+        rows = [
+            (category_id, self.cards[category_id], self.new[category_id])
+            for category_id in sorted(set(self.cards) | set(self.new))  # Ordre fixe : pas de deadlock
+            if self.cards[category_id] or self.new[category_id]
+        ]
+        if not rows:
+            return None
+
+        deltas = values(
+            column("id", Integer),
+            column("cards", Integer),
+            column("new", Integer),
+            name="deltas",
+        ).data(rows)
+        return (
+            update(Category)
+            .where(Category.id == deltas.c.id)
+            .values(
+                card_count=Category.card_count + deltas.c.cards,
+                new_count=Category.new_count + deltas.c.new,
+                # Un compteur qui bouge ne rend pas la catégorie "modifiée" (delta sync)
+                updated_at=Category.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+def reconcile_category_counters(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Recalcule card_count / new_count depuis flashcards et corrige les écarts
+
+    Filet de sécurité (écritures hors API, bug, restauration partielle...) :
+    seules les catégories dont les compteurs sont faux sont mises à jour.
+
+    Args:
+        db: Session (commit fait par l'appelant)
+        user_id: Limiter à un user (None = toutes les catégories)
+
+    Returns:
+        Nombre de catégories corrigées
+    """
+    actual = (
+        select(
+            Category.id.label("id"),
+            func.count(FlashCard.id).label("cards"),
+            func.count(FlashCard.id).filter(FlashCard.state == STATE_NEW).label("new"),
+        )
+        .outerjoin(FlashCard, FlashCard.category_id == Category.id)
+        .group_by(Category.id)
+    )
+    if user_id is not None:
+        actual = actual.where(Category.user_id == user_id)
+    actual = actual.subquery("actual")
+
+    fixed_user_ids = db.execute(
+        update(Category)
+        .where(and_(
+            Category.id == actual.c.id,
+            or_(Category.card_count != actual.c.cards, Category.new_count != actual.c.new),
+        ))
+        .values(card_count=actual.c.cards, new_count=actual.c.new, updated_at=Category.updated_at)
+        .returning(Category.user_id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+    # Les listes de catégories de ces users ont changé (ETag)
+    for fixed_user_id in sorted(set(fixed_user_ids)):
+        db.execute(bump_revision(fixed_user_id))
+    return len(fixed_user_ids)
+
+
+def reconcile_counters_job(db: Session, job: Job, report: Callable) -> None:
+    """
+    reconcile_category_counters en tâche de fond (job JOB_RECONCILE_COUNTERS)
+
+    Args:
+        job: payload {"user_id": ...} ({} = toutes les catégories)
+    """
+    fixed = reconcile_category_counters(db, job.payload.get("user_id"))
+    report({"categories_fixed": fixed})
+    db.commit()
+
+
+def main() -> None:
+    """
+    Réparation des compteurs des catégories (à lancer en cron, ex: chaque nuit)
+
+    Usage:
+        python -m app.services.category_counters
+        python -m app.services.category_counters --user-id 42
+    """
+    parser = argparse.ArgumentParser(description="Reconcile categories.card_count / new_count")
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        fixed = reconcile_category_counters(db, args.user_id)
+        db.commit()
+    print(f"{fixed} categories fixed")
+
+
+if __name__ == "__main__":
+    main()
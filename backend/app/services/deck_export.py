@@ -0,0 +1,262 @@
+import csv
+import hashlib
+import html
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+import zipfile
+from datetime import datetime
+from typing import Callable, Dict, Iterator, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import Category, FlashCard
+
+EXPORT_FORMATS = ("csv", "jsonl", "apkg")
+
+# Content-Type et extension de chaque format
+EXPORT_MEDIA_TYPES = {
+    "csv": ("text/csv", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "apkg": ("application/octet-stream", "apkg"),
+}
+
+# Colonnes exportées, dans l'ordre (question, answer, category en premier :
+# un export CSV se réimporte tel quel via POST /api/import)
+EXPORT_COLUMNS = (
+    FlashCard.question,
+    FlashCard.answer,
+    Category.name.label("category"),
+    FlashCard.id,
+    FlashCard.category_id,
+    FlashCard.created_at,
+    FlashCard.updated_at,
+    FlashCard.state,
+    FlashCard.due_at,
+    FlashCard.interval_days,
+    FlashCard.stability,
+    FlashCard.difficulty,
+    FlashCard.reps,
+    FlashCard.lapses,
+    FlashCard.last_reviewed_at,
+)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_export_rows(db: Session, user_id: int, category_id: Optional[int], batch_size: int) -> Iterator:
+    """
+    Lit les flashcards du user avec un curseur serveur (yield_per)
+
+    PostgreSQL envoie les lignes par paquets de batch_size : le deck n'est
+    jamais chargé entièrement en mémoire.
+    """
+    query = (
+        select(*EXPORT_COLUMNS)
+        .join(Category, Category.id == FlashCard.category_id)
+        .where(FlashCard.user_id == user_id)
+        .order_by(FlashCard.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if category_id is not None:
+        query = query.where(FlashCard.category_id == category_id)
+    return iter(db.execute(query))
+
+
+def _format_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def stream_csv(rows: Iterator) -> Iterator[bytes]:
+    """
+    Encode les lignes en CSV, par blocs de ~64 Ko
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.key for column in EXPORT_COLUMNS])
+    for row in rows:
+        writer.writerow([_format_value(value) for value in row])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def stream_jsonl(rows: Iterator) -> Iterator[bytes]:
+    """
+    Encode les lignes en JSON Lines (un objet JSON par carte), par blocs de ~64 Ko
+    """
+    keys = [column.key for column in EXPORT_COLUMNS]
+    chunk = []
+    size = 0
+    for row in rows:
+        line = json.dumps(dict(zip(keys, map(_format_value, row))), ensure_ascii=False) + "\n"
+        chunk.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(chunk).encode("utf-8")
+            chunk = []
+            size = 0
+    yield "".join(chunk).encode("utf-8")
+
+
+# Schéma d'une collection Anki (format "legacy" anki2, lisible par toutes les versions)
+ANKI_SCHEMA = """
+CREATE TABLE col (
+    id integer PRIMARY KEY, crt integer NOT NULL, mod integer NOT NULL, scm integer NOT NULL,
+    ver integer NOT NULL, dty integer NOT NULL, usn integer NOT NULL, ls integer NOT NULL,
+    conf text NOT NULL, models text NOT NULL, decks text NOT NULL, dconf text NOT NULL, tags text NOT NULL
+);
+CREATE TABLE notes (
+    id integer PRIMARY KEY, guid text NOT NULL, mid integer NOT NULL, mod integer NOT NULL,
+    usn integer NOT NULL, tags text NOT NULL, flds text NOT NULL, sfld integer NOT NULL,
+    csum integer NOT NULL, flags integer NOT NULL, data text NOT NULL
+);
+CREATE TABLE cards (
+    id integer PRIMARY KEY, nid integer NOT NULL, did integer NOT NULL, ord integer NOT NULL,
+    mod integer NOT NULL, usn integer NOT NULL, type integer NOT NULL, queue integer NOT NULL,
+    due integer NOT NULL, ivl integer NOT NULL, factor integer NOT NULL, reps integer NOT NULL,
+    lapses integer NOT NULL, left integer NOT NULL, odue integer NOT NULL, odid integer NOT NULL,
+    flags integer NOT NULL, data text NOT NULL
+);
+CREATE TABLE revlog (
+    id integer PRIMARY KEY, cid integer NOT NULL, usn integer NOT NULL, ease integer NOT NULL,
+    ivl integer NOT NULL, lastIvl integer NOT NULL, factor integer NOT NULL, time integer NOT NULL,
+    type integer NOT NULL
+);
+CREATE TABLE graves (usn integer NOT NULL, oid integer NOT NULL, type integer NOT NULL);
+CREATE INDEX ix_notes_usn ON notes (usn);
+CREATE INDEX ix_cards_usn ON cards (usn);
+CREATE INDEX ix_revlog_usn ON revlog (usn);
+CREATE INDEX ix_cards_nid ON cards (nid);
+CREATE INDEX ix_cards_sched ON cards (did, queue, due);
+CREATE INDEX ix_revlog_cid ON revlog (cid);
+CREATE INDEX ix_notes_csum ON notes (csum);
+"""
+
+ANKI_MODEL_ID = 1342697561419
+ANKI_DECK_ID_OFFSET = 1_000_000_000
+
+
+def _anki_model(now: int) -> Dict:
+    # Type de note "Basic" (Front / Back)
+    field = {"sticky": False, "rtl": False, "font": "Arial", "size": 20, "media": []}
+    return {
+        "id": ANKI_MODEL_ID, "name": "Basic", "type": 0, "mod": now, "usn": -1, "sortf": 0,
+        "did": 1, "tags": [], "vers": [], "latexPre": "", "latexPost": "",
+        "css": ".card { font-family: arial; font-size: 20px; text-align: center; }",
+        "flds": [{**field, "name": "Front", "ord": 0}, {**field, "name": "Back", "ord": 1}],
+        "tmpls": [{
+            "name": "Card 1", "ord": 0, "did": None, "bqfmt": "", "bafmt": "",
+            "qfmt": "{{Front}}", "afmt": "{{FrontSide}}<hr id=answer>{{Back}}",
+        }],
+        "req": [[0, "all", [0]]],
+    }
+
+
+def _anki_deck(deck_id: int, name: str, now: int) -> Dict:
+    return {
+        "id": deck_id, "name": name, "mod": now, "usn": -1, "desc": "", "dyn": 0, "conf": 1,
+        "collapsed": False, "extendNew": 10, "extendRev": 50,
+        "newToday": [0, 0], "revToday": [0, 0], "lrnToday": [0, 0], "timeToday": [0, 0],
+    }
+
+
+def _anki_field(value: str) -> str:
+    return html.escape(value, quote=False).replace("\n", "<br>")
+
+
+def _anki_checksum(value: str) -> int:
+    return int(hashlib.sha1(value.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def build_apkg(rows: Iterator, path: str, batch_size: int) -> None:
+    """
+    Écrit un paquet Anki (.apkg) dans `path`
+
+    Les cartes sont insérées par batch dans une base SQLite temporaire
+    (sur disque), puis la base est compressée dans le zip : la mémoire
+    utilisée ne dépend pas de la taille du deck.
+    Une catégorie = un deck Anki, une carte = une note "Basic".
+    """
+    now = int(time.time())
+    decks = {"1": _anki_deck(1, "Default", now)}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_path = os.path.join(workdir, "collection.anki2")
+        collection = sqlite3.connect(database_path)
+        collection.executescript(ANKI_SCHEMA)
+
+        notes, cards = [], []
+        for row in rows:
+            deck_id = ANKI_DECK_ID_OFFSET + row.category_id
+            decks.setdefault(str(deck_id), _anki_deck(deck_id, row.category, now))
+            front = _anki_field(row.question)
+            notes.append((
+                row.id, uuid.uuid4().hex[:10], ANKI_MODEL_ID, now, -1, "",
+                front + "\x1f" + _anki_field(row.answer), front, _anki_checksum(row.question), 0, "",
+            ))
+            # Carte "nouvelle" (type 0, queue 0), due = position dans la file des nouvelles
+            cards.append((row.id, row.id, deck_id, 0, now, -1, 0, 0, row.id, 0, 0, 0, 0, 0, 0, 0, 0, ""))
+            if len(notes) >= batch_size:
+                collection.executemany("INSERT INTO notes VALUES (?,?,?,?,?,?,?,?,?,?,?)", notes)
+                collection.executemany("INSERT INTO cards VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)", cards)
+                notes, cards = [], []
+        if notes:
+            collection.executemany("INSERT INTO notes VALUES (?,?,?,?,?,?,?,?,?,?,?)", notes)
+            collection.executemany("INSERT INTO cards VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)", cards)
+
+        dconf = {"1": {"id": 1, "name": "Default", "mod": 0, "usn": 0, "maxTaken": 60, "autoplay": True,
+                       "timer": 0, "replayq": True, "dyn": False,
+                       "new": {"delays": [1, 10], "ints": [1, 4, 7], "initialFactor": 2500, "order": 1, "perDay": 20},
+                       "rev": {"perDay": 200, "ease4": 1.3, "fuzz": 0.05, "maxIvl": 36500, "hardFactor": 1.2},
+                       "lapse": {"delays": [10], "mult": 0, "minInt": 1, "leechFails": 8, "leechAction": 0}}}
+        collection.execute(
+            "INSERT INTO col VALUES (1, ?, ?, ?, 11, 0, 0, 0, ?, ?, ?, ?, '{}')",
+            (now, now * 1000, now * 1000, json.dumps({"nextPos": 1}),
+             json.dumps({str(ANKI_MODEL_ID): _anki_model(now)}), json.dumps(decks), json.dumps(dconf)),
+        )
+        collection.commit()
+        collection.close()
+
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.write(database_path, "collection.anki2")
+            archive.writestr("media", "{}")
+
+
+def stream_apkg(rows: Iterator, batch_size: int) -> Iterator[bytes]:
+    """
+    Construit le .apkg dans un fichier temporaire puis l'envoie par blocs
+    """
+    with tempfile.NamedTemporaryFile(suffix=".apkg") as package:
+        build_apkg(rows, package.name, batch_size)
+        package.seek(0)
+        while chunk := package.read(CHUNK_SIZE):
+            yield chunk
+
+
+def stream_export(
+    session_factory: Callable[[], Session],
+    user_id: int,
+    format: str,
+    category_id: Optional[int],
+    batch_size: int,
+) -> Iterator[bytes]:
+    """
+    Générateur du corps de la réponse d'export
+
+    Ouvre sa propre session : elle doit rester ouverte pendant tout le
+    streaming, après la fin de la fonction de la route.
+    """
+    with session_factory() as db:
+        rows = iter_export_rows(db, user_id, category_id, batch_size)
+        if format == "csv":
+            yield from stream_csv(rows)
+        elif format == "jsonl":
+            yield from stream_jsonl(rows)
+        else:
+            yield from stream_apkg(rows, batch_size)
@@ -0,0 +1,306 @@
+import codecs
+import csv
+import html
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import zipfile
+import zlib
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.revision import bump_revision
+from app.models import Category, FlashCard, Job
+from app.services.category_counters import CategoryCounterDeltas
+from app.services.jobs import JobFailed
+
+# (nom de catégorie ou None, question, answer)
+ImportRow = Tuple[Optional[str], str, str]
+
+IMPORT_FORMATS = ("csv", "tsv", "apkg")
+
+# Séparateur des champs d'une note Anki
+ANKI_FIELD_SEPARATOR = "\x1f"
+
+_BR_RE = re.compile(r"<br\s*/?>|</div>|</p>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+class DeckImportError(ValueError):
+    """Fichier d'import invalide (format inconnu, archive corrompue...)"""
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    """
+    Devine le format d'après l'extension du fichier (.apkg, .csv, .tsv/.txt)
+    """
+    if not filename:
+        return None
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension in ("tsv", "txt"):
+        return "tsv"
+    return extension if extension in IMPORT_FORMATS else None
+
+
+def _clean_anki_field(value: str) -> str:
+    # Les champs Anki sont du HTML : on garde le texte (et les retours à la ligne)
+    value = _BR_RE.sub("\n", value)
+    value = _TAG_RE.sub("", value)
+    return html.unescape(value).strip()
+
+
+def _decode_lines(file: BinaryIO) -> Iterator[str]:
+    # Décodage ligne par ligne (pas par blocs) : numéro de ligne exact en cas d'erreur
+    for line_number, line in enumerate(file, start=1):
+        if line_number == 1 and line.startswith(codecs.BOM_UTF8):
+            line = line[len(codecs.BOM_UTF8):]
+        try:
+            yield line.decode("utf-8")
+        except UnicodeDecodeError:
+            raise DeckImportError(f"Invalid file encoding at line {line_number} (expected UTF-8)")
+
+
+def iter_delimited_rows(file: BinaryIO, delimiter: str) -> Iterator[Optional[ImportRow]]:
+    """
+    Lit un CSV/TSV ligne par ligne (question, answer[, category])
+
+    Une ligne d'en-tête "question,answer,..." est ignorée.
+    Yield None pour une ligne invalide (comptée comme ignorée).
+
+    Raises:
+        DeckImportError: Fichier non UTF-8 ou CSV illisible (champ trop long...)
+    """
+    reader = csv.reader(_decode_lines(file), delimiter=delimiter)
+    try:
+        for line_number, row in enumerate(reader):
+            if line_number == 0 and [cell.strip().lower() for cell in row[:2]] == ["question", "answer"]:
+                continue
+            if len(row) < 2 or not row[0].strip() or not row[1].strip():
+                yield None
+                continue
+            category = row[2].strip() if len(row) > 2 and row[2].strip() else None
+            yield category, row[0].strip(), row[1].strip()
+    except csv.Error as e:
+        raise DeckImportError(f"Invalid CSV at line {reader.line_num}: {e}")
+
+
+def _anki_deck_names(collection: sqlite3.Connection) -> Dict[int, str]:
+    tables = {row[0] for row in collection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if "decks" in tables:
+        # Schéma Anki récent (2.1.28+) : une table decks
+        return {deck_id: name.replace(ANKI_FIELD_SEPARATOR, "::")
+                for deck_id, name in collection.execute("SELECT id, name FROM decks")}
+    (decks_json,) = collection.execute("SELECT decks FROM col").fetchone()
+    return {int(deck_id): deck["name"] for deck_id, deck in json.loads(decks_json).items()}
+
+
+def _extract_member(archive: zipfile.ZipFile, member: str, target: BinaryIO) -> None:
+    """
+    Décompresse un membre du zip dans target, par blocs, sans dépasser
+    IMPORT_MAX_APKG_COLLECTION_MB (taille annoncée vérifiée avant, taille
+    réelle pendant : l'en-tête du zip peut mentir)
+
+    Raises:
+        DeckImportError: Membre trop gros ou corrompu
+    """
+    max_bytes = settings.IMPORT_MAX_APKG_COLLECTION_MB * 1024 * 1024
+    too_large = DeckImportError(
+        f"Anki collection too large (max {settings.IMPORT_MAX_APKG_COLLECTION_MB} MB uncompressed)"
+    )
+    if archive.getinfo(member).file_size > max_bytes:
+        raise too_large
+
+    written = 0
+    try:
+        with archive.open(member) as source:
+            while chunk := source.read(1024 * 1024):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise too_large
+                target.write(chunk)
+    except (zipfile.BadZipFile, zlib.error, EOFError):
+        raise DeckImportError("Invalid .apkg file (corrupt archive)")
+
+
+def iter_apkg_rows(file: BinaryIO) -> Iterator[Optional[ImportRow]]:
+    """
+    Lit les notes d'un paquet Anki (.apkg = zip contenant une base SQLite)
+
+    La base est extraite par blocs dans un fichier temporaire (SQLite a
+    besoin d'un fichier), puis les notes sont lues avec un curseur : la
+    mémoire utilisée ne dépend pas de la taille du deck.
+
+    Question = 1er champ de la note, answer = 2e champ, catégorie = deck.
+    """
+    try:
+        archive = zipfile.ZipFile(file)
+    except zipfile.BadZipFile:
+        raise DeckImportError("Invalid .apkg file (not a zip archive)")
+
+    names = set(archive.namelist())
+    member = next((name for name in ("collection.anki21", "collection.anki2") if name in names), None)
+    if member is None:
+        raise DeckImportError("Unsupported .apkg file (no collection.anki2/anki21, export with 'legacy' format)")
+
+    with tempfile.NamedTemporaryFile(suffix=".anki2") as database_file:
+        _extract_member(archive, member, database_file)
+        database_file.flush()
+
+        collection = sqlite3.connect(database_file.name)
+        try:
+            decks = _anki_deck_names(collection)
+            cursor = collection.execute(
+                "SELECT notes.flds, MIN(cards.did) FROM notes "
+                "JOIN cards ON cards.nid = notes.id GROUP BY notes.id ORDER BY notes.id"
+            )
+            for fields, deck_id in cursor:
+                parts = fields.split(ANKI_FIELD_SEPARATOR)
+                question = _clean_anki_field(parts[0]) if parts else ""
+                answer = _clean_anki_field(parts[1]) if len(parts) > 1 else ""
+                if not question or not answer:
+                    yield None
+                    continue
+                yield decks.get(deck_id), question, answer
+        except sqlite3.DatabaseError:
+            raise DeckImportError("Invalid .apkg file (corrupted collection)")
+        finally:
+            collection.close()
+
+
+def iter_import_rows(file: BinaryIO, format: str) -> Iterator[Optional[ImportRow]]:
+    """
+    Parse un fichier d'import de manière incrémentale selon son format
+    """
+    if format == "apkg":
+        return iter_apkg_rows(file)
+    if format == "csv":
+        return iter_delimited_rows(file, ",")
+    if format == "tsv":
+        return iter_delimited_rows(file, "\t")
+    raise DeckImportError(f"Unsupported import format: {format}")
+
+
+class DeckImporter:
+    """
+    Insère les lignes d'un import en batch dans la session (sans commit)
+
+    Les catégories du user sont chargées une fois ; celles qui manquent sont
+    créées à la volée. Les flashcards sont insérées par INSERT multi-lignes
+    de batch_size lignes : ~1 requête pour batch_size cartes au lieu de 3
+    requêtes par carte via POST /api/flashcards.
+
+    Usage:
+        importer = DeckImporter(db, user_id, default_category="Imported")
+        result = importer.run(iter_import_rows(file, "csv"))
+        db.commit()
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        user_id: int,
+        default_category: str = "Imported",
+        default_category_id: Optional[int] = None,
+        batch_size: int = 1000,
+        on_progress: Optional[Callable[[Dict], None]] = None,
+    ):
+        self.db = db
+        self.user_id = user_id
+        self.default_category = default_category
+        self.default_category_id = default_category_id
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+        self.categories: Dict[str, int] = {}
+        self.result = {"cards_imported": 0, "categories_created": 0, "rows_skipped": 0}
+
+    def run(self, rows: Iterator[Optional[ImportRow]]) -> Dict:
+        self.categories = dict(
+            self.db.execute(
+                select(Category.name, Category.id).where(Category.user_id == self.user_id)
+            ).all()
+        )
+
+        batch: List[Dict] = []
+        for row in rows:
+            if row is None:
+                self.result["rows_skipped"] += 1
+                continue
+            category_name, question, answer = row
+            batch.append({
+                "question": question,
+                "answer": answer,
+                "category_id": self._category_id(category_name),
+                "user_id": self.user_id,
+            })
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+
+        if batch:
+            self._flush(batch)
+        return self.result
+
+    def _category_id(self, name: Optional[str]) -> int:
+        if name is None:
+            if self.default_category_id is not None:
+                return self.default_category_id
+            name = self.default_category
+
+        category_id = self.categories.get(name)
+        if category_id is None:
+            category_id = self.db.execute(
+                insert(Category).values(name=name, user_id=self.user_id).returning(Category.id)
+            ).scalar_one()
+            self.categories[name] = category_id
+            self.result["categories_created"] += 1
+        return category_id
+
+    def _flush(self, batch: List[Dict]) -> None:
+        # executemany → INSERT ... VALUES (...), (...), ... (insertmanyvalues)
+        self.db.execute(insert(FlashCard), batch)
+        # Compteurs des catégories (même transaction que les cartes)
+        deltas = CategoryCounterDeltas()
+        for flashcard in batch:
+            deltas.add(flashcard["category_id"], is_new=True)
+        self.db.execute(deltas.statement())
+        self.result["cards_imported"] += len(batch)
+        if self.on_progress is not None:
+            self.on_progress(dict(self.result))
+
+
+def import_deck_job(db: Session, job: Job, report: Callable) -> None:
+    """
+    Import d'un fichier déposé par POST /api/import?background=true (job JOB_IMPORT_DECK)
+
+    Même import tout ou rien que la route synchrone. Le fichier est supprimé
+    après le succès, un fichier invalide (pas de nouvel essai) ou le dernier essai.
+
+    Args:
+        job: payload {"path": ..., "format": "csv", "category_id": null}
+        report: Enregistre la progression du job (visible tout de suite)
+    """
+    path = job.payload["path"]
+    done = False
+    try:
+        importer = DeckImporter(
+            db,
+            job.user_id,
+            default_category_id=job.payload.get("category_id"),
+            batch_size=settings.IMPORT_BATCH_SIZE,
+            on_progress=report,
+        )
+        with open(path, "rb") as file:
+            result = importer.run(iter_import_rows(file, job.payload["format"]))
+        db.execute(bump_revision(job.user_id))
+        report({"format": job.payload["format"], **result})
+        db.commit()
+        done = True
+    except DeckImportError as e:
+        done = True
+        raise JobFailed(str(e)) from e
+    finally:
+        if done or job.attempts >= job.max_attempts:
+            os.remove(path)
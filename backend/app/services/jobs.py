@@ -0,0 +1,338 @@
+import importlib
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional
+from fastapi import BackgroundTasks
+from sqlalchemy import case, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.models import Job
+from app.models.job import (
+    JOB_DELETE_CATEGORY, JOB_DELETE_USER, JOB_IMPORT_DECK, JOB_OPTIMIZE_SCHEDULER, JOB_PRUNE_JOBS,
+    JOB_RECONCILE_COUNTERS, JOB_REFRESH_STATS, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED,
+)
+
+logger = logging.getLogger(__name__)
+
+# Fonction exécutée pour chaque type de job : handler(db, job, report)
+# Importée à la première exécution : l'API ne charge ni NumPy (optimiseur) ni le code des jobs
+JOB_HANDLERS = {
+    JOB_DELETE_USER: "app.services.bulk_delete:delete_user_in_batches",
+    JOB_DELETE_CATEGORY: "app.services.bulk_delete:delete_category_in_batches",
+    JOB_IMPORT_DECK: "app.services.deck_import:import_deck_job",
+    JOB_RECONCILE_COUNTERS: "app.services.category_counters:reconcile_counters_job",
+    JOB_OPTIMIZE_SCHEDULER: "app.scheduling.optimizer:optimize_scheduler_job",
+    JOB_REFRESH_STATS: "app.services.stats:refresh_stats_job",
+    JOB_PRUNE_JOBS: "app.services.jobs:prune_jobs_job",
+}
+
+# Plafond du backoff entre deux essais
+MAX_RETRY_DELAY = timedelta(hours=1)
+
+# Fréquence du nettoyage des jobs terminés (JOB_RETENTION_DAYS)
+PRUNE_JOBS_INTERVAL = timedelta(hours=1)
+
+
+class JobFailed(Exception):
+    """
+    Échec définitif (ex: fichier d'import invalide) : le job n'est pas réessayé
+    """
+    pass
+
+
+def _handler(kind: str):
+    module, name = JOB_HANDLERS[kind].split(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _new_job(user_id: Optional[int], kind: str, payload: dict) -> Job:
+    return Job(user_id=user_id, kind=kind, payload=payload, progress={}, max_attempts=settings.JOB_MAX_ATTEMPTS)
+
+
+async def find_active_job(db: AsyncSession, user_id: Optional[int], kind: str, payload: dict) -> Optional[Job]:
+    """
+    Job du même type et sur la même cible, pas encore terminé (évite les doublons)
+    """
+    return (await db.execute(
+        select(Job).where(
+            Job.user_id == user_id,
+            Job.kind == kind,
+            Job.payload.contains(payload),
+            Job.status.in_([JOB_QUEUED, JOB_RUNNING]),
+        )
+    )).scalars().first()
+
+
+async def submit_job(
+    db: AsyncSession,
+    background_tasks: BackgroundTasks,
+    user_id: Optional[int],
+    kind: str,
+    payload: dict,
+) -> Job:
+    """
+    Met un job en file d'attente (exécuté par un worker : python -m app.worker)
+
+    Si le même job est déjà en attente ou en cours, le renvoie au lieu d'en
+    créer un second. Avec JOB_RUN_IN_APP (dev sans worker), le job est
+    exécuté par l'API après l'envoi de la réponse HTTP.
+
+    Ne commit pas : l'appelant commit une fois, avec ses propres écritures
+    (le job n'est visible des workers qu'à ce commit).
+    """
+    job = await find_active_job(db, user_id, kind, payload)
+    if job is not None:
+        return job
+
+    job = _new_job(user_id, kind, payload)
+    db.add(job)
+    await db.flush()  # id (Location) ; défauts des autres colonnes posés côté Python
+    if settings.JOB_RUN_IN_APP:
+        background_tasks.add_task(run_job, job.id)
+    return job
+
+
+def enqueue_job(
+    db: Session,
+    user_id: Optional[int],
+    kind: str,
+    payload: dict,
+    background_tasks: Optional[BackgroundTasks] = None,
+) -> Job:
+    """
+    Version synchrone de submit_job, sans dédoublonnage (routes sync, CLI, cron)
+    """
+    job = _new_job(user_id, kind, payload)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    if settings.JOB_RUN_IN_APP and background_tasks is not None:
+        background_tasks.add_task(run_job, job.id)
+    return job
+
+
+def enqueue_periodic_job(db: Session, kind: str, interval: timedelta) -> Optional[Job]:
+    """
+    Met en file un job de maintenance (sans user) s'il n'a pas tourné depuis `interval`
+
+    Appelé régulièrement par chaque worker : rien n'est ajouté si un job du
+    même type est déjà en attente, en cours ou créé depuis moins de `interval`.
+    Vérification et insertion sous un verrou advisory (transaction) : deux
+    workers au même moment ne créent pas chacun leur job.
+
+    Returns:
+        Job créé, ou None
+    """
+    db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"periodic_job:{kind}"))))
+    recent = db.execute(
+        select(Job.id)
+        .where(
+            Job.user_id.is_(None),
+            Job.kind == kind,
+            or_(Job.status.in_([JOB_QUEUED, JOB_RUNNING]), Job.created_at >= datetime.utcnow() - interval),
+        )
+        .limit(1)
+    ).first()
+    if recent is not None:
+        db.rollback()  # Libère le verrou
+        return None
+    return enqueue_job(db, None, kind, {})  # Commit : libère le verrou
+
+
+def prune_finished_jobs(db: Session, older_than: timedelta) -> int:
+    """
+    Supprime les jobs terminés ("succeeded" / "failed") depuis plus de `older_than`
+
+    Par batches de DELETE_BATCH_SIZE (un commit chacun) : pas de longue
+    transaction sur la file.
+
+    Returns:
+        Nombre de jobs supprimés
+    """
+    finished = select(Job.id).where(
+        Job.status.in_([JOB_SUCCEEDED, JOB_FAILED]),
+        Job.finished_at < datetime.utcnow() - older_than,
+    )
+    deleted = 0
+    while True:
+        batch = db.execute(
+            delete(Job)
+            .where(Job.id.in_(finished.limit(settings.DELETE_BATCH_SIZE)))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        deleted += batch
+        if batch < settings.DELETE_BATCH_SIZE:
+            return deleted
+
+
+def prune_jobs_job(db: Session, job: Job, report: Callable) -> None:
+    """
+    prune_finished_jobs en tâche de fond (job JOB_PRUNE_JOBS)
+
+    Mis en file toutes les heures par les workers si JOB_RETENTION_DAYS > 0.
+    """
+    report({"jobs": prune_finished_jobs(db, timedelta(days=settings.JOB_RETENTION_DAYS))})
+
+
+def claim_job(db: Session, worker_id: str, job_id: Optional[int] = None) -> Optional[int]:
+    """
+    Prend le prochain job prêt de la file (ou le job job_id s'il est prêt)
+
+    SELECT ... FOR UPDATE SKIP LOCKED : plusieurs workers prennent des jobs
+    en parallèle sans se bloquer ni prendre deux fois le même.
+
+    Returns:
+        Id du job, passé à "running" (None si la file est vide)
+    """
+    now = datetime.utcnow()
+    candidate = select(Job.id).where(Job.status == JOB_QUEUED, Job.run_after <= now)
+    if job_id is not None:
+        candidate = candidate.where(Job.id == job_id)
+    candidate = (
+        candidate.order_by(Job.run_after, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+
+    claimed = db.execute(
+        update(Job)
+        .where(Job.id == candidate)
+        .values(
+            status=JOB_RUNNING,
+            started_at=now,
+            attempts=Job.attempts + 1,
+            locked_by=worker_id,
+            heartbeat_at=now,
+        )
+        .returning(Job.id)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    db.commit()
+    return claimed
+
+
+def _save_progress(job_id: int, progress: dict) -> None:
+    # Connexion à part : progression visible tout de suite, même pendant
+    # une longue transaction du handler (import tout ou rien)
+    with engine.begin() as conn:
+        conn.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JOB_RUNNING)
+            .values(progress=progress, heartbeat_at=datetime.utcnow())
+        )
+
+
+def _finish(db: Session, job_id: int, worker_id: str, **values) -> None:
+    # Sans effet si le job a été remis en file entre-temps (worker jugé mort)
+    db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JOB_RUNNING, Job.locked_by == worker_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def _fail(db: Session, job_id: int, worker_id: str, error: str, retry: bool) -> None:
+    """
+    Nouvel essai après backoff exponentiel, ou échec définitif si plus d'essai
+    """
+    attempts, max_attempts = db.execute(
+        select(Job.attempts, Job.max_attempts).where(Job.id == job_id)
+    ).one()
+    now = datetime.utcnow()
+
+    if retry and attempts < max_attempts:
+        delay = min(timedelta(seconds=settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)), MAX_RETRY_DELAY)
+        _finish(db, job_id, worker_id, status=JOB_QUEUED, run_after=now + delay, locked_by=None, error=error)
+    else:
+        _finish(db, job_id, worker_id, status=JOB_FAILED, finished_at=now, error=error)
+
+
+def execute_job(job_id: int, worker_id: str) -> None:
+    """
+    Exécute un job déjà pris par claim_job (thread ou process du worker)
+
+    Une exception du handler remet le job en file (JOB_MAX_ATTEMPTS essais,
+    backoff doublé à chaque fois) ; JobFailed le marque tout de suite "failed".
+    """
+    with SessionLocal() as db:
+        job = db.get(Job, job_id)
+        kind = job.kind
+
+        def report(progress: dict) -> None:
+            _save_progress(job_id, progress)
+
+        try:
+            _handler(kind)(db, job, report)
+        except Exception as exc:
+            retry = not isinstance(exc, JobFailed)
+            logger.exception("Job %s (%s) failed%s", job_id, kind, ", will retry" if retry else "")
+            db.rollback()
+            _fail(db, job_id, worker_id, str(exc), retry)
+        else:
+            _finish(db, job_id, worker_id, status=JOB_SUCCEEDED, finished_at=datetime.utcnow(), error=None)
+
+
+def run_job(job_id: int) -> None:
+    """
+    Exécute un job dans l'API, après la réponse (JOB_RUN_IN_APP)
+
+    Le job n'est pris que s'il est encore en attente : un worker qui
+    tournerait quand même ne l'exécute pas une seconde fois.
+    """
+    with SessionLocal() as db:
+        claimed = claim_job(db, "app", job_id)
+    if claimed is not None:
+        execute_job(claimed, "app")
+
+
+def heartbeat(db: Session, job_ids: Iterable[int], worker_id: str) -> None:
+    """
+    Signale que les jobs en cours du worker sont toujours vivants
+    """
+    job_ids = list(job_ids)
+    if not job_ids:
+        return
+    db.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.status == JOB_RUNNING, Job.locked_by == worker_id)
+        .values(heartbeat_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def requeue_stale_jobs(db: Session) -> int:
+    """
+    Remet en file les jobs "running" sans heartbeat depuis JOB_STALE_SECONDS
+
+    Worker tué (OOM, déploiement...) : ses jobs repartent sur un autre
+    worker, ou passent "failed" s'ils ont épuisé leurs essais.
+
+    Returns:
+        Nombre de jobs remis en file ou en échec
+    """
+    now = datetime.utcnow()
+    exhausted = Job.attempts >= Job.max_attempts
+    stale = db.execute(
+        update(Job)
+        .where(Job.status == JOB_RUNNING, Job.heartbeat_at < now - timedelta(seconds=settings.JOB_STALE_SECONDS))
+        .values(
+            status=case((exhausted, JOB_FAILED), else_=JOB_QUEUED),
+            finished_at=case((exhausted, now), else_=None),
+            run_after=now,
+            locked_by=None,
+            error="Worker lost",
+        )
+        .returning(Job.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+    for job_id in stale:
+        logger.warning("Job %s: worker lost, requeued", job_id)
+    return len(stale)
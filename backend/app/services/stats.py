@@ -0,0 +1,164 @@
+import argparse
+from collections import defaultdict
+from typing import Callable, Dict, Optional
+from sqlalchemy import BigInteger, Date, cast, delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models import DailyReviewStats, Job, ReviewLog
+from app.scheduling import AGAIN, STATE_NEW, STATE_REVIEW
+
+# Jours couverts par la prévision des cartes dues
+FORECAST_DAYS = 30
+
+# Vues matérialisées rafraîchies par le job refresh_stats (voir app/models/stats.py)
+STATS_VIEWS = ("due_forecast_stats", "category_maturity_stats")
+
+# Colonnes de daily_review_stats additionnées à chaque révision
+STATS_COLUMNS = ("reviews", "new_cards", "again", "review_reviews", "review_passed", "elapsed_ms")
+
+
+class ReviewStatsDeltas:
+    """
+    Révisions à ajouter à daily_review_stats, dans la transaction qui écrit
+    les review logs correspondants
+
+    Usage:
+        deltas = ReviewStatsDeltas()
+        for row in review_log_rows:
+            deltas.add(row)
+        statement = deltas.statement()
+        if statement is not None:
+            db.execute(statement)
+    """
+
+    def __init__(self):
+        self.days: Dict = defaultdict(lambda: dict.fromkeys(STATS_COLUMNS, 0))
+
+    def add(self, row: Dict) -> None:
+        """
+        Args:
+            row: Review log (reviewed_at, user_id, rating, state avant la révision, elapsed_ms)
+        """
+        stats = self.days[(row["user_id"], row["reviewed_at"].date())]
+        stats["reviews"] += 1
+        stats["new_cards"] += row["state"] == STATE_NEW
+        stats["again"] += row["rating"] == AGAIN
+        if row["state"] == STATE_REVIEW:
+            stats["review_reviews"] += 1
+            stats["review_passed"] += row["rating"] != AGAIN
+        stats["elapsed_ms"] += row.get("elapsed_ms") or 0
+
+    def statement(self):
+        """
+        Un seul INSERT ... ON CONFLICT DO UPDATE pour tous les (user, jour) touchés
+
+        Returns:
+            Statement à exécuter, ou None s'il n'y a rien à ajouter
+        """
+        if not self.days:
+            return None
+        rows = [
+            {"user_id": user_id, "day": day, **stats}
+            for (user_id, day), stats in sorted(self.days.items())  # Ordre fixe : pas de deadlock
+        ]
+        statement = pg_insert(DailyReviewStats).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=[DailyReviewStats.user_id, DailyReviewStats.day],
+            set_={
+                name: getattr(DailyReviewStats, name) + getattr(statement.excluded, name)
+                for name in STATS_COLUMNS
+            },
+        )
+
+
+def rebuild_daily_review_stats(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Recalcule daily_review_stats depuis review_logs
+
+    Filet de sécurité (review logs écrits hors du writer, restauration...).
+    Attention : les jours des partitions déjà détachées sont perdus.
+
+    Args:
+        db: Session (commit fait par l'appelant)
+        user_id: Limiter à un user (None = tous)
+
+    Returns:
+        Nombre de lignes (user, jour) écrites
+    """
+    day = cast(ReviewLog.reviewed_at, Date)
+    in_review = ReviewLog.state == STATE_REVIEW
+    source = (
+        select(
+            ReviewLog.user_id,
+            day,
+            func.count(),
+            func.count().filter(ReviewLog.state == STATE_NEW),
+            func.count().filter(ReviewLog.rating == AGAIN),
+            func.count().filter(in_review),
+            func.count().filter(in_review, ReviewLog.rating != AGAIN),
+            cast(func.coalesce(func.sum(ReviewLog.elapsed_ms), 0), BigInteger),
+        )
+        .group_by(ReviewLog.user_id, day)
+    )
+    existing = delete(DailyReviewStats)
+    if user_id is not None:
+        source = source.where(ReviewLog.user_id == user_id)
+        existing = existing.where(DailyReviewStats.user_id == user_id)
+
+    db.execute(existing)
+    return db.execute(
+        insert(DailyReviewStats).from_select(["user_id", "day", *STATS_COLUMNS], source)
+    ).rowcount
+
+
+def refresh_stats_views(db: Session) -> None:
+    """
+    Rafraîchit les vues matérialisées de GET /api/stats
+
+    CONCURRENTLY : les lectures continuent sur l'ancienne version pendant le
+    recalcul. Un commit par vue : les verrous ne s'additionnent pas.
+    """
+    for view in STATS_VIEWS:
+        db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+        db.commit()
+
+
+def refresh_stats_job(db: Session, job: Job, report: Callable) -> None:
+    """
+    refresh_stats_views en tâche de fond (job JOB_REFRESH_STATS)
+
+    Mis en file toutes les STATS_REFRESH_INTERVAL_SECONDS par les workers.
+    """
+    refresh_stats_views(db)
+    report({"views": list(STATS_VIEWS)})
+
+
+def main() -> None:
+    """
+    Maintenance des statistiques d'étude
+
+    Usage:
+        python -m app.services.stats refresh                 # vues matérialisées
+        python -m app.services.stats rebuild                 # daily_review_stats depuis review_logs
+        python -m app.services.stats rebuild --user-id 42
+    """
+    parser = argparse.ArgumentParser(description="Study statistics maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("refresh", help="Refresh the due forecast and maturity materialized views")
+    rebuild = subparsers.add_parser("rebuild", help="Rebuild daily_review_stats from review_logs")
+    rebuild.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if args.command == "refresh":
+            refresh_stats_views(db)
+            print(f"Refreshed {', '.join(STATS_VIEWS)}")
+        else:
+            rows = rebuild_daily_review_stats(db, args.user_id)
+            db.commit()
+            print(f"{rows} daily rows rebuilt")
+
+
+if __name__ == "__main__":
+    main()
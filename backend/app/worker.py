@@ -0,0 +1,133 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import timedelta
+from typing import Dict
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.job import JOB_PRUNE_JOBS, JOB_REFRESH_STATS
+from app.services.jobs import (
+    JOB_HANDLERS, PRUNE_JOBS_INTERVAL, claim_job, enqueue_job, enqueue_periodic_job, execute_job, heartbeat,
+    requeue_stale_jobs,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _create_pool(pool: str, concurrency: int) -> Executor:
+    if pool == "process":
+        # spawn : les process ne héritent ni des threads ni des connexions DB du worker
+        return ProcessPoolExecutor(max_workers=concurrency, mp_context=multiprocessing.get_context("spawn"))
+    return ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="job")
+
+
+def run_worker(concurrency: int, pool: str, poll_interval: float, burst: bool = False) -> None:
+    """
+    Boucle du worker : prend les jobs de la file et les exécute dans le pool
+
+    Le process principal fait tout le travail de file (claim, heartbeat des
+    jobs en cours, reprise des jobs des workers morts, jobs périodiques) ;
+    le pool n'exécute que les handlers. SIGTERM / SIGINT : plus aucun job
+    pris, les jobs en cours se terminent avant la sortie.
+
+    Args:
+        burst: Sortir dès que la file est vide (cron, tests)
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"[:64]
+    stop = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stop.set())
+
+    # Heartbeat bien plus fréquent que le délai au-delà duquel un job est repris
+    heartbeat_interval = settings.JOB_STALE_SECONDS / 4
+    last_heartbeat = 0.0
+    running: Dict[Future, int] = {}
+    executor = _create_pool(pool, concurrency)
+    logger.info("Worker %s started (%s pool, concurrency %s)", worker_id, pool, concurrency)
+
+    try:
+        while not stop.is_set():
+            with SessionLocal() as db:
+                if time.monotonic() - last_heartbeat >= heartbeat_interval:
+                    heartbeat(db, running.values(), worker_id)
+                    requeue_stale_jobs(db)
+                    if settings.STATS_REFRESH_INTERVAL_SECONDS and not burst:
+                        enqueue_periodic_job(
+                            db, JOB_REFRESH_STATS, timedelta(seconds=settings.STATS_REFRESH_INTERVAL_SECONDS),
+                        )
+                    if settings.JOB_RETENTION_DAYS and not burst:
+                        enqueue_periodic_job(db, JOB_PRUNE_JOBS, PRUNE_JOBS_INTERVAL)
+                    last_heartbeat = time.monotonic()
+
+                while len(running) < concurrency and not stop.is_set():
+                    job_id = claim_job(db, worker_id)
+                    if job_id is None:
+                        break
+                    logger.info("Job %s started", job_id)
+                    running[executor.submit(execute_job, job_id, worker_id)] = job_id
+
+            if not running:
+                if burst:
+                    break
+                stop.wait(poll_interval)
+                continue
+
+            # Un job terminé libère une place ; sinon nouveau tour après poll_interval
+            done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in done:
+                job_id = running.pop(future)
+                if future.exception() is not None:
+                    # Erreur hors handler (DB indisponible...) : le job sera repris après JOB_STALE_SECONDS
+                    logger.error("Job %s crashed: %r", job_id, future.exception())
+                else:
+                    logger.info("Job %s finished", job_id)
+    finally:
+        executor.shutdown(wait=True)
+        logger.info("Worker %s stopped", worker_id)
+
+
+def main() -> None:
+    """
+    Worker de la file de jobs (suppressions, imports, compteurs, optimiseur FSRS, statistiques, nettoyage)
+
+    Autant de workers que voulu, sur une ou plusieurs machines : la file est
+    la table jobs (PostgreSQL), sans broker.
+
+    Usage:
+        python -m app.worker                                  # boucle (service `worker`)
+        python -m app.worker --concurrency 4 --pool process
+        python -m app.worker --burst                          # vide la file puis sort
+        python -m app.worker enqueue reconcile_counters       # en cron
+        python -m app.worker enqueue optimize_scheduler --payload '{"user_id": 1}' --user-id 1
+    """
+    parser = argparse.ArgumentParser(description="Run background jobs from the jobs table")
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY)
+    parser.add_argument("--pool", choices=["thread", "process"], default=settings.JOB_WORKER_POOL)
+    parser.add_argument("--burst", action="store_true", help="Exit when the queue is empty")
+    subparsers = parser.add_subparsers(dest="command")
+    enqueue = subparsers.add_parser("enqueue", help="Queue a job and exit")
+    enqueue.add_argument("kind", choices=sorted(JOB_HANDLERS))
+    enqueue.add_argument("--payload", type=json.loads, default={}, help="JSON payload")
+    enqueue.add_argument("--user-id", type=int, default=None, help="Job owner (can read it via the API)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.command == "enqueue":
+        with SessionLocal() as db:
+            job = enqueue_job(db, args.user_id, args.kind, args.payload)
+        print(f"Job {job.id} queued")
+        return
+
+    run_worker(args.concurrency, args.pool, settings.JOB_POLL_INTERVAL_SECONDS, args.burst)
+
+
+if __name__ == "__main__":
+    main()
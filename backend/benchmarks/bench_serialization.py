@@ -0,0 +1,93 @@
+"""
+Benchmark de sérialisation d'une page de flashcards (GET /api/flashcards)
+
+Compare, par carte :
+    before: dict(row._mapping) par ligne → validation FlashCardPage (Pydantic)
+            → dump JSON Pydantic → json.dumps (pipeline FastAPI par défaut)
+    after:  tuples + clés calculées une fois → orjson.dumps, sans revalidation
+            (app/core/responses.py)
+
+Pas besoin de DB : les lignes sont des Row SQLAlchemy construites en mémoire.
+
+Usage (depuis backend/):
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --sizes 100 10000 --repeat 5
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+from app.core.responses import rows_to_dicts
+from app.schemas import FlashCardPage
+
+KEYS = ("id", "question", "answer", "category_id", "category_name", "user_id", "created_at", "updated_at")
+
+
+def make_rows(count: int) -> List:
+    """
+    Lignes avec la forme de FLASHCARD_COLUMNS (Row SQLAlchemy, comme db.execute)
+    """
+    now = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    data = [
+        (
+            i,
+            f"Question {i} : qu'est-ce que FastAPI ?",
+            f"Réponse {i} : un framework web Python, rapide et typé.",
+            i % 20 + 1,
+            f"Catégorie {i % 20 + 1}",
+            1,
+            now + timedelta(seconds=i),
+            now + timedelta(seconds=i, microseconds=7),
+        )
+        for i in range(count)
+    ]
+    return IteratorResult(SimpleResultMetaData(KEYS), iter(data)).all()
+
+
+page_adapter = TypeAdapter(FlashCardPage)
+
+
+def serialize_before(rows: List) -> bytes:
+    content = {"items": [dict(row._mapping) for row in rows], "next_cursor": None}
+    validated = page_adapter.validate_python(content)
+    data = page_adapter.dump_python(validated, mode="json")
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def serialize_after(rows: List) -> bytes:
+    return orjson.dumps({"items": rows_to_dicts(KEYS, rows), "next_cursor": None})
+
+
+def best_time(function: Callable, rows: List, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Flashcard page serialization benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    # Même contenu JSON des deux côtés
+    sample = make_rows(3)
+    assert json.loads(serialize_before(sample)) == json.loads(serialize_after(sample))
+
+    print(f"{'cards':>8} {'before µs/card':>15} {'after µs/card':>14} {'speedup':>8}")
+    for size in args.sizes:
+        rows = make_rows(size)
+        before = best_time(serialize_before, rows, args.repeat) / size * 1e6
+        after = best_time(serialize_after, rows, args.repeat) / size * 1e6
+        print(f"{size:>8} {before:>15.2f} {after:>14.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
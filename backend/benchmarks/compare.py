@@ -0,0 +1,62 @@
+"""
+Compare deux résultats de benchmarks/loadtest.py (ex: avant / après un commit)
+
+Affiche, par scénario et concurrence : débit, p50, p99 et requêtes SQL par
+requête, avec l'écart relatif. Les écarts au-delà de --threshold sont marqués.
+
+Usage (depuis backend/):
+    python -m benchmarks.compare benchmarks/results/<avant>.json benchmarks/results/<après>.json
+"""
+import argparse
+import json
+from typing import Optional
+
+# (libellé, chemin dans le résultat, plus haut = mieux)
+METRICS = (
+    ("req/s", ("throughput_rps",), True),
+    ("p50 ms", ("latency_ms", "p50"), False),
+    ("p99 ms", ("latency_ms", "p99"), False),
+    ("sql/req", ("sql_queries_per_request",), False),
+)
+
+
+def lookup(result: dict, path: tuple) -> Optional[float]:
+    value = result
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two load test results")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Flag changes worse than this (percent)")
+    args = parser.parse_args()
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.candidate) as file:
+        candidate = json.load(file)
+
+    print(f"baseline {baseline['commit']} ({baseline['timestamp']}) → candidate {candidate['commit']} ({candidate['timestamp']})")
+    previous = {(result["scenario"], result["concurrency"]): result for result in baseline["results"]}
+    for result in candidate["results"]:
+        key = (result["scenario"], result["concurrency"])
+        if key not in previous:
+            continue
+        cells = []
+        for label, path, higher_is_better in METRICS:
+            old, new = lookup(previous[key], path), lookup(result, path)
+            if old is None or new is None:
+                cells.append(f"{label} n/a")
+                continue
+            change = (new - old) / old * 100 if old else 0.0
+            regression = -change if higher_is_better else change
+            flag = " !" if regression > args.threshold else ""
+            cells.append(f"{label} {old:g}→{new:g} ({change:+.1f}%){flag}")
+        print(f"{key[0]:>17} c={key[1]:<4} " + "  ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Test de charge de l'API sur le jeu de données de benchmarks/seed.py
+
+Pour chaque scénario (login, listes, recherche, catégories, écritures) :
+N clients concurrents enchaînent les requêtes pendant --duration secondes.
+Mesures : débit (req/s), percentiles de latence, codes HTTP, et requêtes SQL /
+temps DB par requête (lus dans GET /metrics avant et après le scénario).
+
+Résultats écrits en JSON (benchmarks/results/<date>-<commit>.json), à comparer
+entre deux commits avec benchmarks/compare.py.
+
+Usage (depuis backend/, API lancée à part, ex: uvicorn app.main:app --workers 4):
+    python -m benchmarks.seed --scale 100k
+    python -m benchmarks.loadtest --scale 100k --concurrency 32 --duration 20
+    python -m benchmarks.loadtest --scenarios list_flashcards search --concurrency 1 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+from benchmarks.seed import BENCH_PASSWORD, WORDS
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+@dataclass
+class BenchUser:
+    """
+    User de benchmark connecté, avec ses catégories et un échantillon de ses cartes
+    """
+    email: str
+    headers: Dict[str, str]
+    category_ids: List[int] = field(default_factory=list)
+    flashcard_ids: List[int] = field(default_factory=list)
+
+
+# Requêtes des scénarios : (client, user, rng) → réponse HTTP
+async def login(client: httpx.AsyncClient, user: BenchUser, rng: random.Random) -> httpx.Response:
+    return await client.post("/api/auth/login", data={"username": user.email, "password": BENCH_PASSWORD})
+
+
+async def list_flashcards(client: httpx.AsyncClient, user: BenchUser, rng: random.Random) -> httpx.Response:
+    params = {"limit": 100}
+    if rng.random() < 0.5:
+        params["category_id"] = rng.choice(user.category_ids)
+    return await client.get("/api/flashcards", params=params, headers=user.headers)
+
+
+async def search(client: httpx.AsyncClient, user: BenchUser, rng: random.Random) -> httpx.Response:
+    return await client.get("/api/flashcards/search", params={"q": rng.choice(WORDS)}, headers=user.headers)
+
+
+async def categories(client: httpx.AsyncClient, user: BenchUser, rng: random.Random) -> httpx.Response:
+    return await client.get("/api/categories", headers=user.headers)
+
+
+async def create_flashcard(client: httpx.AsyncClient, user: BenchUser, rng: random.Random) -> httpx.Response:
+    payload = {
+        "question": f"Bench {rng.choice(WORDS)} {rng.randrange(10 ** 6)} ?",
+        "answer": f"{rng.choice(WORDS)} {rng.choice(WORDS)}.",
+        "category_id": rng.choice(user.category_ids),
+    }
+    return await client.post("/api/flashcards", json=payload, headers=user.headers)
+
+
+async def update_flashcard(client: httpx.AsyncClient, user: BenchUser, rng: random.Random) -> httpx.Response:
+    payload = {"answer": f"{rng.choice(WORDS)} {rng.choice(WORDS)} {rng.randrange(10 ** 6)}."}
+    return await client.put(f"/api/flashcards/{rng.choice(user.flashcard_ids)}", json=payload, headers=user.headers)
+
+
+async def review(client: httpx.AsyncClient, user: BenchUser, rng: random.Random) -> httpx.Response:
+    payload = {"rating": rng.choice((1, 2, 3, 3, 3, 4)), "elapsed_ms": rng.randrange(1000, 20000)}
+    return await client.post(f"/api/review/{rng.choice(user.flashcard_ids)}", json=payload, headers=user.headers)
+
+
+async def stats(client: httpx.AsyncClient, user: BenchUser, rng: random.Random) -> httpx.Response:
+    return await client.get("/api/stats", headers=user.headers)
+
+
+# Scénario : (méthode, route template dans /metrics, requête)
+SCENARIOS: Dict[str, tuple] = {
+    "login": ("POST", "/api/auth/login", login),
+    "list_flashcards": ("GET", "/api/flashcards", list_flashcards),
+    "search": ("GET", "/api/flashcards/search", search),
+    "categories": ("GET", "/api/categories", categories),
+    "create_flashcard": ("POST", "/api/flashcards", create_flashcard),
+    "update_flashcard": ("PUT", "/api/flashcards/{flashcard_id}", update_flashcard),
+    "review": ("POST", "/api/review/{flashcard_id}", review),
+    "stats": ("GET", "/api/stats", stats),
+}
+
+
+async def setup_users(client: httpx.AsyncClient, count: int) -> List[BenchUser]:
+    """
+    Connecte les users bench-1..N et charge leurs catégories / un échantillon de cartes
+    """
+    async def setup(index: int) -> Optional[BenchUser]:
+        email = f"bench-{index}@example.com"
+        response = await client.post("/api/auth/login", data={"username": email, "password": BENCH_PASSWORD})
+        if response.status_code != 200:
+            return None
+        user = BenchUser(email=email, headers={"Authorization": f"Bearer {response.json()['access_token']}"})
+        user.category_ids = [category["id"] for category in (await categories(client, user, None)).json()]
+        page = await client.get("/api/flashcards", params={"limit": 1000}, headers=user.headers)
+        user.flashcard_ids = [card["id"] for card in page.json()["items"]]
+        return user
+
+    users = [user for user in await asyncio.gather(*(setup(i) for i in range(1, count + 1))) if user]
+    if not users:
+        raise SystemExit("No benchmark user could log in: run `python -m benchmarks.seed` first")
+    return [user for user in users if user.category_ids and user.flashcard_ids]
+
+
+async def scrape_db_stats(client: httpx.AsyncClient) -> Dict[tuple, Dict[str, float]]:
+    """
+    Requêtes SQL / temps DB cumulés par (méthode, route), lus dans GET /metrics
+    """
+    stats: Dict[tuple, Dict[str, float]] = {}
+    response = await client.get("/metrics")
+    if response.status_code != 200:
+        return stats
+    for family in text_string_to_metric_families(response.text):
+        if family.name not in ("http_request_db_queries", "http_request_db_seconds"):
+            continue
+        for sample in family.samples:
+            if sample.name.endswith("_sum") or sample.name.endswith("_count"):
+                key = (sample.labels["method"], sample.labels["route"])
+                stats.setdefault(key, {})[sample.name] = sample.value
+    return stats
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    users: List[BenchUser],
+    request: Callable,
+    concurrency: int,
+    duration: float,
+    seed: int,
+) -> tuple:
+    """
+    Lance `concurrency` clients qui enchaînent la requête pendant `duration` secondes
+
+    Returns:
+        (latences en secondes, Counter des codes HTTP, durée réelle)
+    """
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id: int) -> None:
+        rng = random.Random(seed * 1000 + worker_id)
+        user = users[worker_id % len(users)]
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await request(client, user, rng)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as exc:
+                statuses[type(exc).__name__] += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - start
+
+
+def summarize(
+    latencies: List[float],
+    statuses: Counter,
+    elapsed: float,
+    db_before: Dict[str, float],
+    db_after: Dict[str, float],
+) -> dict:
+    latencies = sorted(latencies)
+    requests = sum(statuses.values())
+    errors = sum(count for status, count in statuses.items() if not (isinstance(status, int) and status < 400))
+
+    # Compteurs du scénario = différence avant / après (compteurs cumulés du serveur)
+    def delta(name: str) -> float:
+        return db_after.get(name, 0.0) - db_before.get(name, 0.0)
+
+    measured = delta("http_request_db_queries_count")
+    return {
+        "requests": requests,
+        "errors": errors,
+        "statuses": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p90": round(percentile(latencies, 0.90) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        # Null si /metrics n'est pas joignable (ou plusieurs workers sans PROMETHEUS_MULTIPROC_DIR)
+        "sql_queries_per_request": round(delta("http_request_db_queries_sum") / measured, 2) if measured else None,
+        "db_ms_per_request": round(delta("http_request_db_seconds_sum") / measured * 1000, 3) if measured else None,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        users = await setup_users(client, args.users)
+        print(f"{len(users)} users ready")
+
+        results = []
+        for name in args.scenarios:
+            method, route, request = SCENARIOS[name]
+            for concurrency in args.concurrency:
+                if args.warmup:
+                    await run_scenario(client, users, request, concurrency, args.warmup, args.seed)
+                before = (await scrape_db_stats(client)).get((method, route), {})
+                latencies, statuses, elapsed = await run_scenario(
+                    client, users, request, concurrency, args.duration, args.seed,
+                )
+                after = (await scrape_db_stats(client)).get((method, route), {})
+                result = {
+                    "scenario": name,
+                    "method": method,
+                    "route": route,
+                    "concurrency": concurrency,
+                    **summarize(latencies, statuses, elapsed, before, after),
+                }
+                results.append(result)
+                print(
+                    f"{name:>17} c={concurrency:<4} {result['throughput_rps']:>9.1f} req/s"
+                    f"  p50={result['latency_ms']['p50']:>8.2f}ms  p99={result['latency_ms']['p99']:>8.2f}ms"
+                    f"  sql/req={result['sql_queries_per_request']}  errors={result['errors']}"
+                )
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "base_url": args.base_url,
+        "scale": args.scale,
+        "users": len(users),
+        "duration_s": args.duration,
+        "seed": args.seed,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API load test")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scale", default=None, help="Label of the seeded dataset (stored in the results)")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario and concurrency")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each run")
+    parser.add_argument("--users", type=int, default=20, help="Benchmark users logged in (bench-1..N)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Results file (default: benchmarks/results/...)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.utcnow():%Y%m%dT%H%M%S}-{report['commit']}.json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
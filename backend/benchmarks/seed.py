@@ -0,0 +1,148 @@
+"""
+Jeu de données synthétique pour les benchmarks (benchmarks/loadtest.py)
+
+Crée des users bench-<n>@example.com (password "benchmark"), leurs catégories
+et leurs flashcards, générées côté PostgreSQL (generate_series) : 1M de cartes
+en quelques minutes, sans aller-retour par carte. Le contenu est déterministe
+(mêmes cartes à chaque seed) pour comparer les résultats entre commits.
+
+Base : PostgreSQL local, ou celui du docker-compose (`docker compose up -d postgres`),
+configuré par les mêmes variables que l'app (POSTGRES_*), schéma à jour
+(`python -m app.migrate`).
+
+Usage (depuis backend/):
+    python -m benchmarks.seed --scale 1k
+    python -m benchmarks.seed --scale 1m --users 200
+    python -m benchmarks.seed --reset-only
+"""
+import argparse
+import time
+from sqlalchemy import text
+from app.core.database import SessionLocal, engine
+from app.core.security import get_password_hash
+from app.scheduling import STATE_NEW, STATE_REVIEW
+from app.services.category_counters import reconcile_category_counters
+
+BENCH_EMAIL_PATTERN = "bench-%@example.com"
+BENCH_PASSWORD = "benchmark"
+
+# cartes, users, catégories par user
+SCALES = {
+    "1k": (1_000, 10, 5),
+    "100k": (100_000, 50, 10),
+    "1m": (1_000_000, 100, 20),
+}
+
+# Vocabulaire des cartes : la recherche full-text a des termes fréquents et rares
+WORDS = [
+    "python", "fastapi", "postgres", "index", "query", "async", "await", "cursor",
+    "pydantic", "schema", "router", "session", "engine", "pool", "transaction", "commit",
+    "rollback", "vacuum", "analyze", "btree", "gin", "trigram", "tsvector", "latency",
+    "throughput", "cache", "token", "bcrypt", "json", "orjson", "gzip", "stream",
+    "memory", "chien", "chat", "maison", "arbre", "soleil", "lune", "étoile",
+]
+
+# Une carte sur trois déjà révisée (due dans -10 à +19 jours), les autres nouvelles
+INSERT_FLASHCARDS = text(f"""
+    INSERT INTO flashcards (
+        question, answer, user_id, category_id, created_at, updated_at,
+        state, due_at, stability, difficulty, interval_days, reps, lapses, last_reviewed_at
+    )
+    SELECT
+        'Question ' || g || ' : ' || w[1 + g % {len(WORDS)}] || ' ' || w[1 + g / {len(WORDS)} % {len(WORDS)}] || ' ?',
+        'Réponse ' || g || ' : ' || w[1 + (g * 13 + 5) % {len(WORDS)}] || ' ' || w[1 + g / 7 % {len(WORDS)}]
+            || ' ' || w[1 + (g * 31 + 11) % {len(WORDS)}] || '.',
+        c.user_ids[1 + g % c.total],
+        c.ids[1 + g % c.total],
+        now(), now(),
+        CASE WHEN g % 3 = 0 THEN '{STATE_REVIEW}' ELSE '{STATE_NEW}' END,
+        CASE WHEN g % 3 = 0 THEN now() + (g % 30 - 10) * interval '1 day' ELSE now() END,
+        CASE WHEN g % 3 = 0 THEN 5.0 + g % 20 END,
+        CASE WHEN g % 3 = 0 THEN 1.0 + g % 9 END,
+        CASE WHEN g % 3 = 0 THEN 1 + g % 20 ELSE 0 END,
+        CASE WHEN g % 3 = 0 THEN 1 + g % 5 ELSE 0 END,
+        0,
+        CASE WHEN g % 3 = 0 THEN now() - interval '1 day' END
+    FROM generate_series(:start, :stop) AS g,
+        (SELECT array_agg(id ORDER BY id) AS ids, array_agg(user_id ORDER BY id) AS user_ids, count(*) AS total
+         FROM categories WHERE user_id IN (SELECT id FROM users WHERE email LIKE :pattern)) AS c,
+        (SELECT CAST(:words AS text[]) AS w) AS v
+""")
+
+
+def reset(db) -> None:
+    """
+    Supprime les users de benchmark et toutes leurs données
+    """
+    bench_users = "(SELECT id FROM users WHERE email LIKE :pattern)"
+    for table in ("review_logs", "daily_review_stats", "tombstones", "flashcards", "categories"):
+        db.execute(text(f"DELETE FROM {table} WHERE user_id IN {bench_users}"), {"pattern": BENCH_EMAIL_PATTERN})
+    db.execute(text("DELETE FROM users WHERE email LIKE :pattern"), {"pattern": BENCH_EMAIL_PATTERN})
+
+
+def seed(db, cards: int, users: int, categories: int, batch_size: int) -> None:
+    """
+    Crée users, catégories et flashcards (commit par batch de cartes)
+    """
+    # Un seul hash bcrypt pour tous les users
+    db.execute(
+        text("""
+            INSERT INTO users (email, hashed_password, created_at, revision)
+            SELECT 'bench-' || g || '@example.com', :hashed_password, now(), 0
+            FROM generate_series(1, :users) AS g
+        """),
+        {"hashed_password": get_password_hash(BENCH_PASSWORD), "users": users},
+    )
+    db.execute(
+        text("""
+            INSERT INTO categories (name, user_id, created_at, updated_at, card_count, new_count)
+            SELECT 'Deck ' || g, users.id, now(), now(), 0, 0
+            FROM users, generate_series(1, :categories) AS g
+            WHERE users.email LIKE :pattern
+        """),
+        {"categories": categories, "pattern": BENCH_EMAIL_PATTERN},
+    )
+    db.commit()
+
+    for start in range(1, cards + 1, batch_size):
+        stop = min(start + batch_size - 1, cards)
+        db.execute(INSERT_FLASHCARDS, {"start": start, "stop": stop, "pattern": BENCH_EMAIL_PATTERN, "words": WORDS})
+        db.commit()
+        print(f"  {stop}/{cards} flashcards")
+
+    reconcile_category_counters(db)
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed synthetic benchmark data")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+    parser.add_argument("--cards", type=int, default=None, help="Override the number of flashcards")
+    parser.add_argument("--users", type=int, default=None, help="Override the number of users")
+    parser.add_argument("--categories", type=int, default=None, help="Override categories per user")
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--reset-only", action="store_true", help="Only delete previous benchmark data")
+    args = parser.parse_args()
+
+    cards, users, categories = SCALES[args.scale]
+    cards = args.cards or cards
+    users = args.users or users
+    categories = args.categories or categories
+
+    start = time.perf_counter()
+    with SessionLocal() as db:
+        reset(db)
+        db.commit()
+        if not args.reset_only:
+            print(f"Seeding {cards} flashcards, {users} users, {categories} categories per user")
+            seed(db, cards, users, categories, args.batch_size)
+
+    # Statistiques du planner à jour avant de mesurer
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for table in ("users", "categories", "flashcards"):
+            connection.execute(text(f"VACUUM ANALYZE {table}"))
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
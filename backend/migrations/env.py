@@ -0,0 +1,63 @@
+"""
+Environnement Alembic : URL depuis les settings de l'app, metadata des modèles
+
+Une transaction par migration (transaction_per_migration) : une migration
+peut sortir de sa transaction avec op.get_context().autocommit_block() pour
+un CREATE INDEX CONCURRENTLY (interdit dans une transaction).
+"""
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine, pool
+from app.core.config import settings
+from app.core.database import Base
+import app.models  # noqa: F401 (enregistre les tables dans Base.metadata)
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Partitions mensuelles de review_logs : gérées par app/scheduling/review_log.py
+    if type_ == "table" and reflected and name.startswith("review_logs_y"):
+        return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    """
+    Génère le SQL sans se connecter (alembic upgrade head --sql)
+    """
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    # NullPool : une seule connexion, fermée à la fin (commande one-shot)
+    connectable = create_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            transaction_per_migration=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,69 @@
+"""initial schema
+
+Schéma de référence : users, categories, flashcards tels que les créait
+l'ancien create_all au démarrage, avant le planificateur, la recherche et
+la synchro (ajoutés par 0002).
+
+Base créée avant les migrations : `python -m app.migrate` la marque à cette
+révision sans rien recréer, après avoir vérifié que ses colonnes sont bien
+celles-ci (app/migrate.py, BASELINE_COLUMNS).
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 01:57:16.408233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables neuves : leurs index ne bloquent personne, pas besoin de CONCURRENTLY
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_table('categories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_categories_id', 'categories', ['id'], unique=False)
+    op.create_index('ix_categories_user_id', 'categories', ['user_id'], unique=False)
+    op.create_table('flashcards',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('question', sa.Text(), nullable=False),
+    sa.Column('answer', sa.Text(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_flashcards_id', 'flashcards', ['id'], unique=False)
+    op.create_index('ix_flashcards_user_id', 'flashcards', ['user_id'], unique=False)
+    op.create_index('ix_flashcards_category_id', 'flashcards', ['category_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('flashcards')
+    op.drop_table('categories')
+    op.drop_table('users')
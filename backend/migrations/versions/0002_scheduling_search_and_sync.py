@@ -0,0 +1,142 @@
+"""scheduling search and sync
+
+Colonnes et tables ajoutées au schéma de référence :
+
+- flashcards : état FSRS (state, due_at, stability, difficulty, interval_days,
+  reps, lapses, last_reviewed_at) et search_vector (colonne générée)
+- categories : updated_at (delta sync), compteurs card_count / new_count
+- users : fsrs_weights (optimiseur), revision (ETag des listes)
+- review_logs (partitionnée par mois, séquence partagée) et tombstones
+
+Cartes existantes : "new", dues tout de suite. Les défauts constants (et
+now(), évalué une fois) ne réécrivent pas les tables ; ils sont retirés
+ensuite (défauts côté ORM). search_vector, colonne STORED, réécrit
+flashcards ; les compteurs des catégories sont calculés ici.
+
+Index secondaires des tables existantes en CREATE INDEX CONCURRENTLY (hors
+transaction, sans bloquer les écritures). Si un CREATE INDEX CONCURRENTLY
+échoue, l'index reste INVALID : le supprimer (DROP INDEX CONCURRENTLY) puis
+relancer la migration.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 10:12:48.502391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Même expression que app/core/search.py au moment de la migration
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, question), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, answer), 'B') || "
+    "setweight(to_tsvector('french'::regconfig, question), 'A') || "
+    "setweight(to_tsvector('french'::regconfig, answer), 'B')"
+)
+
+# (table, colonne, type, défaut temporaire) : NOT NULL sans réécrire la table
+COLUMNS_WITH_TEMPORARY_DEFAULT = [
+    ('flashcards', 'state', sa.String(length=16), "'new'"),
+    ('flashcards', 'due_at', sa.DateTime(), "timezone('utc', now())"),
+    ('flashcards', 'interval_days', sa.Integer(), '0'),
+    ('flashcards', 'reps', sa.Integer(), '0'),
+    ('flashcards', 'lapses', sa.Integer(), '0'),
+    ('categories', 'updated_at', sa.DateTime(), "timezone('utc', now())"),
+]
+
+# (nom, table, colonnes, options) : créés en CONCURRENTLY
+INDEXES = [
+    ('ix_tombstones_user_id_deleted_at', 'tombstones', ['user_id', 'deleted_at'], {}),
+    ('ix_categories_user_id_updated_at', 'categories', ['user_id', 'updated_at'], {}),
+    ('ix_flashcards_user_id_id', 'flashcards', ['user_id', 'id'], {}),
+    ('ix_flashcards_user_id_due_at', 'flashcards', ['user_id', 'due_at'], {}),
+    ('ix_flashcards_user_id_updated_at_id', 'flashcards', ['user_id', 'updated_at', 'id'], {}),
+    ('ix_flashcards_search_vector', 'flashcards', ['search_vector'], {'postgresql_using': 'gin'}),
+    ('ix_flashcards_question_trgm', 'flashcards', ['question'],
+     {'postgresql_using': 'gin', 'postgresql_ops': {'question': 'gin_trgm_ops'}}),
+    ('ix_flashcards_answer_trgm', 'flashcards', ['answer'],
+     {'postgresql_using': 'gin', 'postgresql_ops': {'answer': 'gin_trgm_ops'}}),
+]
+
+
+def upgrade() -> None:
+    # Opérateurs trigrammes des index *_trgm
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # Séquence partagée par les partitions de review_logs
+    op.execute(sa.schema.CreateSequence(sa.Sequence('review_logs_id_seq')))
+    op.create_table('review_logs',
+    sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('review_logs_id_seq')"), nullable=False),
+    sa.Column('reviewed_at', sa.DateTime(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('card_id', sa.Integer(), nullable=False),
+    sa.Column('rating', sa.SmallInteger(), nullable=False),
+    sa.Column('elapsed_ms', sa.Integer(), nullable=True),
+    sa.Column('state', sa.String(length=16), nullable=False),
+    sa.Column('interval_days', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'reviewed_at'),
+    postgresql_partition_by='RANGE (reviewed_at)'
+    )
+    # Table partitionnée : pas de CONCURRENTLY possible (index propagé aux partitions)
+    op.create_index('ix_review_logs_user_id_reviewed_at', 'review_logs', ['user_id', 'reviewed_at'], unique=False)
+    op.create_table('tombstones',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entity_type', sa.String(length=16), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.add_column('users', sa.Column('fsrs_weights', postgresql.ARRAY(sa.Float()), nullable=True))
+    op.add_column('users', sa.Column('revision', sa.BigInteger(), server_default='0', nullable=False))
+
+    for table, name, type_, default in COLUMNS_WITH_TEMPORARY_DEFAULT:
+        op.add_column(table, sa.Column(name, type_, server_default=sa.text(default), nullable=False))
+        op.alter_column(table, name, server_default=None)
+    op.add_column('flashcards', sa.Column('stability', sa.Float(), nullable=True))
+    op.add_column('flashcards', sa.Column('difficulty', sa.Float(), nullable=True))
+    op.add_column('flashcards', sa.Column('last_reviewed_at', sa.DateTime(), nullable=True))
+    op.add_column('flashcards', sa.Column(
+        'search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True,
+    ))
+
+    # Toutes les cartes existantes sont nouvelles : new_count = card_count
+    op.add_column('categories', sa.Column('card_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('categories', sa.Column('new_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE categories SET card_count = counts.cards, new_count = counts.cards "
+        "FROM (SELECT category_id, count(*) AS cards FROM flashcards GROUP BY category_id) AS counts "
+        "WHERE categories.id = counts.category_id"
+    )
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True, postgresql_concurrently=True, **options)
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+    op.drop_column('categories', 'new_count')
+    op.drop_column('categories', 'card_count')
+    op.drop_column('flashcards', 'search_vector')
+    op.drop_column('flashcards', 'last_reviewed_at')
+    op.drop_column('flashcards', 'difficulty')
+    op.drop_column('flashcards', 'stability')
+    for table, name, _, _ in reversed(COLUMNS_WITH_TEMPORARY_DEFAULT):
+        op.drop_column(table, name)
+    op.drop_column('users', 'revision')
+    op.drop_column('users', 'fsrs_weights')
+    op.drop_table('tombstones')
+    op.drop_table('review_logs')
+    op.execute(sa.schema.DropSequence(sa.Sequence('review_logs_id_seq')))
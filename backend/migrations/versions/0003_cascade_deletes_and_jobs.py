@@ -0,0 +1,71 @@
+"""cascade deletes and jobs
+
+ForeignKeys users → categories → flashcards en ON DELETE CASCADE : supprimer
+un user ou une catégorie ne passe plus par l'ORM ligne par ligne.
+
+Chaque contrainte est recréée NOT VALID (verrou bref, pas de scan) puis
+validée hors transaction : VALIDATE CONSTRAINT scanne la table sans bloquer
+les écritures.
+
+Table jobs : opérations longues en tâche de fond (GET /api/jobs/{id}).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 02:00:27.562120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (contrainte, table, colonne, table référencée)
+FOREIGN_KEYS = [
+    ('categories_user_id_fkey', 'categories', 'user_id', 'users'),
+    ('flashcards_user_id_fkey', 'flashcards', 'user_id', 'users'),
+    ('flashcards_category_id_fkey', 'flashcards', 'category_id', 'categories'),
+]
+
+
+def _replace_foreign_keys(on_delete: str) -> None:
+    for name, table, column, referred in FOREIGN_KEYS:
+        op.execute(
+            f'ALTER TABLE {table} DROP CONSTRAINT {name}, '
+            f'ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {referred} (id) {on_delete} NOT VALID'
+        )
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in FOREIGN_KEYS:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+
+
+def upgrade() -> None:
+    # Table neuve : ses index ne bloquent personne, pas besoin de CONCURRENTLY
+    op.create_table('jobs',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('kind', sa.String(length=32), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('progress', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_jobs_user_id_created_at', 'jobs', ['user_id', 'created_at'], unique=False)
+
+    _replace_foreign_keys('ON DELETE CASCADE')
+
+
+def downgrade() -> None:
+    _replace_foreign_keys('')
+    op.drop_index('ix_jobs_user_id_created_at', table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,49 @@
+"""job queue
+
+La table jobs devient une file d'attente pour les workers (python -m app.worker) :
+essais et backoff (attempts, max_attempts, run_after), worker propriétaire et
+heartbeat (locked_by, heartbeat_at) pour remettre en file les jobs d'un worker mort.
+
+Les défauts constants (et now(), évalué une fois) n'imposent pas de réécrire la
+table ; l'index partiel de la file est créé sans bloquer les écritures.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 04:12:41.208311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('jobs', sa.Column('max_attempts', sa.Integer(), server_default='3', nullable=False))
+    op.add_column('jobs', sa.Column('run_after', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    op.add_column('jobs', sa.Column('locked_by', sa.String(length=64), nullable=True))
+    op.add_column('jobs', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_jobs_queue', 'jobs', ['run_after', 'id'], unique=False,
+            postgresql_where=sa.text("status = 'queued'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_jobs_queue', table_name='jobs', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('jobs', 'heartbeat_at')
+    op.drop_column('jobs', 'locked_by')
+    op.drop_column('jobs', 'run_after')
+    op.drop_column('jobs', 'max_attempts')
+    op.drop_column('jobs', 'attempts')
@@ -0,0 +1,86 @@
+"""study stats
+
+Statistiques de GET /api/stats sans agréger l'historique brut à chaque lecture :
+
+- daily_review_stats : agrégat quotidien des révisions par user, mis à jour
+  par le writer des review logs (même transaction). Rempli ici depuis
+  review_logs ; les logs écrits par l'ancienne version pendant le
+  déploiement se rattrapent avec `python -m app.services.stats rebuild`.
+- due_forecast_stats / category_maturity_stats : vues matérialisées sur l'état
+  des cartes, rafraîchies (CONCURRENTLY, d'où les index uniques) par le job
+  refresh_stats.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 05:03:18.640927
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Même seuil que app/models/stats.py (MATURE_INTERVAL_DAYS) au moment de la migration
+MATURE_INTERVAL_DAYS = 21
+
+# Horizon de la prévision (30 jours, + 1 de marge si le rafraîchissement date de la veille)
+FORECAST_HORIZON_DAYS = 31
+
+
+def upgrade() -> None:
+    op.create_table('daily_review_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('reviews', sa.Integer(), nullable=False),
+    sa.Column('new_cards', sa.Integer(), nullable=False),
+    sa.Column('again', sa.Integer(), nullable=False),
+    sa.Column('review_reviews', sa.Integer(), nullable=False),
+    sa.Column('review_passed', sa.Integer(), nullable=False),
+    sa.Column('elapsed_ms', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    op.execute(
+        "INSERT INTO daily_review_stats "
+        "(user_id, day, reviews, new_cards, again, review_reviews, review_passed, elapsed_ms) "
+        "SELECT user_id, reviewed_at::date, count(*), "
+        "count(*) FILTER (WHERE state = 'new'), "
+        "count(*) FILTER (WHERE rating = 1), "
+        "count(*) FILTER (WHERE state = 'review'), "
+        "count(*) FILTER (WHERE state = 'review' AND rating <> 1), "
+        "coalesce(sum(elapsed_ms), 0) "
+        "FROM review_logs GROUP BY user_id, reviewed_at::date"
+    )
+
+    # Jours UTC, comme reviewed_at / due_at ; cartes déjà dues regroupées sur le jour du rafraîchissement
+    op.execute(
+        "CREATE MATERIALIZED VIEW due_forecast_stats AS "
+        "SELECT user_id, greatest(due_at::date, timezone('utc', now())::date) AS day, count(*)::integer AS cards "
+        "FROM flashcards "
+        f"WHERE state <> 'new' AND due_at < timezone('utc', now())::date + {FORECAST_HORIZON_DAYS} "
+        "GROUP BY 1, 2"
+    )
+    op.execute("CREATE UNIQUE INDEX ix_due_forecast_stats_user_id_day ON due_forecast_stats (user_id, day)")
+
+    op.execute(
+        "CREATE MATERIALIZED VIEW category_maturity_stats AS "
+        "SELECT category_id, user_id, "
+        "count(*) FILTER (WHERE state = 'new')::integer AS new, "
+        "count(*) FILTER (WHERE state IN ('learning', 'relearning'))::integer AS learning, "
+        f"count(*) FILTER (WHERE state = 'review' AND interval_days < {MATURE_INTERVAL_DAYS})::integer AS young, "
+        f"count(*) FILTER (WHERE state = 'review' AND interval_days >= {MATURE_INTERVAL_DAYS})::integer AS mature "
+        "FROM flashcards GROUP BY category_id, user_id"
+    )
+    op.execute("CREATE UNIQUE INDEX ix_category_maturity_stats_category_id ON category_maturity_stats (category_id)")
+    op.execute("CREATE INDEX ix_category_maturity_stats_user_id ON category_maturity_stats (user_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW category_maturity_stats")
+    op.execute("DROP MATERIALIZED VIEW due_forecast_stats")
+    op.drop_table('daily_review_stats')
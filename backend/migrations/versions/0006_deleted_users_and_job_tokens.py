@@ -0,0 +1,43 @@
+"""deleted users and job tokens
+
+Suppression d'un compte en tâche de fond : users.deleted_at est posé dès la
+réponse 202, le user ne peut plus se connecter ni utiliser ses tokens pendant
+que le job delete_user supprime ses données. Le job se suit ensuite sans
+authentification avec son jobs.token (GET /api/jobs/status/{token}).
+
+Colonnes nullables sans défaut : pas de réécriture des tables. Les jobs
+existants n'ont pas de token (suivis par id uniquement).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 09:41:07.318524
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('jobs', sa.Column('token', sa.String(length=43), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_jobs_token', 'jobs', ['token'], unique=True,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_jobs_token', table_name='jobs', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('jobs', 'token')
+    op.drop_column('users', 'deleted_at')
@@ -0,0 +1,113 @@
+"""sync commit order
+
+Delta sync ordonné par transaction au lieu de l'horloge applicative :
+updated_at / deleted_at sont posés au flush, pas au commit, donc une
+transaction lente (import, batch, job) peut commiter des lignes datées avant
+un watermark déjà renvoyé à un client, qui ne les voit jamais.
+
+- flashcards, categories, tombstones : sync_xid = id de la transaction qui a
+  écrit la ligne (pg_current_xact_id()), posé par un trigger BEFORE INSERT /
+  UPDATE (ORM, UPDATE en masse, imports : tous les chemins d'écriture).
+  Un UPDATE qui garde updated_at (compteurs des catégories) ne change pas
+  sync_xid : la ligne n'est pas renvoyée aux clients.
+- GET /api/sync ne renvoie que sync_xid < pg_snapshot_xmin(pg_current_snapshot()) :
+  toutes ces transactions sont terminées, aucune ne peut encore commiter
+  derrière le watermark.
+
+Lignes existantes : sync_xid = 0 (défaut constant, pas de réécriture des
+tables). Les anciens watermarks "timestamp|id" repartent de 0.
+
+Index de sync remplacés, en CREATE/DROP INDEX CONCURRENTLY (voir 0002 si un
+index reste INVALID).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 15:02:44.917306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['flashcards', 'categories', 'tombstones']
+
+# (nom, table, colonnes) : créés en CONCURRENTLY
+INDEXES = [
+    ('ix_flashcards_user_id_sync_xid_id', 'flashcards', ['user_id', 'sync_xid', 'id']),
+    ('ix_categories_user_id_sync_xid', 'categories', ['user_id', 'sync_xid']),
+    ('ix_tombstones_user_id_sync_xid', 'tombstones', ['user_id', 'sync_xid']),
+]
+
+# Index de sync sur l'horloge applicative (remis au downgrade)
+TIMESTAMP_INDEXES = [
+    ('ix_flashcards_user_id_updated_at_id', 'flashcards', ['user_id', 'updated_at', 'id']),
+    ('ix_categories_user_id_updated_at', 'categories', ['user_id', 'updated_at']),
+    ('ix_tombstones_user_id_deleted_at', 'tombstones', ['user_id', 'deleted_at']),
+]
+
+# tombstones n'a pas d'updated_at : UPDATE non suivi (jamais modifiés)
+SET_SYNC_XID = """
+CREATE FUNCTION set_sync_xid() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF NEW.updated_at IS NOT DISTINCT FROM OLD.updated_at THEN
+            RETURN NEW;
+        END IF;
+    END IF;
+    NEW.sync_xid := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END
+$$
+"""
+
+TRIGGERS = [
+    ('flashcards', 'INSERT OR UPDATE'),
+    ('categories', 'INSERT OR UPDATE'),
+    ('tombstones', 'INSERT'),
+]
+
+
+def _create_indexes(indexes) -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in indexes:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def _drop_indexes(indexes) -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in indexes:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('sync_xid', sa.BigInteger(), server_default='0', nullable=False))
+
+    op.execute(SET_SYNC_XID)
+    for table, events in TRIGGERS:
+        op.execute(
+            f'CREATE TRIGGER {table}_sync_xid BEFORE {events} ON {table} '
+            f'FOR EACH ROW EXECUTE FUNCTION set_sync_xid()'
+        )
+
+    _create_indexes(INDEXES)
+    _drop_indexes(TIMESTAMP_INDEXES)
+
+
+def downgrade() -> None:
+    _create_indexes(TIMESTAMP_INDEXES)
+    _drop_indexes(INDEXES)
+
+    for table, _ in TRIGGERS:
+        op.execute(f'DROP TRIGGER {table}_sync_xid ON {table}')
+    op.execute('DROP FUNCTION set_sync_xid()')
+
+    for table in TABLES:
+        op.drop_column(table, 'sync_xid')
@@ -0,0 +1,8 @@
+import os
+
+# Tests sans base de données : les settings exigent quand même ces variables
+# (les engines sont créés à l'import, sans se connecter)
+os.environ.setdefault("POSTGRES_USER", "postgres")
+os.environ.setdefault("POSTGRES_PASSWORD", "postgres")
+os.environ.setdefault("POSTGRES_DB", "flashcards_test")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
@@ -0,0 +1,74 @@
+import re
+from sqlalchemy.dialects import postgresql
+from app.services.category_counters import CategoryCounterDeltas
+
+
+def values_rows(statement):
+    """
+    Lignes (id, cards, new) du VALUES de l'UPDATE, dans l'ordre du SQL
+    """
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    values = re.search(r"\(VALUES (.*)\) AS deltas", sql).group(1)
+    return [tuple(int(value) for value in row.split(", ")) for row in re.findall(r"\(([^()]*)\)", values)]
+
+
+def test_no_change_gives_no_statement():
+    assert CategoryCounterDeltas().statement() is None
+
+
+def test_changes_that_cancel_out_give_no_statement():
+    # Batch : création puis suppression de la même carte
+    deltas = CategoryCounterDeltas()
+    deltas.add(1, is_new=True)
+    deltas.add(1, is_new=True, sign=-1)
+
+    assert deltas.statement() is None
+
+
+def test_create_and_delete():
+    deltas = CategoryCounterDeltas()
+    deltas.add(1, is_new=True)
+    deltas.add(1, is_new=True)
+    deltas.add(2, is_new=False, sign=-1)
+
+    assert values_rows(deltas.statement()) == [(1, 2, 2), (2, -1, 0)]
+
+
+def test_move_between_categories():
+    deltas = CategoryCounterDeltas()
+    deltas.move(1, 2, is_new=True)
+    deltas.move(3, 4, is_new=False)
+
+    assert values_rows(deltas.statement()) == [(1, -1, -1), (2, 1, 1), (3, -1, 0), (4, 1, 0)]
+
+
+def test_move_to_same_category_changes_nothing():
+    deltas = CategoryCounterDeltas()
+    deltas.move(1, 1, is_new=True)
+
+    assert deltas.statement() is None
+
+
+def test_leave_new_only_changes_new_count():
+    deltas = CategoryCounterDeltas()
+    deltas.leave_new(5)
+
+    assert values_rows(deltas.statement()) == [(5, 0, -1)]
+
+
+def test_categories_are_sorted():
+    # Même ordre de verrouillage dans toutes les transactions : pas de deadlock
+    deltas = CategoryCounterDeltas()
+    for category_id in (9, 3, 7):
+        deltas.add(category_id, is_new=False)
+
+    assert [row[0] for row in values_rows(deltas.statement())] == [3, 7, 9]
+
+
+def test_statement_keeps_updated_at():
+    # Un compteur qui bouge ne doit pas renvoyer la catégorie au delta sync
+    deltas = CategoryCounterDeltas()
+    deltas.add(1, is_new=True)
+    sql = str(deltas.statement().compile(dialect=postgresql.dialect()))
+
+    assert "updated_at=categories.updated_at" in sql
@@ -0,0 +1,65 @@
+import io
+import sqlite3
+import zipfile
+import pytest
+from app.core.config import settings
+from app.services.deck_import import DeckImportError, iter_apkg_rows, iter_delimited_rows
+
+
+def make_apkg(collection: bytes, compression: int = zipfile.ZIP_DEFLATED) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as archive:
+        archive.writestr("collection.anki2", collection)
+    buffer.seek(0)
+    return buffer
+
+
+def make_collection(tmp_path) -> bytes:
+    path = tmp_path / "collection.anki2"
+    collection = sqlite3.connect(path)
+    collection.executescript(
+        "CREATE TABLE decks (id INTEGER PRIMARY KEY, name TEXT);"
+        "CREATE TABLE notes (id INTEGER PRIMARY KEY, flds TEXT);"
+        "CREATE TABLE cards (id INTEGER PRIMARY KEY, nid INTEGER, did INTEGER);"
+        "INSERT INTO decks VALUES (1, 'Langues\x1fAnglais');"
+        "INSERT INTO notes VALUES (1, 'cat<br>dog\x1fchat');"
+        "INSERT INTO cards VALUES (1, 1, 1);"
+    )
+    collection.commit()
+    collection.close()
+    return path.read_bytes()
+
+
+def test_apkg_rows(tmp_path):
+    rows = list(iter_apkg_rows(make_apkg(make_collection(tmp_path))))
+
+    assert rows == [("Langues::Anglais", "cat\ndog", "chat")]
+
+
+def test_not_a_zip():
+    with pytest.raises(DeckImportError, match="not a zip"):
+        list(iter_apkg_rows(io.BytesIO(b"not a zip")))
+
+
+def test_corrupt_member_is_an_import_error(tmp_path):
+    data = make_apkg(make_collection(tmp_path), zipfile.ZIP_STORED).getvalue()
+    # Un octet modifié dans les données : CRC faux à la décompression
+    offset = data.index(b"SQLite format 3") + 200
+    corrupt = data[:offset] + bytes([data[offset] ^ 0xFF]) + data[offset + 1:]
+
+    with pytest.raises(DeckImportError, match="corrupt"):
+        list(iter_apkg_rows(io.BytesIO(corrupt)))
+
+
+def test_collection_size_is_limited(monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_APKG_COLLECTION_MB", 1)
+    # Très compressible : quelques Ko dans le zip, 2 Mo décompressés
+    apkg = make_apkg(b"\0" * (2 * 1024 * 1024))
+
+    with pytest.raises(DeckImportError, match="too large"):
+        list(iter_apkg_rows(apkg))
+
+
+def test_csv_invalid_encoding_reports_line():
+    with pytest.raises(DeckImportError, match="line 2"):
+        list(iter_delimited_rows(io.BytesIO(b"q1,a1\nq2,\xff\n"), ","))
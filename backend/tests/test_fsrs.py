@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+import pytest
+from app.scheduling import (
+    AGAIN, HARD, GOOD, EASY, STATE_NEW, STATE_LEARNING, STATE_REVIEW, STATE_RELEARNING,
+    CardSchedule, FSRSScheduler,
+)
+from app.scheduling.fsrs import DEFAULT_WEIGHTS, retrievability
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def scheduler():
+    return FSRSScheduler()
+
+
+def test_retrievability_is_desired_retention_after_stability_days():
+    assert retrievability(10, 10) == pytest.approx(0.9)
+    assert retrievability(0, 10) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("rating", [HARD, GOOD, EASY])
+def test_new_card_passed_goes_to_review(scheduler, rating):
+    schedule = scheduler.review(CardSchedule(), rating, NOW)
+
+    assert schedule.state == STATE_REVIEW
+    assert schedule.stability == DEFAULT_WEIGHTS[rating - 1]
+    assert schedule.interval_days >= 1
+    assert schedule.due_at == NOW + timedelta(days=schedule.interval_days)
+    assert schedule.reps == 1
+    assert schedule.lapses == 0
+    assert schedule.last_reviewed_at == NOW
+
+
+def test_new_card_again_goes_to_learning(scheduler):
+    schedule = scheduler.review(CardSchedule(), AGAIN, NOW)
+
+    assert schedule.state == STATE_LEARNING
+    assert schedule.interval_days == 0
+    assert schedule.due_at == NOW + timedelta(minutes=10)
+    assert schedule.lapses == 0
+
+
+def test_better_rating_gives_longer_interval(scheduler):
+    intervals = [scheduler.review(CardSchedule(), rating, NOW).interval_days for rating in (HARD, GOOD, EASY)]
+
+    assert intervals == sorted(intervals)
+    assert intervals[0] < intervals[-1]
+
+
+def test_initial_difficulty_decreases_with_rating(scheduler):
+    difficulties = [scheduler.review(CardSchedule(), rating, NOW).difficulty for rating in (AGAIN, HARD, GOOD, EASY)]
+
+    assert difficulties == sorted(difficulties, reverse=True)
+    assert all(1.0 <= difficulty <= 10.0 for difficulty in difficulties)
+
+
+def test_review_on_due_date_increases_stability(scheduler):
+    first = scheduler.review(CardSchedule(), GOOD, NOW)
+    second = scheduler.review(first, GOOD, first.due_at)
+
+    assert second.state == STATE_REVIEW
+    assert second.stability > first.stability
+    assert second.interval_days > first.interval_days
+    assert second.reps == 2
+
+
+def test_lapse_goes_to_relearning_without_gaining_stability(scheduler):
+    review = scheduler.review(CardSchedule(), GOOD, NOW)
+    lapsed = scheduler.review(review, AGAIN, review.due_at)
+
+    assert lapsed.state == STATE_RELEARNING
+    assert lapsed.lapses == 1
+    assert lapsed.stability <= review.stability
+    assert lapsed.due_at == review.due_at + timedelta(minutes=10)
+
+
+def test_again_while_relearning_is_not_a_new_lapse(scheduler):
+    relearning = CardSchedule(state=STATE_RELEARNING, stability=2.0, difficulty=6.0, reps=3, lapses=1,
+                              last_reviewed_at=NOW)
+    schedule = scheduler.review(relearning, AGAIN, NOW + timedelta(minutes=10))
+
+    assert schedule.state == STATE_RELEARNING
+    assert schedule.lapses == 1
+
+
+def test_review_before_last_review_counts_as_zero_elapsed(scheduler):
+    # Horloges décalées entre appareils : pas de retrievability > 1
+    card = CardSchedule(state=STATE_REVIEW, stability=5.0, difficulty=5.0, last_reviewed_at=NOW)
+
+    early = scheduler.review(card, GOOD, NOW - timedelta(hours=1))
+    on_time = scheduler.review(card, GOOD, NOW)
+
+    assert (early.stability, early.difficulty) == (on_time.stability, on_time.difficulty)
+
+
+def test_interval_is_capped(scheduler):
+    capped = FSRSScheduler(maximum_interval=30)
+
+    assert capped.next_interval(10_000) == 30
+    assert scheduler.next_interval(0.01) == 1
+
+
+def test_custom_weights_are_used():
+    weights = list(DEFAULT_WEIGHTS)
+    weights[GOOD - 1] = 20.0
+
+    assert FSRSScheduler(weights).review(CardSchedule(), GOOD, NOW).stability == 20.0
+
+
+def test_invalid_rating_is_rejected(scheduler):
+    with pytest.raises(ValueError):
+        scheduler.review(CardSchedule(), 5, NOW)
+
+
+def test_input_schedule_is_not_modified(scheduler):
+    schedule = CardSchedule()
+    scheduler.review(schedule, GOOD, NOW)
+
+    assert schedule == CardSchedule(state=STATE_NEW)
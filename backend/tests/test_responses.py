@@ -0,0 +1,37 @@
+from datetime import datetime
+import orjson
+from starlette.datastructures import MutableHeaders
+from app.core.responses import rows_to_dicts, trusted_json_response
+
+
+def test_rows_to_dicts():
+    rows = [(1, "Q1", None), (2, "Q2", "A2")]
+
+    assert rows_to_dicts(["id", "question", "answer"], rows) == [
+        {"id": 1, "question": "Q1", "answer": None},
+        {"id": 2, "question": "Q2", "answer": "A2"},
+    ]
+
+
+def test_rows_to_dicts_accepts_any_key_iterable():
+    assert rows_to_dicts(iter(["id"]), [(1,), (2,)]) == [{"id": 1}, {"id": 2}]
+
+
+def test_rows_to_dicts_empty():
+    assert rows_to_dicts(["id"], []) == []
+
+
+def test_trusted_json_response_encodes_datetimes_in_iso_format():
+    response = trusted_json_response({"items": [{"id": 1, "created_at": datetime(2026, 1, 1, 12, 0)}]})
+
+    assert orjson.loads(response.body) == {"items": [{"id": 1, "created_at": "2026-01-01T12:00:00"}]}
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_trusted_json_response_keeps_route_headers():
+    headers = MutableHeaders({"ETag": 'W/"7-abc"', "Content-Length": "999"})
+    response = trusted_json_response([], headers)
+
+    assert response.headers["etag"] == 'W/"7-abc"'
+    # Longueur recalculée pour le nouveau corps
+    assert response.headers["content-length"] == str(len(response.body))
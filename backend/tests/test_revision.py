@@ -0,0 +1,53 @@
+from starlette.requests import Request
+from app.core.revision import etag_matches, revision_etag
+
+
+def make_request(path: str = "/api/flashcards", query: str = "", if_none_match: str = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": headers,
+    })
+
+
+def test_etag_is_weak_and_carries_revision():
+    etag = revision_etag(make_request(), 7)
+
+    assert etag.startswith('W/"7-')
+    assert etag.endswith('"')
+
+
+def test_etag_changes_with_revision_and_query():
+    base = revision_etag(make_request(query="limit=50"), 7)
+
+    assert revision_etag(make_request(query="limit=50"), 7) == base
+    assert revision_etag(make_request(query="limit=50"), 8) != base
+    assert revision_etag(make_request(query="limit=20"), 7) != base
+    assert revision_etag(make_request(path="/api/categories", query="limit=50"), 7) != base
+
+
+def test_no_if_none_match():
+    assert not etag_matches(make_request(), 'W/"7-abc"')
+
+
+def test_matching_etag():
+    assert etag_matches(make_request(if_none_match='W/"7-abc"'), 'W/"7-abc"')
+
+
+def test_weak_comparison():
+    assert etag_matches(make_request(if_none_match='"7-abc"'), 'W/"7-abc"')
+
+
+def test_one_of_several_etags():
+    assert etag_matches(make_request(if_none_match='W/"6-abc", W/"7-abc"'), 'W/"7-abc"')
+
+
+def test_wildcard():
+    assert etag_matches(make_request(if_none_match=" * "), 'W/"7-abc"')
+
+
+def test_stale_etag():
+    assert not etag_matches(make_request(if_none_match='W/"6-abc"'), 'W/"7-abc"')
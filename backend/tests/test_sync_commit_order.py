@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import DBAPIError
+from app.api.routes.sync import sync
+from app.core.database import SessionLocal
+from app.models import Category, FlashCard, Tombstone, User
+
+# Tests sur une vraie base PostgreSQL (schéma migré) : ignorés sans base
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        session.execute(select(FlashCard.sync_xid).limit(1))
+    except DBAPIError:
+        session.close()
+        pytest.skip("PostgreSQL avec le schéma migré requis")
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    user = User(email=f"sync-{datetime.utcnow().timestamp()}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    yield user
+    db.rollback()
+    db.execute(delete(Tombstone).where(Tombstone.user_id == user.id))
+    db.execute(delete(User).where(User.id == user.id))
+    db.commit()
+
+
+def run_sync(db, user, since=None, limit=1000):
+    response = sync(since=since, limit=limit, current_user=user, db=db)
+    db.commit()
+    return response
+
+
+def test_slow_transaction_committed_after_the_watermark_is_not_missed(db, user):
+    category = Category(name="Sync", user_id=user.id)
+    db.add(category)
+    db.commit()
+
+    # Transaction lente (import commencé il y a une heure) : carte écrite, pas encore commitée
+    slow = SessionLocal()
+    try:
+        slow.add(FlashCard(
+            question="slow", answer="a", user_id=user.id, category_id=category.id,
+            updated_at=datetime.utcnow() - timedelta(hours=1),
+        ))
+        slow.flush()
+
+        # Carte commitée par une transaction plus récente, pendant la lente
+        db.add(FlashCard(question="fast", answer="a", user_id=user.id, category_id=category.id))
+        db.commit()
+
+        first = run_sync(db, user)
+        synced_at = datetime.utcnow()
+        slow.commit()
+    finally:
+        slow.close()
+
+    # Les deux cartes sont datées avant le watermark renvoyé, aucune n'est encore lue
+    assert first["flashcards"] == []
+    assert [c.name for c in first["categories"]] == ["Sync"]
+
+    second = run_sync(db, user, first["watermark"])
+
+    assert sorted(card["question"] for card in second["flashcards"]) == ["fast", "slow"]
+    assert all(card["updated_at"] < synced_at for card in second["flashcards"])
+
+    # Plus rien à renvoyer ensuite
+    third = run_sync(db, user, second["watermark"])
+    assert third["flashcards"] == []
+
+
+def test_pages_and_counter_updates(db, user):
+    category = Category(name="Pages", user_id=user.id)
+    db.add(category)
+    db.flush()
+    db.add_all([
+        FlashCard(question=f"q{i}", answer="a", user_id=user.id, category_id=category.id) for i in range(5)
+    ])
+    db.commit()
+
+    questions = []
+    response = run_sync(db, user, limit=2)
+    questions += [card["question"] for card in response["flashcards"]]
+    while response["has_more"]:
+        response = run_sync(db, user, response["watermark"], limit=2)
+        questions += [card["question"] for card in response["flashcards"]]
+
+    assert sorted(questions) == [f"q{i}" for i in range(5)]
+
+    # Compteurs seuls (updated_at inchangé) : la catégorie n'est pas renvoyée
+    db.execute(
+        update(Category).where(Category.id == category.id)
+        .values(card_count=5, updated_at=Category.updated_at)
+    )
+    db.commit()
+    assert run_sync(db, user, response["watermark"])["categories"] == []
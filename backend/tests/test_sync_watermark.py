@@ -0,0 +1,36 @@
+import pytest
+from fastapi import HTTPException
+from app.api.routes.sync import decode_watermark, encode_watermark, next_watermark
+
+SNAPSHOT_XMIN = 1000
+
+
+def test_watermark_round_trip():
+    assert decode_watermark(encode_watermark(987, 42)) == (987, 42)
+
+
+@pytest.mark.parametrize("watermark", ["", "garbage", "987", "987|x", "nope|3", "-1|0", "2026-01-01T12:00:00|x"])
+def test_invalid_watermark_is_400(watermark):
+    with pytest.raises(HTTPException) as error:
+        decode_watermark(watermark)
+
+    assert error.value.status_code == 400
+
+
+def test_timestamp_watermark_restarts_from_the_beginning():
+    assert decode_watermark("2026-01-01T11:59:58.123456|42") == (0, 0)
+
+
+def test_more_pages_resume_after_last_card():
+    watermark = next_watermark(0, SNAPSHOT_XMIN, (SNAPSHOT_XMIN - 10, 17))
+
+    assert decode_watermark(watermark) == (SNAPSHOT_XMIN - 10, 17)
+
+
+def test_last_page_ends_at_snapshot_xmin():
+    assert decode_watermark(next_watermark(0, SNAPSHOT_XMIN)) == (SNAPSHOT_XMIN, 0)
+    assert decode_watermark(next_watermark(SNAPSHOT_XMIN - 10, SNAPSHOT_XMIN)) == (SNAPSHOT_XMIN, 0)
+
+
+def test_watermark_never_moves_back():
+    assert decode_watermark(next_watermark(SNAPSHOT_XMIN + 5, SNAPSHOT_XMIN)) == (SNAPSHOT_XMIN + 5, 0)
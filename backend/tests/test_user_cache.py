@@ -0,0 +1,73 @@
+import asyncio
+import threading
+from datetime import datetime
+from app.core.user_cache import InMemoryPrincipalCache, PrincipalCache, PrincipalCacheBackend
+
+PRINCIPAL = {"id": 1, "email": "a@example.com", "created_at": datetime(2026, 1, 1), "fsrs_weights": None}
+
+
+class RecordingBackend(PrincipalCacheBackend):
+    """
+    Backend réseau factice : note le thread de chaque appel
+    """
+    blocking = True
+
+    def __init__(self):
+        self.entries = {}
+        self.threads = []
+
+    def get(self, user_id):
+        self.threads.append(threading.get_ident())
+        return self.entries.get(user_id)
+
+    def set(self, user_id, principal):
+        self.threads.append(threading.get_ident())
+        self.entries[user_id] = principal
+
+    def delete(self, user_id):
+        self.threads.append(threading.get_ident())
+        self.entries.pop(user_id, None)
+
+
+def test_blocking_backend_runs_outside_event_loop_thread():
+    backend = RecordingBackend()
+    cache = PrincipalCache(backend)
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        assert await cache.aget(1) is None
+        await cache.aset(1, PRINCIPAL)
+        assert await cache.aget(1) == PRINCIPAL
+        await cache.ainvalidate(1)
+        return loop_thread
+
+    loop_thread = asyncio.run(scenario())
+
+    assert len(backend.threads) == 4
+    assert loop_thread not in backend.threads
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_in_memory_backend_async_api():
+    cache = PrincipalCache(InMemoryPrincipalCache(ttl=60, max_entries=10))
+
+    async def scenario():
+        await cache.aset(1, PRINCIPAL)
+        first = await cache.aget(1)
+        await cache.ainvalidate(1)
+        return first, await cache.aget(1)
+
+    assert asyncio.run(scenario()) == (PRINCIPAL, None)
+
+
+def test_in_memory_lru_and_ttl():
+    backend = InMemoryPrincipalCache(ttl=60, max_entries=2)
+    for user_id in (1, 2, 3):
+        backend.set(user_id, {**PRINCIPAL, "id": user_id})
+
+    assert backend.get(1) is None
+    assert backend.get(3)["id"] == 3
+
+    expired = InMemoryPrincipalCache(ttl=0, max_entries=2)
+    expired.set(1, PRINCIPAL)
+    assert expired.get(1) is None
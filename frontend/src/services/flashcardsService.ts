@@ -1,5 +1,11 @@
 import api from './api'
-import type { FlashCard, FlashCardCreate, FlashCardUpdate } from '../types'
+import type {
+  FlashCard,
+  FlashCardCreate,
+  FlashCardPage,
+  FlashCardSearchPage,
+  FlashCardUpdate,
+} from '../types'
 
 /**
  * Service pour gérer les flashcards
@@ -13,6 +19,8 @@ import type { FlashCard, FlashCardCreate, FlashCardUpdate } from '../types'
  *
  * Optionnel : Filtrer par catégorie avec categoryId
  *
+ * L'API est paginée (keyset) : on suit next_cursor jusqu'à la dernière page
+ *
  * @param categoryId - ID de la catégorie (optionnel)
  * @returns Promise<FlashCard[]>
  *
@@ -21,9 +29,20 @@ import type { FlashCard, FlashCardCreate, FlashCardUpdate } from '../types'
  * const mathCards = await getFlashcards(1)
  */
 export const getFlashcards = async (categoryId?: number): Promise<FlashCard[]> => {
-  const params = categoryId ? { category_id: categoryId } : {}
-  const response = await api.get<FlashCard[]>('/flashcards', { params })
-  return response.data
+  const flashcards: FlashCard[] = []
+  let cursor: number | null = null
+
+  do {
+    const params: Record<string, number> = { limit: 1000 }
+    if (categoryId) params.category_id = categoryId
+    if (cursor !== null) params.cursor = cursor
+
+    const response = await api.get<FlashCardPage>('/flashcards', { params })
+    flashcards.push(...response.data.items)
+    cursor = response.data.next_cursor
+  } while (cursor !== null)
+
+  return flashcards
 }
 
 /**
@@ -82,10 +101,16 @@ export const deleteFlashcard = async (id: number): Promise<void> => {
   await api.delete(`/flashcards/${id}`)
 }
 
+// Offset maximal accepté par GET /flashcards/search
+const SEARCH_MAX_OFFSET = 10000
+
 /**
  * Rechercher des flashcards par mot-clé
  *
- * Recherche dans les questions ET les réponses
+ * Recherche full-text dans les questions ET les réponses (triée par pertinence)
+ *
+ * L'API est paginée (offset) : on suit next_offset jusqu'à la dernière page
+ * (au plus SEARCH_MAX_OFFSET + 100 résultats)
  *
  * @param query - Mot-clé à rechercher
  * @returns Promise<FlashCard[]>
@@ -94,8 +119,16 @@ export const deleteFlashcard = async (id: number): Promise<void> => {
  * const results = await searchFlashcards("react")
  */
 export const searchFlashcards = async (query: string): Promise<FlashCard[]> => {
-  const response = await api.get<FlashCard[]>('/flashcards/search', {
-    params: { q: query },
-  })
-  return response.data
+  const flashcards: FlashCard[] = []
+  let offset: number | null = 0
+
+  do {
+    const response = await api.get<FlashCardSearchPage>('/flashcards/search', {
+      params: { q: query, limit: 100, offset },
+    })
+    flashcards.push(...response.data.items)
+    offset = response.data.next_offset
+  } while (offset !== null && offset <= SEARCH_MAX_OFFSET)
+
+  return flashcards
 }
@@ -64,6 +64,16 @@ export interface FlashCard {
   category?: Category // Optionnel, rempli par l'API si on inclut les relations
 }
 
+export interface FlashCardPage {
+  items: FlashCard[]
+  next_cursor: number | null
+}
+
+export interface FlashCardSearchPage {
+  items: (FlashCard & { rank: number })[]
+  next_offset: number | null
+}
+
 export interface FlashCardCreate {
   question: string
   answer: string